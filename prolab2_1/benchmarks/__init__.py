@@ -0,0 +1,5 @@
+from .generator import generate_network, write_network
+
+__all__ = [
+    'generate_network', 'write_network'
+]
@@ -0,0 +1,129 @@
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+from models import CardRegistry, KentCardPayment, CreditCardPayment, Ledger
+from .run import environment
+
+MODES = ("single_lock", "striped", "batched")
+
+def build_registry(num_cards: int, shards: int, seed: int,
+                   journal_dir: Optional[str] = None) -> Tuple[CardRegistry, List[str]]:
+    """Yarısı KentKart, yarısı kredi kartı olan kart kaydı.
+    journal_dir verilirse her kartın defteri bu dizinde kalıcı (durable) günlük tutar."""
+    rnd = random.Random(seed)
+    registry = CardRegistry(shards)
+    numbers = []
+    for i in range(num_cards):
+        number = f"{i:010d}"
+        ledger = None
+        if journal_dir is not None:
+            ledger = Ledger(journal_path=os.path.join(journal_dir, f"{number}.log"), durable=True)
+        if i % 2:
+            registry.register(CreditCardPayment(number, "12/30", "000", limit=rnd.uniform(50, 500),
+                                                ledger=ledger))
+        else:
+            registry.register(KentCardPayment(number, rnd.uniform(50, 500), ledger=ledger))
+        numbers.append(number)
+    return registry, numbers
+
+def run_mode(mode: str, num_cards: int, threads: int, payments: int, batch_size: int,
+             shards: int, seed: int, durable: bool = False) -> Dict:
+    """Tek bir kip ve iş parçacığı sayısı için verim ve tutarlılık ölçümü"""
+    if durable:
+        # Her ölçüm boş günlüklerle başlar; günlükler ölçüm sonunda kapatılıp silinir
+        with tempfile.TemporaryDirectory(prefix="ledgers-") as journal_dir:
+            registry, numbers = build_registry(num_cards, 1 if mode == "single_lock" else shards,
+                                               seed, journal_dir)
+            try:
+                return measure(mode, registry, numbers, threads, payments, batch_size, seed, durable)
+            finally:
+                for card in registry:
+                    card.ledger.close()
+    registry, numbers = build_registry(num_cards, 1 if mode == "single_lock" else shards, seed)
+    return measure(mode, registry, numbers, threads, payments, batch_size, seed, durable)
+
+def measure(mode: str, registry: CardRegistry, numbers: List[str], threads: int, payments: int,
+            batch_size: int, seed: int, durable: bool) -> Dict:
+    initial = registry.balances()
+
+    # Ödeme listeleri önceden üretilir; ölçüme yalnızca ödeme işlemleri girer
+    rnd = random.Random(seed + threads)
+    workloads = [[(rnd.choice(numbers), round(rnd.uniform(1, 20), 2)) for _ in range(payments)]
+                 for _ in range(threads)]
+    results: List[List[bool]] = [[] for _ in range(threads)]
+    barrier = threading.Barrier(threads + 1)
+
+    def worker(number: int) -> None:
+        workload = workloads[number]
+        barrier.wait()
+        if mode == "batched":
+            for start in range(0, len(workload), batch_size):
+                results[number].extend(registry.process_payments(workload[start:start + batch_size]))
+        else:
+            results[number] = [registry.process_payment(card, amount) for card, amount in workload]
+
+    pool = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for thread in pool:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in pool:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    # Tutarlılık: başarılı ödemelerin toplamı bakiyelerdeki düşüşe eşit, bakiye negatif değil
+    charged = sum(amount for workload, outcome in zip(workloads, results)
+                  for (_, amount), success in zip(workload, outcome) if success)
+    final = registry.balances()
+    debited = sum(initial[number] - final[number] for number in numbers)
+    total = threads * payments
+    return {
+        "mode": mode,
+        "durable": durable,
+        "threads": threads,
+        "cards": len(numbers),
+        "payments": total,
+        "elapsed_s": elapsed,
+        "throughput_per_s": total / elapsed if elapsed else 0.0,
+        "successful": sum(sum(outcome) for outcome in results),
+        "consistent": abs(charged - debited) < 1e-6 * max(1.0, charged) and min(final.values()) >= -1e-9,
+    }
+
+def main(argv: Sequence[str] = None) -> Dict:
+    parser = argparse.ArgumentParser(description="Kart kaydı eşzamanlı ödeme ölçümleri")
+    parser.add_argument("--cards", type=int, default=100000, help="Kart sayısı")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--payments", type=int, default=50000, help="İş parçacığı başına ödeme")
+    parser.add_argument("--batch-size", type=int, default=256, help="Toplu kipte parti boyutu")
+    parser.add_argument("--shards", type=int, default=64)
+    parser.add_argument("--modes", nargs="+", default=list(MODES), choices=MODES)
+    parser.add_argument("--durable", action="store_true",
+                        help="Her kart için fsync'li günlük (kart başına bir dosya ve yazıcı iş parçacığı; "
+                             "--cards küçük tutulmalı)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="JSON rapor dosyası (varsayılan: standart çıktı)")
+    args = parser.parse_args(argv)
+
+    report = {"environment": environment(), "seed": args.seed, "shards": args.shards,
+              "batch_size": args.batch_size, "durable": args.durable, "results": []}
+    for mode in args.modes:
+        for threads in args.threads:
+            report["results"].append(run_mode(mode, args.cards, threads, args.payments,
+                                              args.batch_size, args.shards, args.seed, args.durable))
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(text)
+    else:
+        sys.stdout.write(text + "\n")
+    return report
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+import argparse
+import json
+import math
+import random
+from typing import Dict, List, Optional, Tuple
+from models import haversine
+from routing import SpatialIndex
+
+# İzmit merkezi (gui.py'deki harita başlangıç konumu)
+DEFAULT_CENTER = (40.7654, 29.9408)
+KM_PER_DEGREE = 111.195
+
+# Hat tipine göre yaklaşık hız (km/saat) ve ücret aralığı (TL)
+LINE_PROFILES = {
+    "bus": {"speed": 25.0, "fare": (2.5, 3.5), "label": "Bus"},
+    "tram": {"speed": 20.0, "fare": (2.0, 3.0), "label": "Tram"},
+}
+
+def _step(lat: float, lon: float, heading: float, km: float) -> Tuple[float, float]:
+    """Verilen yön ve mesafede yeni koordinat (küçük mesafeler için düz yaklaşım)"""
+    dlat = km * math.cos(heading) / KM_PER_DEGREE
+    dlon = km * math.sin(heading) / (KM_PER_DEGREE * math.cos(math.radians(lat)))
+    return lat + dlat, lon + dlon
+
+def generate_network(num_stops: int, seed: int = 0, tram_ratio: float = 0.2,
+                     center: Tuple[float, float] = DEFAULT_CENTER,
+                     radius_km: Optional[float] = None,
+                     line_length: Tuple[int, int] = (8, 25),
+                     bidirectional: bool = True,
+                     transfer_radius_km: float = 0.4) -> Dict:
+    """Duraklar.json şemasında sentetik bir şehir ağı üret"""
+    rnd = random.Random(seed)
+    # Durak yoğunluğu sabit kalsın diye yarıçap durak sayısıyla büyür
+    if radius_km is None:
+        radius_km = max(3.0, math.sqrt(num_stops) * 0.35)
+
+    stops: List[Dict] = []
+    by_type: Dict[str, List[int]] = {"bus": [], "tram": []}
+
+    def new_stop(stop_type: str, lat: float, lon: float) -> int:
+        index = len(stops)
+        stops.append({
+            "id": f"{stop_type}_{index}",
+            "name": f"Durak {index} ({LINE_PROFILES[stop_type]['label']})",
+            "type": stop_type,
+            "lat": round(lat, 6),
+            "lon": round(lon, 6),
+            "sonDurak": False,
+            "nextStops": [],
+        })
+        by_type[stop_type].append(index)
+        return index
+
+    def connect(a: int, b: int, stop_type: str, fare: float) -> None:
+        profile = LINE_PROFILES[stop_type]
+        straight = haversine(stops[a]["lat"], stops[a]["lon"], stops[b]["lat"], stops[b]["lon"])
+        distance = round(straight * rnd.uniform(1.05, 1.3), 2)
+        stops[a]["nextStops"].append({
+            "stopId": stops[b]["id"],
+            "mesafe": distance,
+            "sure": max(1, round(distance / profile["speed"] * 60)),
+            "ucret": fare,
+        })
+
+    # Hatlar: merkez çevresinde rastgele yürüyüşle ilerleyen durak dizileri
+    while len(stops) < num_stops:
+        stop_type = "tram" if rnd.random() < tram_ratio else "bus"
+        fare = round(rnd.uniform(*LINE_PROFILES[stop_type]["fare"]) * 2) / 2
+        length = min(rnd.randint(*line_length), num_stops - len(stops) + 1)
+
+        # Ağ bağlı kalsın diye hatlar çoğunlukla mevcut bir duraktan başlar
+        if by_type[stop_type] and rnd.random() < 0.7:
+            current = rnd.choice(by_type[stop_type])
+        else:
+            angle = rnd.uniform(0, 2 * math.pi)
+            lat, lon = _step(center[0], center[1], angle, radius_km * math.sqrt(rnd.random()))
+            current = new_stop(stop_type, lat, lon)
+            length -= 1
+
+        heading = rnd.uniform(0, 2 * math.pi)
+        first = current
+        for _ in range(length):
+            if len(stops) >= num_stops:
+                break
+            heading += rnd.gauss(0, 0.35)
+            lat, lon = _step(stops[current]["lat"], stops[current]["lon"], heading,
+                             rnd.uniform(0.3, 0.8))
+            # Şehir sınırına gelen hat merkeze döner
+            if haversine(center[0], center[1], lat, lon) > radius_km:
+                heading += math.pi
+                lat, lon = _step(stops[current]["lat"], stops[current]["lon"], heading, 0.5)
+            following = new_stop(stop_type, lat, lon)
+            connect(current, following, stop_type, fare)
+            if bidirectional:
+                connect(following, current, stop_type, fare)
+            current = following
+
+        # Hat uçları son durak olarak işaretlenir
+        if current != first:
+            stops[current]["sonDurak"] = True
+            if bidirectional:
+                stops[first]["sonDurak"] = True
+
+    # Aktarmalar: her tramvay durağını yakındaki bir otobüs durağına bağla
+    bus_indices = by_type["bus"]
+    if bus_indices:
+        index = SpatialIndex([stops[i]["lat"] for i in bus_indices],
+                             [stops[i]["lon"] for i in bus_indices])
+        for tram in by_type["tram"]:
+            location = _Point(stops[tram]["lat"], stops[tram]["lon"])
+            for candidate, distance in index.k_nearest(location, 3):
+                bus = bus_indices[candidate]
+                if distance > transfer_radius_km:
+                    break
+                if "transfer" in stops[bus] or "transfer" in stops[tram]:
+                    continue
+                duration = rnd.randint(2, 5)
+                fee = rnd.choice([0.0, 0.5])
+                stops[tram]["transfer"] = {"transferStopId": stops[bus]["id"],
+                                           "transferSure": duration, "transferUcret": fee}
+                stops[bus]["transfer"] = {"transferStopId": stops[tram]["id"],
+                                          "transferSure": duration, "transferUcret": fee}
+                break
+
+    for stop in stops:
+        stop.setdefault("transfer", None)
+
+    return {
+        "city": f"Sentetik-{num_stops}",
+        "taxi": {"openingFee": 10.0, "costPerKm": 4.0},
+        "duraklar": stops,
+    }
+
+class _Point:
+    # SpatialIndex sorguları için hafif konum nesnesi
+    __slots__ = ("lat", "lon")
+
+    def __init__(self, lat: float, lon: float):
+        self.lat = lat
+        self.lon = lon
+
+def write_network(path: str, num_stops: int, seed: int = 0, **options) -> Dict:
+    """Sentetik ağı üretip JSON dosyasına yaz"""
+    data = generate_network(num_stops, seed=seed, **options)
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(data, file, ensure_ascii=False)
+    return data
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sentetik durak ağı üret")
+    parser.add_argument("stops", type=int, help="Durak sayısı")
+    parser.add_argument("output", help="Çıktı JSON dosyası")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--tram-ratio", type=float, default=0.2)
+    args = parser.parse_args()
+    write_network(args.output, args.stops, seed=args.seed, tram_ratio=args.tram_ratio)
@@ -0,0 +1,144 @@
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Sequence
+from models import Location, GeneralPassenger
+from routing import SearchStrategy
+from transportation_system import TransportationSystem
+from .generator import write_network
+
+def latency_stats(samples: Sequence[float]) -> Dict[str, float]:
+    """Gecikme örneklerinden (saniye) yüzdelik dilimler ve verim (ms, işlem/sn)"""
+    ordered = sorted(samples)
+    total = sum(ordered)
+
+    def percentile(p: float) -> float:
+        index = min(len(ordered) - 1, max(0, round(p / 100 * len(ordered)) - 1))
+        return ordered[index] * 1000
+
+    return {
+        "count": len(ordered),
+        "mean_ms": statistics.fmean(ordered) * 1000,
+        "p50_ms": percentile(50),
+        "p95_ms": percentile(95),
+        "p99_ms": percentile(99),
+        "max_ms": ordered[-1] * 1000,
+        "throughput_per_s": len(ordered) / total if total else 0.0,
+    }
+
+def time_calls(calls: Sequence[Callable[[], object]]) -> List[float]:
+    """Her çağrının süresini ayrı ayrı ölç"""
+    samples = []
+    for call in calls:
+        start = time.perf_counter()
+        call()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+def peak_memory(function: Callable[[], object]) -> float:
+    """Fonksiyonun tracemalloc ile ölçülen tepe bellek kullanımı (MB)"""
+    # tracemalloc süreleri bozduğu için bellek ayrı bir çalıştırmada ölçülür
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+    finally:
+        tracemalloc.stop()
+
+def random_locations(system: TransportationSystem, count: int, rnd: random.Random) -> List[Location]:
+    """Ağın sınır kutusu içinde rastgele konumlar"""
+    lats, lons = system.stop_coordinates()
+    return [Location(rnd.uniform(float(lats.min()), float(lats.max())),
+                     rnd.uniform(float(lons.min()), float(lons.max())))
+            for _ in range(count)]
+
+def benchmark_size(path: str, num_stops: int, queries: int, seed: int,
+                   strategies: Sequence[SearchStrategy]) -> List[Dict]:
+    """Tek bir ağ boyutu için yükleme, en yakın durak ve rota ölçümleri"""
+    results = []
+    base = {"stops": num_stops}
+
+    # Yükleme (JSON okuma + ağ derleme + uzamsal indeks). İndeks ilk sorguda kurulduğundan
+    # burada zorla kurulur; sonuçlar indeksin yüklemede kurulduğu eski ölçümlerle karşılaştırılabilir
+    def load() -> TransportationSystem:
+        system = TransportationSystem(path, cache_size=0)
+        system.spatial_index
+        return system
+
+    load_samples = time_calls([load] * 3)
+    results.append(dict(base, benchmark="load", **latency_stats(load_samples),
+                        peak_memory_mb=peak_memory(load)))
+
+    # Önbellek kapalı: her sorgu gerçek arama maliyetini ölçer
+    system = TransportationSystem(path, cache_size=0)
+    rnd = random.Random(seed)
+    locations = random_locations(system, queries * 2, rnd)
+
+    nearest_calls = [lambda location=location: system.find_nearest_stop(location)
+                     for location in locations]
+    results.append(dict(base, benchmark="nearest_stop", **latency_stats(time_calls(nearest_calls)),
+                        peak_memory_mb=peak_memory(lambda: time_calls(nearest_calls))))
+
+    passenger = GeneralPassenger()
+    pairs = list(zip(locations[::2], locations[1::2]))
+    for strategy in strategies:
+        if strategy is SearchStrategy.CONTRACTION_HIERARCHY:
+            # Hiyerarşi dosyası geçici dizinde hazırlanır, hazırlık süresi ayrı raporlanır
+            start = time.perf_counter()
+            system.enable_contraction_hierarchy(path + ".ch.bin")
+            results.append(dict(base, benchmark="ch_preprocess",
+                                **latency_stats([time.perf_counter() - start])))
+        system.search_strategy = strategy
+        route_calls = [lambda a=a, b=b: system.plan_route(a, b, passenger) for a, b in pairs]
+        results.append(dict(base, benchmark="route", strategy=strategy.value,
+                            **latency_stats(time_calls(route_calls)),
+                            peak_memory_mb=peak_memory(lambda: time_calls(route_calls[:50]))))
+    return results
+
+def environment() -> Dict[str, object]:
+    """Ölçümlerin alındığı ortam bilgileri"""
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+def main(argv: Sequence[str] = None) -> Dict:
+    parser = argparse.ArgumentParser(description="Rota hesaplama performans ölçümleri")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000],
+                        help="Sentetik ağ durak sayıları")
+    parser.add_argument("--queries", type=int, default=200, help="Boyut başına sorgu sayısı")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--strategies", nargs="+", default=[SearchStrategy.DIJKSTRA.value],
+                        choices=[strategy.value for strategy in SearchStrategy])
+    parser.add_argument("--output", help="JSON rapor dosyası (varsayılan: standart çıktı)")
+    args = parser.parse_args(argv)
+
+    strategies = [SearchStrategy(value) for value in args.strategies]
+    report = {"environment": environment(), "seed": args.seed, "queries": args.queries,
+              "results": []}
+
+    with tempfile.TemporaryDirectory(prefix="benchmarks-") as directory:
+        for size in args.sizes:
+            path = os.path.join(directory, f"network-{size}.json")
+            write_network(path, size, seed=args.seed)
+            report["results"].extend(benchmark_size(path, size, args.queries, args.seed, strategies))
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(text)
+    else:
+        sys.stdout.write(text + "\n")
+    return report
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,12 @@ import folium
 import webbrowser
 import os
 import tkintermapview
+from map_layers import MapLayerManager
+import logging
+import queue
+import threading
+
+logger = logging.getLogger(__name__)
 
 class TransportationGUI:
     def __init__(self, root):
@@ -17,7 +23,8 @@ class TransportationGUI:
         self.root.geometry("1600x900")
         
         # Ana sistem
-        self.system = TransportationSystem("Duraklar.json")
+        self.system = TransportationSystem("Duraklar.json", snapshot=True)
+        self.suggestion_count = 50  # Durak kutularında gösterilen en fazla öneri
         
         # Ana frame
         self.main_frame = ttk.Frame(root, padding="10")
@@ -54,9 +61,8 @@ class TransportationGUI:
         self.start_stop_frame.grid(row=4, column=0, columnspan=2, pady=5)
         self.start_stop_var = tk.StringVar()
         self.start_stop_combo = ttk.Combobox(self.start_stop_frame, 
-                                           textvariable=self.start_stop_var,
-                                           state="readonly")
-        self.start_stop_combo['values'] = [stop.name for stop in self.system.stops.values()]
+                                           textvariable=self.start_stop_var)
+        self.bind_stop_search(self.start_stop_combo)
         self.start_stop_combo.grid(row=0, column=0)
         
         # Bitiş noktası seçimi
@@ -82,9 +88,8 @@ class TransportationGUI:
         self.end_stop_frame.grid(row=8, column=0, columnspan=2, pady=5)
         self.end_stop_var = tk.StringVar()
         self.end_stop_combo = ttk.Combobox(self.end_stop_frame, 
-                                         textvariable=self.end_stop_var,
-                                         state="readonly")
-        self.end_stop_combo['values'] = [stop.name for stop in self.system.stops.values()]
+                                         textvariable=self.end_stop_var)
+        self.bind_stop_search(self.end_stop_combo)
         self.end_stop_combo.grid(row=0, column=0)
         
         # Yolcu tipi seçimi
@@ -135,6 +140,24 @@ class TransportationGUI:
         ttk.Button(self.input_frame, text="Rota Hesapla", 
                   command=self.calculate_route).grid(row=16, column=0, columnspan=2, pady=20)
         
+        # Hesaplama sürerken gösterilen ilerleme çubuğu
+        self.progress = ttk.Progressbar(self.input_frame, mode="indeterminate")
+        self.progress.grid(row=17, column=0, columnspan=2, sticky="ew")
+        self.progress.grid_remove()
+        
+        # Arka plan rota hesaplayıcısı: arayüz iş parçacığı hiç bloklanmaz.
+        # Her yeni istek nesil numarasını artırır; eski nesillerin sonuçları atılır.
+        self.generation = 0
+        self.pending_request = None  # Henüz başlamamış en son istek
+        self.request_lock = threading.Lock()
+        self.request_ready = threading.Event()
+        self.results = queue.Queue()
+        self.polling = False
+        self.pending_payment = None  # En son isteğin ödeme yöntemi ve yolcusu
+        self.pending_passenger = None
+        self.worker = threading.Thread(target=self.route_worker, name="route-worker", daemon=True)
+        self.worker.start()
+        
         # Orta panel (Harita)
         self.map_frame = ttk.LabelFrame(self.main_frame, text="Durak Haritası", padding="10")
         self.map_frame.grid(row=1, column=1, padx=10, pady=5, sticky="nsew")
@@ -147,25 +170,10 @@ class TransportationGUI:
         self.map_widget.set_position(40.7654, 29.9408)  # İzmit merkez
         self.map_widget.set_zoom(13)
         
-        # Durakları haritaya ekle
-        self.markers = {}
-        self.paths = []
-        for stop in self.system.stops.values():
-            # Durak tipine göre renk belirle
-            color = "red" if stop.type == "bus" else "blue"
-            
-            # Durak işaretçisi ekle
-            marker = self.map_widget.set_marker(stop.lat, stop.lon, text=stop.name, marker_color_circle=color)
-            self.markers[stop.id] = marker
-            
-            # Durak bağlantılarını çiz
-            for next_stop in stop.next_stops:
-                next_stop_obj = self.system.stops[next_stop["stopId"]]
-                path = self.map_widget.set_path([
-                    [stop.lat, stop.lon],
-                    [next_stop_obj.lat, next_stop_obj.lon]
-                ])
-                self.paths.append(path)
+        # Durak ve hat katmanları: hatlar tek çizgi, işaretçiler kümelenmiş,
+        # yalnızca görünür alan çizilir
+        self.layers = MapLayerManager(self.map_widget, self.system)
+        self.layers.start()
         
         # Sağ panel (Sonuçlar)
         self.output_frame = ttk.LabelFrame(self.main_frame, text="Rota Sonuçları", padding="10")
@@ -209,7 +217,7 @@ class TransportationGUI:
                 if not self.start_stop_var.get():
                     raise ValueError("Başlangıç durağı seçilmedi!")
                 start_stop_name = self.start_stop_var.get()
-                start = next((stop for stop in self.system.stops.values() if stop.name == start_stop_name), None)
+                start = self.system.find_stop_by_name(start_stop_name)
                 if not start:
                     raise ValueError(f"Başlangıç durağı '{start_stop_name}' bulunamadı!")
             
@@ -233,7 +241,7 @@ class TransportationGUI:
                 if not self.end_stop_var.get():
                     raise ValueError("Bitiş durağı seçilmedi!")
                 end_stop_name = self.end_stop_var.get()
-                end = next((stop for stop in self.system.stops.values() if stop.name == end_stop_name), None)
+                end = self.system.find_stop_by_name(end_stop_name)
                 if not end:
                     raise ValueError(f"Bitiş durağı '{end_stop_name}' bulunamadı!")
             
@@ -267,52 +275,118 @@ class TransportationGUI:
                     raise ValueError("Kent Kart numarası eksik!")
                 payment_method = KentCardPayment(self.kent_number.get(), 100.0)  # Varsayılan bakiye
             
-            print(f"Başlangıç: {start}")
-            print(f"Bitiş: {end}")
-            print(f"Yolcu: {passenger}")
-            print(f"Ödeme: {payment_method}")
+            logger.debug("Başlangıç: %s, Bitiş: %s, Yolcu: %s, Ödeme: %s",
+                         start, end, passenger, payment_method)
+            
+            # Rota hesaplamayı arka plana gönder; önceki istek geçersiz sayılır
+            self.submit_route(start, end, passenger, payment_method)
+            
+        except ValueError as e:
+            messagebox.showerror("Hata", str(e))
+        except Exception as e:
+            import traceback
+            error_msg = f"Beklenmeyen bir hata oluştu:\n{str(e)}\n\nHata detayı:\n{traceback.format_exc()}"
+            messagebox.showerror("Hata", error_msg)
+            logger.error("Hata detayı: %s", error_msg)
+    
+    def submit_route(self, start, end, passenger, payment_method):
+        """Rota isteğini arka plan işçisine ilet ve ilerleme göstergesini başlat"""
+        self.generation += 1
+        with self.request_lock:
+            # Başlamamış eski istek varsa yenisiyle değiştirilir (iptal)
+            self.pending_request = (self.generation, start, end, passenger)
+        self.request_ready.set()
+        
+        # Ödeme, yalnızca en son istek sonuçlandığında ana iş parçacığında alınır
+        self.pending_payment = payment_method
+        self.pending_passenger = passenger
+        
+        self.progress.grid()
+        self.progress.start(10)
+        if not self.polling:
+            self.polling = True
+            self.root.after(50, self.poll_results)
+    
+    def route_worker(self):
+        """Arka plan iş parçacığı: sıradaki en son isteği hesapla, sonucu kuyruğa koy"""
+        while True:
+            self.request_ready.wait()
+            with self.request_lock:
+                request = self.pending_request
+                self.pending_request = None
+                self.request_ready.clear()
+            if request is None:
+                continue
             
-            # Rota hesaplama
-            route = self.system.find_route(start, end, passenger, payment_method)
-            print("Rota:", route)
-            print("Rota anahtarları:", route.keys())
+            generation, start, end, passenger = request
+            try:
+                # Ödemesiz hesaplama; yerini yenisine bırakan sorgular ücretlendirilmez
+                route = self.system.plan_route(start, end, passenger)
+                self.results.put((generation, route, None))
+            except Exception as e:
+                import traceback
+                self.results.put((generation, None, (e, traceback.format_exc())))
+    
+    def poll_results(self):
+        """Sonuç kuyruğunu root.after ile yokla; yalnızca en son isteğin sonucunu uygula"""
+        latest = None
+        while True:
+            try:
+                result = self.results.get_nowait()
+            except queue.Empty:
+                break
+            if result[0] == self.generation:
+                latest = result
+        
+        if latest is None:
+            self.root.after(50, self.poll_results)
+            return
+        
+        self.polling = False
+        self.progress.stop()
+        self.progress.grid_remove()
+        
+        generation, route, error = latest
+        if error is not None:
+            e, details = error
+            if isinstance(e, ValueError):
+                messagebox.showerror("Hata", str(e))
+            else:
+                error_msg = f"Beklenmeyen bir hata oluştu:\n{str(e)}\n\nHata detayı:\n{details}"
+                messagebox.showerror("Hata", error_msg)
+                logger.error("Hata detayı: %s", error_msg)
+            return
+        
+        try:
+            # Ödeme işlemini gerçekleştir (find_route ile aynı tutar)
+            self.pending_payment.process_payment(route["route"].total_cost)
+            logger.debug("Rota: %s", route)
             
             # Sonuçları göster
-            self.display_results(route, passenger, payment_method)
+            self.display_results(route, self.pending_passenger, self.pending_payment)
             
             # Rotayı haritada göster
             self.display_route_on_map(route)
-            
-        except ValueError as e:
-            messagebox.showerror("Hata", str(e))
         except Exception as e:
             import traceback
             error_msg = f"Beklenmeyen bir hata oluştu:\n{str(e)}\n\nHata detayı:\n{traceback.format_exc()}"
             messagebox.showerror("Hata", error_msg)
-            print("Hata detayı:", error_msg)
+            logger.error("Hata detayı: %s", error_msg)
+    
+    def bind_stop_search(self, combo):
+        # Yazdıkça aksansız önek araması ile öneri listesini daralt
+        combo['values'] = [stop.name for stop in self.system.search_stops("", self.suggestion_count)]
+        combo.bind("<KeyRelease>", lambda event: self.filter_stop_names(combo, event))
+    
+    def filter_stop_names(self, combo, event):
+        if event.keysym in ("Up", "Down", "Return", "Escape", "Tab"):
+            return
+        stops = self.system.search_stops(combo.get(), self.suggestion_count)
+        combo['values'] = [stop.name for stop in stops]
     
     def display_route_on_map(self, route):
-        # Önceki rotayı temizle
-        for path in self.paths:
-            path.delete()
-        self.paths = []
-        
-        # Başlangıç ve bitiş noktalarını işaretle
-        if isinstance(route['start_stop'], Location):
-            self.map_widget.set_marker(route['start_stop'].lat, route['start_stop'].lon,
-                                     text="Başlangıç", marker_color_circle="green")
-        if isinstance(route['end_stop'], Location):
-            self.map_widget.set_marker(route['end_stop'].lat, route['end_stop'].lon,
-                                     text="Bitiş", marker_color_circle="green")
-        
-        # Rota segmentlerini çiz
-        for segment in route['route'].segments:
-            # Segment yolunu çiz
-            path = self.map_widget.set_path([
-                [segment.from_stop.lat, segment.from_stop.lon],
-                [segment.to_stop.lat, segment.to_stop.lon]
-            ], color="green" if segment.is_transfer else "orange", width=4)
-            self.paths.append(path)
+        # Önceki rotayla ortak parçalar korunur, yalnızca farklar çizilir
+        self.layers.show_route(route)
     
     def display_results(self, route, passenger, payment_method):
         # Sonuç metnini temizle
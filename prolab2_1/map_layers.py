@@ -0,0 +1,219 @@
+import math
+from typing import Dict, Hashable, List, Optional, Tuple
+import numpy as np
+from models import Location
+
+TILE_SIZE = 256  # Harita karosu kenarı (piksel)
+
+def _mercator_y(lat: float) -> float:
+    """Enlemi Web Mercator birim koordinatına (0..1) çevir"""
+    lat = max(min(lat, 85.05112878), -85.05112878)
+    sin = math.sin(math.radians(lat))
+    return 0.5 - math.log((1 + sin) / (1 - sin)) / (4 * math.pi)
+
+def _mercator_ys(lats: np.ndarray) -> np.ndarray:
+    """_mercator_y'nin dizi sürümü"""
+    sin = np.sin(np.radians(np.clip(lats, -85.05112878, 85.05112878)))
+    return 0.5 - np.log((1 + sin) / (1 - sin)) / (4 * math.pi)
+
+def _mercator_lat(y: float) -> float:
+    return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * y))))
+
+def viewport_bounds(lat: float, lon: float, zoom: float, width: int, height: int,
+                    margin: float = 0.25) -> Tuple[float, float, float, float]:
+    """Merkez, yakınlaştırma ve piksel boyutundan görünür alan (güney, batı, kuzey, doğu)"""
+    world = TILE_SIZE * 2 ** zoom  # Dünya genişliği (piksel)
+    half_w = width * (1 + margin) / 2 / world
+    half_h = height * (1 + margin) / 2 / world
+    x = (lon + 180) / 360
+    y = _mercator_y(lat)
+    return (_mercator_lat(min(y + half_h, 1.0)), (x - half_w) * 360 - 180,
+            _mercator_lat(max(y - half_h, 0.0)), (x + half_w) * 360 - 180)
+
+def merge_lines(network, stop_types: List[str]) -> List[Tuple[str, List[int]]]:
+    """Aktarma dışı kenarları aynı tipteki zincirlere birleştir: (tip, durak indeksleri)"""
+    # Çift yönlü kenarlar tek çizgi olarak çizilir
+    neighbours: Dict[int, List[int]] = {}
+    seen = set()
+    for source in range(network.num_stops):
+        for edge in range(network.offsets[source], network.offsets[source + 1]):
+            target = network.targets[edge]
+            if network.transfers[edge] or stop_types[source] != stop_types[target]:
+                continue
+            key = (min(source, target), max(source, target))
+            if key in seen or source == target:
+                continue
+            seen.add(key)
+            neighbours.setdefault(source, []).append(target)
+            neighbours.setdefault(target, []).append(source)
+
+    lines = []
+    used = set()
+
+    def walk(start: int, first: int) -> List[int]:
+        # Derecesi 2 olan duraklar boyunca ilerle
+        line = [start, first]
+        used.add((min(start, first), max(start, first)))
+        previous, current = start, first
+        while len(neighbours[current]) == 2:
+            following = neighbours[current][0] if neighbours[current][1] == previous else neighbours[current][1]
+            key = (min(current, following), max(current, following))
+            if key in used:
+                break
+            used.add(key)
+            line.append(following)
+            previous, current = current, following
+        return line
+
+    # Önce uç ve kavşak duraklarından başlayan zincirler, sonra kalan halkalar
+    for only_junctions in (True, False):
+        for node, adjacent in neighbours.items():
+            if only_junctions and len(adjacent) == 2:
+                continue
+            for other in adjacent:
+                if (min(node, other), max(node, other)) not in used:
+                    lines.append((stop_types[node], walk(node, other)))
+    return lines
+
+class MapLayerManager:
+    """TkinterMapView üzerinde durak ve rota katmanlarını görünür alana göre çizen yönetici"""
+
+    CLUSTER_CELL_PX = 48  # Kümeleme hücresi (piksel)
+    DETAIL_ZOOM = 16  # Bu yakınlaştırmadan itibaren kümeleme yapılmaz
+    LINE_COLORS = {"bus": "#d9534f", "tram": "#337ab7"}
+    MARKER_COLORS = {"bus": "red", "tram": "blue"}
+
+    def __init__(self, map_widget, system, poll_ms: int = 200):
+        self.map_widget = map_widget
+        self.system = system
+        self.poll_ms = poll_ms
+
+        network = system.network
+        self.lats, self.lons = system.stop_coordinates()
+        self.stop_types = [system.stops[stop_id].type for stop_id in network.stop_ids]
+
+        # Hat çizgileri bir kez birleştirilir; her biri sınır kutusuyla tutulur
+        self.lines = []
+        for stop_type, stops in merge_lines(network, self.stop_types):
+            lats = self.lats[stops]
+            lons = self.lons[stops]
+            self.lines.append((stop_type, [(float(lat), float(lon)) for lat, lon in zip(lats, lons)],
+                               (float(lats.min()), float(lons.min()), float(lats.max()), float(lons.max()))))
+
+        # Çizili nesneler: anahtar -> harita nesnesi (yenilemede fark alınır)
+        self.line_objects: Dict[Hashable, object] = {}
+        self.marker_objects: Dict[Hashable, object] = {}
+        self.route_objects: Dict[Hashable, object] = {}
+        self.view: Optional[tuple] = None
+        self.polling = False
+
+    def current_view(self) -> tuple:
+        widget = self.map_widget
+        lat, lon = widget.get_position()
+        width = widget.winfo_width() if widget.winfo_width() > 1 else widget.width
+        height = widget.winfo_height() if widget.winfo_height() > 1 else widget.height
+        return round(widget.zoom, 2), round(lat, 6), round(lon, 6), width, height
+
+    def start(self) -> None:
+        """Görünür alanı düzenli aralıklarla yokla, değiştiğinde katmanları yenile"""
+        if not self.polling:
+            self.polling = True
+            self.poll()
+
+    def stop(self) -> None:
+        self.polling = False
+
+    def poll(self) -> None:
+        if not self.polling:
+            return
+        view = self.current_view()
+        if view != self.view:
+            self.view = view
+            self.refresh()
+        self.map_widget.after(self.poll_ms, self.poll)
+
+    def refresh(self) -> None:
+        """Görünür alandaki çizgi ve işaretçileri çiz, dışarıda kalanları sil"""
+        zoom, lat, lon, width, height = self.view or self.current_view()
+        south, west, north, east = viewport_bounds(lat, lon, zoom, width, height)
+        self.update_lines(south, west, north, east)
+        self.update_markers(zoom, south, west, north, east)
+
+    @staticmethod
+    def _sync(drawn: Dict[Hashable, object], wanted: Dict[Hashable, tuple], create) -> None:
+        """Çizili nesneleri istenen kümeyle eşitle: yalnızca farkları sil/ekle"""
+        for key in [key for key in drawn if key not in wanted]:
+            drawn.pop(key).delete()
+        for key, args in wanted.items():
+            if key not in drawn:
+                drawn[key] = create(*args)
+
+    def update_lines(self, south: float, west: float, north: float, east: float) -> None:
+        wanted = {}
+        for number, (stop_type, points, (min_lat, min_lon, max_lat, max_lon)) in enumerate(self.lines):
+            if max_lat >= south and min_lat <= north and max_lon >= west and min_lon <= east:
+                wanted[number] = (points, self.LINE_COLORS.get(stop_type, "gray"))
+        self._sync(self.line_objects, wanted,
+                   lambda points, color: self.map_widget.set_path(points, color=color, width=3))
+
+    def update_markers(self, zoom: float, south: float, west: float, north: float, east: float) -> None:
+        visible = np.flatnonzero((self.lats >= south) & (self.lats <= north) &
+                                 (self.lons >= west) & (self.lons <= east))
+        wanted = {}
+        stop_ids = self.system.network.stop_ids
+
+        if zoom >= self.DETAIL_ZOOM or len(visible) == 0:
+            clusters = [(np.array([index]), ) for index in visible]
+            cell = None
+        else:
+            # Piksel ızgarasında kümeleme: aynı hücredeki duraklar tek işaretçi olur
+            world = TILE_SIZE * 2 ** zoom
+            xs = ((self.lons[visible] + 180) / 360 * world // self.CLUSTER_CELL_PX).astype(np.int64)
+            ys = (_mercator_ys(self.lats[visible]) * world // self.CLUSTER_CELL_PX).astype(np.int64)
+            cell = round(zoom)
+            order = np.lexsort((ys, xs))
+            keys = np.stack((xs[order], ys[order]), axis=1)
+            starts = np.flatnonzero(np.r_[True, np.any(keys[1:] != keys[:-1], axis=1)])
+            clusters = [(visible[members], (int(keys[start][0]), int(keys[start][1])))
+                        for start, members in zip(starts, np.split(order, starts[1:]))]
+
+        for cluster in clusters:
+            members = cluster[0]
+            if len(members) == 1:
+                index = int(members[0])
+                stop = self.system.stops[stop_ids[index]]
+                wanted[("stop", index)] = (float(self.lats[index]), float(self.lons[index]), stop.name,
+                                           self.MARKER_COLORS.get(stop.type, "gray"))
+            else:
+                wanted[("cluster", cell, cluster[1], len(members))] = (
+                    float(self.lats[members].mean()), float(self.lons[members].mean()),
+                    f"{len(members)} durak", "gray")
+
+        self._sync(self.marker_objects, wanted,
+                   lambda lat, lon, text, color: self.map_widget.set_marker(
+                       lat, lon, text=text, marker_color_circle=color))
+
+    def show_route(self, route) -> None:
+        """Rota katmanını güncelle: önceki rotayla farkı çiz, ortak parçalara dokunma"""
+        wanted = {}
+        # Durak dışı başlangıç/bitiş noktaları ayrıca işaretlenir
+        for point, text in ((route['start_stop'], "Başlangıç"), (route['end_stop'], "Bitiş")):
+            if isinstance(point, Location):
+                wanted[(text, point.lat, point.lon)] = ("marker", point.lat, point.lon, text)
+        for segment in route['route'].segments:
+            start = (segment.from_stop.lat, segment.from_stop.lon)
+            end = (segment.to_stop.lat, segment.to_stop.lon)
+            wanted[("segment", start, end, segment.is_transfer)] = (
+                "path", [start, end], "green" if segment.is_transfer else "orange")
+
+        def create(kind, *args):
+            if kind == "marker":
+                lat, lon, text = args
+                return self.map_widget.set_marker(lat, lon, text=text, marker_color_circle="green")
+            points, color = args
+            return self.map_widget.set_path(points, color=color, width=4)
+
+        self._sync(self.route_objects, wanted, create)
+
+    def clear_route(self) -> None:
+        self._sync(self.route_objects, {}, None)
@@ -1,13 +1,15 @@
 from .passenger import Passenger, PassengerType, GeneralPassenger, StudentPassenger, TeacherPassenger, ElderlyPassenger
 from .payment import PaymentMethod, CashPayment, CreditCardPayment, KentCardPayment
+from .ledger import Ledger, Journal
+from .cards import CardRegistry
 from .vehicle import Vehicle, Bus, Tram, Taxi
-from .location import Location, Stop
-from .route import RouteSegment, RouteOption
+from .location import Location, Stop, StopView, StopTable, haversine, haversine_array, haversine_matrix, coordinate_arrays, distance_matrix
+from .route import RouteSegment, RouteOption, ReachableStop, StopPath, CompactRoute
 
 __all__ = [
     'Passenger', 'PassengerType', 'GeneralPassenger', 'StudentPassenger', 'TeacherPassenger', 'ElderlyPassenger',
-    'PaymentMethod', 'CashPayment', 'CreditCardPayment', 'KentCardPayment',
+    'PaymentMethod', 'CashPayment', 'CreditCardPayment', 'KentCardPayment', 'Ledger', 'Journal', 'CardRegistry',
     'Vehicle', 'Bus', 'Tram', 'Taxi',
-    'Location', 'Stop',
-    'RouteSegment', 'RouteOption'
+    'Location', 'Stop', 'StopView', 'StopTable', 'haversine', 'haversine_array', 'haversine_matrix', 'coordinate_arrays', 'distance_matrix',
+    'RouteSegment', 'RouteOption', 'ReachableStop', 'StopPath', 'CompactRoute'
 ] 
\ No newline at end of file
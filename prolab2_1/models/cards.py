@@ -0,0 +1,89 @@
+import threading
+import zlib
+from typing import Dict, Iterable, Iterator, List, Tuple
+from .payment import PaymentMethod
+
+class CardShard:
+    """Aynı kilidi paylaşan kart grubu"""
+    __slots__ = ("lock", "cards")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.cards: Dict[str, PaymentMethod] = {}
+
+class CardRegistry:
+    """Kartları parçalara bölerek tutan, kilit şeritlemeli (lock striping) ödeme kaydı"""
+
+    def __init__(self, shards: int = 64):
+        if shards < 1:
+            raise ValueError("Parça sayısı en az 1 olmalı")
+        self.shards = [CardShard() for _ in range(shards)]
+
+    def shard_index(self, card_number: str) -> int:
+        # Süreçten bağımsız, kararlı dağılım için crc32
+        return zlib.crc32(card_number.encode("utf-8")) % len(self.shards)
+
+    def register(self, card: PaymentMethod) -> PaymentMethod:
+        """Kartı kaydet; kart bundan sonra parçasının kilidini kullanır"""
+        shard = self.shards[self.shard_index(card.card_number)]
+        with shard.lock:
+            if card.card_number in shard.cards:
+                raise ValueError(f"Kart zaten kayıtlı: {card.card_number}")
+            # Kart kaydedilmeden önce başka iş parçacıklarınca kullanılmamalı
+            card.lock = shard.lock
+            shard.cards[card.card_number] = card
+        return card
+
+    def get(self, card_number: str) -> PaymentMethod:
+        card = self.shards[self.shard_index(card_number)].cards.get(card_number)
+        if card is None:
+            raise ValueError(f"Kayıtlı olmayan kart: {card_number}")
+        return card
+
+    def __contains__(self, card_number: str) -> bool:
+        return card_number in self.shards[self.shard_index(card_number)].cards
+
+    def __len__(self) -> int:
+        return sum(len(shard.cards) for shard in self.shards)
+
+    def __iter__(self) -> Iterator[PaymentMethod]:
+        for shard in self.shards:
+            with shard.lock:
+                cards = list(shard.cards.values())
+            yield from cards
+
+    def process_payment(self, card_number: str, amount: float) -> bool:
+        """Tek ödeme: kontrol ve düşüm yalnızca kartın parçası kilitlenerek atomik yapılır"""
+        return self.get(card_number).process_payment(amount)
+
+    def process_payments(self, payments: Iterable[Tuple[str, float]]) -> List[bool]:
+        """Toplu ödeme: ödemeler parçalara göre gruplanır, her parça kilidi bir kez alınır.
+        Aynı karta ait ödemeler verilen sırayla uygulanır; sonuçlar giriş sırasındadır."""
+        payments = list(payments)
+        groups: Dict[int, List[int]] = {}
+        cards = []
+        for position, (card_number, _) in enumerate(payments):
+            cards.append(self.get(card_number))
+            groups.setdefault(self.shard_index(card_number), []).append(position)
+
+        results = [False] * len(payments)
+        sequences: Dict[int, Tuple[PaymentMethod, int]] = {}  # Defter -> (kart, son sıra)
+        for shard_index, positions in groups.items():
+            with self.shards[shard_index].lock:
+                for position in positions:
+                    card = cards[position]
+                    results[position] = card.debit(payments[position][1])
+                    sequences[id(card.ledger)] = (card, card.ledger.sequence)
+        # Kalıcı defterlerde fsync beklemesi parça kilitleri bırakıldıktan sonra yapılır
+        for card, sequence in sequences.values():
+            card.ledger.commit(sequence)
+        return results
+
+    def balances(self) -> Dict[str, float]:
+        """Her parça kendi kilidi altında okunarak kart bakiyeleri"""
+        result = {}
+        for shard in self.shards:
+            with shard.lock:
+                for card_number, card in shard.cards.items():
+                    result[card_number] = card.get_balance()
+        return result
@@ -0,0 +1,255 @@
+import atexit
+import math
+import mmap
+import os
+import struct
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+# Günlük dosyası başlığı: sihirli sayı, biçim sürümü
+JOURNAL_MAGIC = b"TSLG"
+JOURNAL_VERSION = 1
+JOURNAL_HEADER = struct.Struct("<4sI")
+# Kayıt: zaman damgası (epoch saniye), tutar, işlem sonrası bakiye, başarı
+RECORD = struct.Struct("<dddB")
+
+class _JournalTimestamps:
+    """bisect için günlük kayıtlarının zaman damgalarına dizi gibi erişim"""
+
+    def __init__(self, mapped: mmap.mmap, total: int):
+        self.mapped = mapped
+        self.total = total
+
+    def __len__(self) -> int:
+        return self.total
+
+    def __getitem__(self, index: int) -> float:
+        return struct.unpack_from("<d", self.mapped, JOURNAL_HEADER.size + index * RECORD.size)[0]
+
+def to_entry(timestamp: float, amount: float, balance: float, success: Any) -> Dict[str, Any]:
+    """Kaydı işlem geçmişi sözlüğüne çevir (eski transaction_history biçimi)"""
+    return {
+        "amount": amount,
+        "success": bool(success),
+        "timestamp": datetime.fromtimestamp(timestamp)
+    }
+
+class Journal:
+    """Yalnızca ekleme yapılan işlem günlüğü; yazma ve fsync arka planda toplu yapılır"""
+
+    def __init__(self, path: str, sync_interval: float = 0.005, batch_size: int = 4096):
+        self.path = path
+        self.sync_interval = sync_interval  # En fazla bu kadar saniyelik kayıt diske inmemiş olabilir
+        self.batch_size = batch_size  # Bu kadar kayıt birikince beklemeden yazılır
+        self.pending = bytearray()
+        self.appended = 0  # Eklenen kayıt sayısı (sıra numarası)
+        self.synced = 0  # fsync ile diske inmiş kayıt sayısı
+        self.closed = False
+        self.condition = threading.Condition()
+
+        new = not os.path.exists(path) or os.path.getsize(path) == 0
+        if not new:
+            self.trim()
+        self.file = open(path, "ab")
+        if new:
+            self.file.write(JOURNAL_HEADER.pack(JOURNAL_MAGIC, JOURNAL_VERSION))
+            self.file.flush()
+            os.fsync(self.file.fileno())
+
+        self.writer = threading.Thread(target=self.run, name="journal-writer", daemon=True)
+        self.writer.start()
+        atexit.register(self.close)
+
+    def trim(self) -> None:
+        """Başlığı doğrula, yarım yazılmış son kaydı kes"""
+        with open(self.path, "r+b") as file:
+            magic, version = JOURNAL_HEADER.unpack(file.read(JOURNAL_HEADER.size))
+            if magic != JOURNAL_MAGIC or version != JOURNAL_VERSION:
+                raise ValueError(f"Geçersiz işlem günlüğü: {self.path}")
+            size = os.fstat(file.fileno()).st_size - JOURNAL_HEADER.size
+            if size % RECORD.size:
+                file.truncate(JOURNAL_HEADER.size + size // RECORD.size * RECORD.size)
+
+    def append(self, record: bytes) -> int:
+        """Kaydı sıraya ekle, sıra numarasını döndür (diske inmesi beklenmez)"""
+        with self.condition:
+            if self.closed:
+                raise ValueError(f"İşlem günlüğü kapalı: {self.path}")
+            self.pending += record
+            self.appended += 1
+            if len(self.pending) >= self.batch_size * RECORD.size:
+                self.condition.notify_all()
+            return self.appended
+
+    def wait(self, sequence: Optional[int] = None) -> None:
+        """Verilen sıraya (varsayılan: son kayıt) kadar kayıtlar diske inene dek bekle"""
+        with self.condition:
+            sequence = self.appended if sequence is None else sequence
+            # Grup commit: aynı fsync bekleyen tüm çağıranları birlikte uyandırır
+            self.condition.notify_all()
+            while self.synced < sequence and not self.closed:
+                self.condition.wait()
+
+    def run(self) -> None:
+        while True:
+            with self.condition:
+                if not self.pending and not self.closed:
+                    self.condition.wait(self.sync_interval)
+                if not self.pending:
+                    if self.closed:
+                        return
+                    continue
+                batch, self.pending = self.pending, bytearray()
+                sequence = self.appended
+            # Dosyaya yazma ve fsync kilit dışında; bu sırada yeni kayıtlar birikir
+            self.file.write(batch)
+            self.file.flush()
+            os.fsync(self.file.fileno())
+            with self.condition:
+                self.synced = sequence
+                self.condition.notify_all()
+
+    def close(self) -> None:
+        """Bekleyen kayıtları diske yaz ve günlüğü kapat"""
+        with self.condition:
+            if self.closed:
+                return
+            self.closed = True
+            self.condition.notify_all()
+        self.writer.join()
+        self.file.close()
+        atexit.unregister(self.close)
+
+    @staticmethod
+    def tail(path: str, limit: int) -> Tuple[int, List[Tuple[float, float, float, bool]]]:
+        """Günlükteki toplam tam kayıt sayısı ve son limit kaydı"""
+        with open(path, "rb") as file:
+            magic, version = JOURNAL_HEADER.unpack(file.read(JOURNAL_HEADER.size))
+            if magic != JOURNAL_MAGIC or version != JOURNAL_VERSION:
+                raise ValueError(f"Geçersiz işlem günlüğü: {path}")
+            total = (os.fstat(file.fileno()).st_size - JOURNAL_HEADER.size) // RECORD.size
+            # Halka arabelleğe sığmayan eski kayıtlar okunmaz
+            skipped = max(total - limit, 0)
+            file.seek(JOURNAL_HEADER.size + skipped * RECORD.size)
+            data = file.read((total - skipped) * RECORD.size)
+        return total, [(timestamp, amount, balance, bool(success))
+                       for timestamp, amount, balance, success in RECORD.iter_unpack(data)]
+
+class Ledger:
+    """Son işlemleri sabit boyutlu halka arabellekte tutan, isteğe bağlı günlüklü işlem defteri"""
+
+    def __init__(self, capacity: int = 256, journal_path: Optional[str] = None,
+                 sync_interval: float = 0.005, durable: bool = False):
+        if capacity < 1:
+            raise ValueError("Defter kapasitesi en az 1 olmalı")
+        self.capacity = capacity
+        self.durable = durable  # True ise commit, işlem diske inene kadar bekler
+        # Halka arabellek: sütun düzeninde diziler, kapasiteye kadar büyür
+        # (çok sayıda kartta boş arabellekler yer kaplamasın diye)
+        self.timestamps = array('d')
+        self.amounts = array('d')
+        self.balances = array('d')
+        self.successes = array('b')
+        self.head = 0  # Sıradaki yazma konumu
+        self.count = 0  # Tüm zamanlardaki işlem sayısı (günlükten yüklenenler dahil)
+        self.last_timestamp = 0.0
+        self.last_balance: Optional[float] = None
+        self.sequence = 0  # Son kaydın günlük sıra numarası (günlük yoksa 0)
+        self.lock = threading.Lock()
+
+        self.journal_path = journal_path
+        self.journal: Optional[Journal] = None
+        if journal_path is not None:
+            if os.path.exists(journal_path) and os.path.getsize(journal_path) > 0:
+                self.replay()
+            self.journal = Journal(journal_path, sync_interval)
+
+    def replay(self) -> None:
+        """Günlüğün son kayıtlarını arabelleğe yükle, toplam işlem sayısını geri getir"""
+        total, records = Journal.tail(self.journal_path, self.capacity)
+        for timestamp, amount, balance, success in records:
+            self.store(timestamp, amount, balance, success)
+        self.count = total
+
+    def store(self, timestamp: float, amount: float, balance: float, success: bool) -> None:
+        position = self.head
+        if len(self.timestamps) < self.capacity:
+            self.timestamps.append(timestamp)
+            self.amounts.append(amount)
+            self.balances.append(balance)
+            self.successes.append(success)
+        else:
+            self.timestamps[position] = timestamp
+            self.amounts[position] = amount
+            self.balances[position] = balance
+            self.successes[position] = success
+        self.head = (position + 1) % self.capacity
+        self.count += 1
+        self.last_timestamp = timestamp
+        self.last_balance = balance
+
+    def record(self, amount: float, success: bool, balance: Optional[float]) -> int:
+        """Yeni işlemi arabelleğe ve (varsa) günlüğe ekle, günlük sıra numarasını döndür.
+        Diske inmesi beklenmez; kalıcılık için kart kilidi bırakıldıktan sonra commit çağrılır."""
+        balance = math.nan if balance is None else balance  # Bakiyesiz yöntemler
+        with self.lock:
+            # Zaman damgaları azalmaz; aralık sorguları ikili arama kullanır
+            timestamp = max(time.time(), self.last_timestamp)
+            self.store(timestamp, amount, balance, success)
+            if self.journal is not None:
+                self.sequence = self.journal.append(RECORD.pack(timestamp, amount, balance, success))
+            return self.sequence
+    
+    def commit(self, sequence: int) -> None:
+        """durable ise verilen sıraya kadar kayıtlar diske inene dek bekle.
+        Kilit dışında çağrılır; eşzamanlı bekleyenler aynı fsync'i paylaşır (grup commit)."""
+        if self.journal is not None and self.durable:
+            self.journal.wait(sequence)
+
+    def sync(self) -> None:
+        """Şimdiye kadarki tüm işlemler diske inene kadar bekle"""
+        if self.journal is not None:
+            self.journal.wait()
+
+    def close(self) -> None:
+        if self.journal is not None:
+            self.journal.close()
+
+    def __len__(self) -> int:
+        """Arabellekte tutulan (son) işlem sayısı"""
+        return len(self.timestamps)
+
+    def recent(self) -> List[Tuple[float, float, float, bool]]:
+        """Arabellekteki işlemler, eskiden yeniye"""
+        with self.lock:
+            size = len(self)
+            start = (self.head - size) % self.capacity
+            return [(self.timestamps[i], self.amounts[i], self.balances[i], bool(self.successes[i]))
+                    for i in ((start + offset) % self.capacity for offset in range(size))]
+
+    def between(self, start: datetime, end: datetime) -> List[Dict[str, Any]]:
+        """[start, end] aralığındaki işlemler; günlük varsa tüm geçmiş, yoksa arabellek aranır"""
+        low, high = start.timestamp(), end.timestamp()
+        if self.journal is None:
+            records = self.recent()
+            timestamps = [record[0] for record in records]
+            return [to_entry(*record) for record in
+                    records[bisect_left(timestamps, low):bisect_right(timestamps, high)]]
+
+        self.sync()
+        with open(self.journal_path, "rb") as file:
+            size = os.fstat(file.fileno()).st_size
+            if size <= JOURNAL_HEADER.size:
+                return []
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                # Kayıtlar zaman sırasında; sınırlar ikili aramayla bulunur
+                total = (size - JOURNAL_HEADER.size) // RECORD.size
+                timestamps = _JournalTimestamps(mapped, total)
+                first = bisect_left(timestamps, low)
+                last = bisect_right(timestamps, high)
+                return [to_entry(*RECORD.unpack_from(mapped, JOURNAL_HEADER.size + i * RECORD.size))
+                        for i in range(first, last)]
@@ -1,28 +1,78 @@
 import math
-from typing import List, Dict, Optional
+from array import array
+from functools import lru_cache, partial
+from typing import Any, List, Dict, Iterable, Iterator, Mapping, Optional, Sequence
+import numpy as np
 from .vehicle import Vehicle
 
+def haversine(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    # İki nokta arasındaki mesafeyi hesaplamak için Haversine formülü
+    R = 6371  # Dünya'nın yarıçapı (kilometre)
+    
+    lat1, lon1 = math.radians(lat1), math.radians(lon1)
+    lat2, lon2 = math.radians(lat2), math.radians(lon2)
+    
+    dlat = lat2 - lat1
+    dlon = lon2 - lon1
+    
+    a = math.sin(dlat/2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon/2)**2
+    c = 2 * math.asin(math.sqrt(a))
+    
+    return R * c
+
+def haversine_array(lat, lon, lats, lons) -> np.ndarray:
+    # Haversine formülünün NumPy ile vektörleştirilmiş hali (yayın kurallarına uyar)
+    R = 6371  # Dünya'nın yarıçapı (kilometre)
+    
+    lat1, lon1 = np.radians(lat), np.radians(lon)
+    lat2, lon2 = np.radians(lats), np.radians(lons)
+    
+    dlat = lat2 - lat1
+    dlon = lon2 - lon1
+    
+    a = np.sin(dlat/2)**2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon/2)**2
+    c = 2 * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+    
+    return R * c
+
+def haversine_matrix(lats1, lons1, lats2, lons2) -> np.ndarray:
+    """İlk nokta kümesinden ikinciye (m x n) mesafe matrisini hesapla"""
+    lats1 = np.asarray(lats1, dtype=np.float64)[:, np.newaxis]
+    lons1 = np.asarray(lons1, dtype=np.float64)[:, np.newaxis]
+    return haversine_array(lats1, lons1,
+                           np.asarray(lats2, dtype=np.float64)[np.newaxis, :],
+                           np.asarray(lons2, dtype=np.float64)[np.newaxis, :])
+
+def coordinate_arrays(locations: Sequence['Location']):
+    """Konum listesini enlem ve boylam dizilerine ayır"""
+    lats = np.fromiter((location.lat for location in locations), dtype=np.float64, count=len(locations))
+    lons = np.fromiter((location.lon for location in locations), dtype=np.float64, count=len(locations))
+    return lats, lons
+
+def distance_matrix(locations: Sequence['Location']) -> np.ndarray:
+    """Konumlar arasındaki (n x n) mesafe matrisini hesapla"""
+    lats, lons = coordinate_arrays(locations)
+    return haversine_matrix(lats, lons, lats, lons)
+
 class Location:
+    __slots__ = ("lat", "lon")
+    
     def __init__(self, lat: float, lon: float):
         self.lat = lat  # Enlem
         self.lon = lon  # Boylam
     
     def distance_to(self, other: 'Location') -> float:
-        # İki nokta arasındaki mesafeyi hesaplamak için Haversine formülü
-        R = 6371  # Dünya'nın yarıçapı (kilometre)
-        
-        lat1, lon1 = math.radians(self.lat), math.radians(self.lon)
-        lat2, lon2 = math.radians(other.lat), math.radians(other.lon)
-        
-        dlat = lat2 - lat1
-        dlon = lon2 - lon1
-        
-        a = math.sin(dlat/2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon/2)**2
-        c = 2 * math.asin(math.sqrt(a))
-        
-        return R * c
+        return haversine(self.lat, self.lon, other.lat, other.lon)
+    
+    def distances_to(self, lats, lons) -> np.ndarray:
+        """Koordinat dizilerindeki tüm noktalara olan mesafeleri hesapla"""
+        return haversine_array(self.lat, self.lon,
+                               np.asarray(lats, dtype=np.float64),
+                               np.asarray(lons, dtype=np.float64))
 
 class Stop(Location):
+    __slots__ = ("id", "name", "type", "son_durak", "next_stops", "transfer")
+    
     def __init__(self, id: str, name: str, type: str, lat: float, lon: float, 
                  son_durak: bool, next_stops: List[Dict], transfer: Optional[Dict]):
         super().__init__(lat, lon)
@@ -31,4 +81,130 @@ class Stop(Location):
         self.type = type
         self.son_durak = son_durak  # Son durak mı?
         self.next_stops = next_stops  # Sonraki duraklar
-        self.transfer = transfer  # Aktarma bilgisi 
\ No newline at end of file
+        self.transfer = transfer  # Aktarma bilgisi
+
+class StopView(Stop):
+    """StopTable satırına bağlı hafif durak nesnesi; kenar bilgileri erişildikçe üretilir"""
+    __slots__ = ("table", "index")
+    
+    def __init__(self, table: 'StopTable', index: int):
+        self.table = table
+        self.index = index
+        self.id = table.stop_ids[index]
+        self.name = table.strings[table.name_refs[index]]
+        self.type = table.strings[table.type_refs[index]]
+        self.lat = table.lats[index]
+        self.lon = table.lons[index]
+        self.son_durak = bool(table.terminals[index])
+    
+    @property
+    def next_stops(self) -> List[Dict]:
+        # Ham "nextStops" sözlükleri kenar dizilerinden JSON'daki sırayla kurulur;
+        # kapatılmış (ücreti sonsuz) kenarlar listelenmez
+        edges = self.table.edges
+        if edges is None:
+            return []
+        stop_ids = self.table.stop_ids
+        return [{"stopId": stop_ids[edges.targets[edge]],
+                 "mesafe": edges.distances[edge],
+                 "sure": edges.times[edge],
+                 "ucret": edges.costs[edge]}
+                for edge in range(edges.offsets[self.index], edges.offsets[self.index + 1])
+                if not edges.transfers[edge] and edges.costs[edge] != math.inf]
+    
+    @property
+    def transfer(self) -> Optional[Dict]:
+        edges = self.table.edges
+        if edges is None:
+            return None
+        for edge in range(edges.offsets[self.index], edges.offsets[self.index + 1]):
+            if edges.transfers[edge] and edges.costs[edge] != math.inf:
+                return {"transferStopId": self.table.stop_ids[edges.targets[edge]],
+                        "transferSure": edges.times[edge],
+                        "transferUcret": edges.costs[edge]}
+        return None
+    
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, StopView):
+            return self.table is other.table and self.index == other.index
+        return NotImplemented
+    
+    def __hash__(self) -> int:
+        return hash((id(self.table), self.index))
+
+class StopTable(Mapping[str, Stop]):
+    """Durak bilgilerini tipli dizilerde (sütun düzeninde) tutan, istenince StopView üreten tablo"""
+    VIEW_CACHE_SIZE = 4096  # Önbellekte tutulan en fazla görünüm sayısı
+    
+    def __init__(self, strings: Optional[List[str]] = None, id_refs=None, name_refs=None,
+                 type_refs=None, lats=None, lons=None, terminals=None, edges: Any = None):
+        self.strings = strings if strings is not None else []  # Tekilleştirilmiş metinler
+        self.id_refs = id_refs if id_refs is not None else array('l')  # Metin tablosu indeksleri
+        self.name_refs = name_refs if name_refs is not None else array('l')
+        self.type_refs = type_refs if type_refs is not None else array('l')
+        self.lats = lats if lats is not None else array('d')
+        self.lons = lons if lons is not None else array('d')
+        self.terminals = terminals if terminals is not None else array('b')  # Son durak mı? (0/1)
+        # Kenar dizilerini (offsets, targets, costs, times, distances, transfers) taşıyan
+        # nesne; genellikle derlenmiş ağın kendisidir, diziler kopyalanmaz
+        self.edges = edges
+        
+        self.stop_ids = [self.strings[ref] for ref in self.id_refs]
+        self.index: Dict[str, int] = {stop_id: i for i, stop_id in enumerate(self.stop_ids)}
+        self.positions: Optional[Dict[str, int]] = None  # Metin -> indeks (ekleme sırasında kurulur)
+        # Son kullanılan görünümler yeniden kullanılır; görünümler değişmez, kenar
+        # bilgileri her erişimde ağdan okunduğu için paylaşılmaları güvenlidir
+        self.view = lru_cache(maxsize=self.VIEW_CACHE_SIZE)(partial(StopView, self))
+    
+    @classmethod
+    def from_stops(cls, stops: Iterable[Stop], edges: Any = None) -> 'StopTable':
+        """Durak nesnelerinden tabloyu oluştur"""
+        table = cls(edges=edges)
+        for stop in stops:
+            table.add(stop.id, stop.name, stop.type, stop.lat, stop.lon, stop.son_durak)
+        table.positions = None  # Yalnızca ekleme sırasında gerekli
+        return table
+    
+    def intern(self, text: str) -> int:
+        """Metni tabloya bir kez ekle, indeksini döndür"""
+        if self.positions is None:
+            self.positions = {text: i for i, text in enumerate(self.strings)}
+        position = self.positions.get(text)
+        if position is None:
+            position = self.positions[text] = len(self.strings)
+            # sys.intern kullanılmaz: yorumlayıcının intern tablosu metin başına ek yer tutar,
+            # tekilleştirme zaten positions sözlüğüyle yapılır
+            self.strings.append(text)
+        return position
+    
+    def add(self, id: str, name: str, type: str, lat: float, lon: float, son_durak: bool) -> int:
+        """Tabloya yeni bir durak satırı ekle, indeksini döndür"""
+        if id in self.index:
+            raise ValueError(f"Yinelenen durak kimliği: {id}")
+        index = len(self.stop_ids)
+        id_ref = self.intern(id)
+        self.id_refs.append(id_ref)
+        self.name_refs.append(self.intern(name))
+        self.type_refs.append(self.intern(type))
+        self.lats.append(lat)
+        self.lons.append(lon)
+        self.terminals.append(1 if son_durak else 0)
+        self.stop_ids.append(self.strings[id_ref])
+        self.index[self.strings[id_ref]] = index
+        return index
+    
+    def stop(self, index: int) -> StopView:
+        """İndeksteki durağın görünümünü döndür"""
+        return self.view(index)
+    
+    def __getitem__(self, stop_id: str) -> StopView:
+        return self.view(self.index[stop_id])
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.stop_ids)
+    
+    def __len__(self) -> int:
+        return len(self.stop_ids)
+    
+    def __contains__(self, stop_id: object) -> bool:
+        return stop_id in self.index
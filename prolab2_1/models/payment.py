@@ -1,42 +1,70 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
-from datetime import datetime
+import math
+import threading
+from typing import Dict, Any, List, Optional
+from .ledger import Ledger, to_entry
 
 class PaymentMethod(ABC):
-    def __init__(self):
-        self.transaction_history = []
+    def __init__(self, ledger: Optional[Ledger] = None):
+        # İşlemler sınırsız liste yerine halka arabellekli (isteğe bağlı günlüklü) defterde
+        self.ledger = ledger if ledger is not None else Ledger()
+        # Bakiye kontrolü ve düşümü bu kilit altında atomik yapılır; kart bir
+        # CardRegistry'ye kaydedilince kilit, kartın parçasının kilidiyle değişir
+        self.lock = threading.Lock()
     
-    @abstractmethod
     def process_payment(self, amount: float) -> bool:
         """Ödeme işlemini gerçekleştir"""
+        with self.lock:
+            success = self.debit(amount)
+            sequence = self.ledger.sequence
+        # Günlüğün diske inmesi kilit dışında beklenir; aynı kilidi paylaşan
+        # kartlar birbirinin fsync'ini beklemez
+        self.ledger.commit(sequence)
+        return success
+    
+    @abstractmethod
+    def debit(self, amount: float) -> bool:
+        """Bakiye kontrolü ve düşümü (çağıran self.lock'u tutar)"""
         pass
     
     def add_transaction(self, amount: float, success: bool) -> None:
         """İşlem geçmişine yeni ödeme ekle"""
-        self.transaction_history.append({
-            "amount": amount,
-            "success": success,
-            "timestamp": datetime.now()
-        })
+        self.ledger.record(amount, success, self.get_balance())
+    
+    @property
+    def transaction_history(self) -> List[Dict[str, Any]]:
+        """Defterde tutulan son işlemler, eskiden yeniye"""
+        return [to_entry(*record) for record in self.ledger.recent()]
     
     def get_balance(self) -> Optional[float]:
         """Mevcut bakiyeyi döndür (varsa)"""
         return None
     
+    def set_balance(self, balance: float) -> None:
+        """Bakiyeyi günlükten geri yüklerken kullanılır"""
+        pass
+    
+    def restore_balance(self) -> None:
+        """Defter günlükten yüklendiyse son işlemdeki bakiyeyi uygula"""
+        balance = self.ledger.last_balance
+        if balance is not None and not math.isnan(balance):
+            self.set_balance(balance)
+    
     def to_dict(self) -> Dict[str, Any]:
         """Ödeme yöntemi bilgilerini sözlük olarak döndür"""
         return {
             "type": self.__class__.__name__,
             "balance": self.get_balance(),
-            "transaction_count": len(self.transaction_history)
+            "transaction_count": self.ledger.count
         }
 
 class CashPayment(PaymentMethod):
-    def __init__(self, initial_amount: float = 0.0):
-        super().__init__()
+    def __init__(self, initial_amount: float = 0.0, ledger: Optional[Ledger] = None):
+        super().__init__(ledger)
         self.amount = initial_amount
+        self.restore_balance()
     
-    def process_payment(self, amount: float) -> bool:
+    def debit(self, amount: float) -> bool:
         if self.amount >= amount:
             self.amount -= amount
             self.add_transaction(amount, True)
@@ -46,17 +74,22 @@ class CashPayment(PaymentMethod):
     
     def get_balance(self) -> float:
         return self.amount
+    
+    def set_balance(self, balance: float) -> None:
+        self.amount = balance
 
 class CreditCardPayment(PaymentMethod):
-    def __init__(self, card_number: str, expiry_date: str, cvv: str, limit: float = 1000.0):
-        super().__init__()
+    def __init__(self, card_number: str, expiry_date: str, cvv: str, limit: float = 1000.0,
+                 ledger: Optional[Ledger] = None):
+        super().__init__(ledger)
         self.card_number = card_number
         self.expiry_date = expiry_date
         self.cvv = cvv
         self.limit = limit
         self.current_usage = 0.0
+        self.restore_balance()
     
-    def process_payment(self, amount: float) -> bool:
+    def debit(self, amount: float) -> bool:
         if self.current_usage + amount <= self.limit:
             self.current_usage += amount
             self.add_transaction(amount, True)
@@ -66,14 +99,18 @@ class CreditCardPayment(PaymentMethod):
     
     def get_balance(self) -> float:
         return self.limit - self.current_usage
+    
+    def set_balance(self, balance: float) -> None:
+        self.current_usage = self.limit - balance
 
 class KentCardPayment(PaymentMethod):
-    def __init__(self, card_number: str, balance: float):
-        super().__init__()
+    def __init__(self, card_number: str, balance: float, ledger: Optional[Ledger] = None):
+        super().__init__(ledger)
         self.card_number = card_number
         self.balance = balance
+        self.restore_balance()
     
-    def process_payment(self, amount: float) -> bool:
+    def debit(self, amount: float) -> bool:
         if self.balance >= amount:
             self.balance -= amount
             self.add_transaction(amount, True)
@@ -82,4 +119,7 @@ class KentCardPayment(PaymentMethod):
         return False
     
     def get_balance(self) -> float:
-        return self.balance 
\ No newline at end of file
+        return self.balance 
+    
+    def set_balance(self, balance: float) -> None:
+        self.balance = balance
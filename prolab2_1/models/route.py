@@ -1,6 +1,7 @@
 from dataclasses import dataclass
-from typing import List
-from .location import Stop
+from array import array
+from typing import Any, Dict, List, Optional
+from .location import Location, Stop
 from .vehicle import Vehicle
 
 @dataclass
@@ -12,6 +13,7 @@ class RouteSegment:
     cost: float  # Ücret
     time: float  # Süre
     is_transfer: bool = False  # Aktarma mı?
+    wait_time: float = 0.0  # Parçaya başlamadan önceki bekleme (sefer saatli rotalarda)
 
 @dataclass
 class RouteOption:
@@ -23,4 +25,125 @@ class RouteOption:
     requires_final_taxi: bool  # Sonda taksi gerekiyor mu?
     start_distance: float  # Başlangıç mesafesi
     end_distance: float  # Bitiş mesafesi
-    transfer_count: int = 0  # Aktarma sayısı 
\ No newline at end of file
+    transfer_count: int = 0  # Aktarma sayısı
+
+@dataclass
+class ReachableStop:
+    stop: Stop  # Ulaşılabilen durak
+    total_cost: float  # Yolcuya göre toplam ücret (erişim dahil)
+    total_time: float  # Yolcuya göre toplam süre (erişim dahil)
+    total_distance: float  # Toplam mesafe (erişim dahil)
+    transfer_count: int = 0  # Aktarma sayısı
+    is_direct: bool = False  # Direkt bağlantı kuralıyla mı ulaşılıyor?
+
+class StopPath:
+    """Yolcudan bağımsız, önbellekte tutulan kompakt durak-durak yolu"""
+    __slots__ = ("start", "end", "edges", "cost", "time", "distance", "transfers")
+    
+    def __init__(self, start: int, end: int, edges: Optional[array],
+                 cost: float, time: float, distance: float, transfers: int):
+        self.start = start  # Başlangıç durak indeksi
+        self.end = end  # Bitiş durak indeksi
+        self.edges = edges  # Ağdaki kenar indeksleri (None: direkt bağlantı)
+        self.cost = cost  # Ham toplam ücret
+        self.time = time  # Ham toplam süre
+        self.distance = distance  # Ham toplam mesafe
+        self.transfers = transfers  # Aktarma sayısı
+    
+    @property
+    def is_direct(self) -> bool:
+        return self.edges is None
+
+class CompactRoute:
+    """Toplamları hemen, parçaları ve erişim ayrıntılarını ilk erişimde üreten rota sonucu"""
+    __slots__ = ("system", "path", "passenger", "start_location", "end_location",
+                 "start_distance", "end_distance", "total_cost", "total_time", "total_distance",
+                 "requires_initial_taxi", "requires_final_taxi",
+                 "_segments", "_start_access", "_end_access", "_route")
+    
+    def __init__(self, system: Any, path: StopPath, passenger: Any,
+                 start_location: Location, end_location: Location,
+                 start_distance: float, end_distance: float,
+                 total_cost: float, total_time: float, total_distance: float,
+                 requires_initial_taxi: bool, requires_final_taxi: bool):
+        self.system = system  # Parçaları ve erişim ayrıntılarını üreten ulaşım sistemi
+        self.path = path
+        self.passenger = passenger
+        self.start_location = start_location
+        self.end_location = end_location
+        self.start_distance = start_distance
+        self.end_distance = end_distance
+        self.total_cost = total_cost
+        self.total_time = total_time
+        self.total_distance = total_distance
+        self.requires_initial_taxi = requires_initial_taxi
+        self.requires_final_taxi = requires_final_taxi
+        self._segments = None
+        self._start_access = None
+        self._end_access = None
+        self._route = None
+    
+    @property
+    def transfer_count(self) -> int:
+        return self.path.transfers
+    
+    @property
+    def stop_indices(self) -> array:
+        """Yol üzerindeki durakların ağ indeksleri"""
+        return self.system.path_stops(self.path)
+    
+    @property
+    def start_stop(self) -> Stop:
+        return self.system.stop_at(self.path.start)
+    
+    @property
+    def end_stop(self) -> Stop:
+        return self.system.stop_at(self.path.end)
+    
+    @property
+    def segments(self) -> List[RouteSegment]:
+        if self._segments is None:
+            self._segments = self.system.path_segments(self.path)
+        return self._segments
+    
+    @property
+    def start_access(self) -> Dict:
+        if self._start_access is None:
+            self._start_access = self.system.evaluate_stop_access(
+                self.start_location, self.start_stop, self.passenger)
+        return self._start_access
+    
+    @property
+    def end_access(self) -> Dict:
+        if self._end_access is None:
+            self._end_access = self.system.evaluate_stop_access(
+                self.end_location, self.end_stop, self.passenger)
+        return self._end_access
+    
+    @property
+    def route(self) -> RouteOption:
+        """Tam RouteOption nesnesi"""
+        if self._route is None:
+            self._route = RouteOption(
+                segments=self.segments,
+                total_cost=self.total_cost,
+                total_time=self.total_time,
+                total_distance=self.total_distance,
+                requires_initial_taxi=self.requires_initial_taxi,
+                requires_final_taxi=self.requires_final_taxi,
+                start_distance=self.start_distance,
+                end_distance=self.end_distance,
+                transfer_count=self.transfer_count
+            )
+        return self._route
+    
+    def __getitem__(self, key: str) -> Any:
+        # find_route sözlük sonucuyla aynı anahtarlar
+        if key not in ("start_stop", "end_stop", "start_access", "end_access", "route"):
+            raise KeyError(key)
+        return getattr(self, key)
+    
+    def to_dict(self) -> Dict:
+        """find_route ile aynı biçimde tam sonuç sözlüğü"""
+        return {key: self[key] for key in ("start_stop", "end_stop", "start_access",
+                                            "end_access", "route")}
@@ -0,0 +1,26 @@
+from .network import (
+    CompiledNetwork, shortest_path, shortest_path_tree, tree_values, reverse_path_costs, VEHICLE_BUS, VEHICLE_TRAM
+)
+from .pareto import ParetoPath, pareto_paths
+from .search import SearchStrategy, astar_path, bidirectional_path, find_path
+from .spatial import SpatialIndex
+from .names import NameIndex, fold_name
+from .parallel import ParallelRouter
+from .hierarchy import ContractionHierarchy
+from .table import RouteTable
+from .timetable import Timetable, parse_clock, format_clock
+from .isochrone import convex_hull, isochrone_collection
+from .cache import RouteCache
+from .locks import ReadWriteLock
+from .loader import StopStream, compile_stops, load_stops
+from .snapshot import NetworkSnapshot
+from .tracing import Tracer, NullTracer, NULL_TRACER
+
+__all__ = [
+    'CompiledNetwork', 'shortest_path', 'shortest_path_tree', 'tree_values', 'reverse_path_costs', 'VEHICLE_BUS', 'VEHICLE_TRAM',
+    'ParetoPath', 'pareto_paths',
+    'SearchStrategy', 'astar_path', 'bidirectional_path', 'find_path',
+    'SpatialIndex', 'NameIndex', 'fold_name', 'ParallelRouter', 'RouteTable', 'Timetable', 'parse_clock', 'format_clock', 'convex_hull', 'isochrone_collection', 'RouteCache', 'ReadWriteLock', 'ContractionHierarchy',
+    'StopStream', 'compile_stops', 'load_stops', 'NetworkSnapshot',
+    'Tracer', 'NullTracer', 'NULL_TRACER'
+]
@@ -0,0 +1,86 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+class RouteCache:
+    """Boyut ve yaşam süresi (TTL) sınırlı, en az kullanılanı çıkaran (LRU) önbellek"""
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.maxsize = maxsize  # En fazla kayıt sayısı
+        self.ttl = ttl  # Saniye cinsinden yaşam süresi (None: sınırsız)
+        self.clock = clock
+        self.entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self.lock = threading.Lock()
+
+        # İstatistikler
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Kayıt varsa ve süresi dolmadıysa döndür, yoksa None"""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires, value = entry
+            if expires is not None and expires <= self.clock():
+                del self.entries[key]
+                self.evictions += 1
+                self.misses += 1
+                return None
+
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Kaydı ekle, boyut aşılırsa en eski kullanılanı çıkar"""
+        if self.maxsize <= 0:
+            return
+
+        expires = self.clock() + self.ttl if self.ttl is not None else None
+        with self.lock:
+            self.entries[key] = (expires, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def rekey(self, transform: Callable[[Hashable, Any], Optional[Hashable]]) -> int:
+        """Kayıtları transform'un döndürdüğü yeni anahtara taşı; None dönenleri sil.
+        LRU sırası korunur, silinen kayıt sayısını döndürür."""
+        with self.lock:
+            entries = OrderedDict()
+            for key, (expires, value) in self.entries.items():
+                new_key = transform(key, value)
+                if new_key is not None:
+                    entries[new_key] = (expires, value)
+            removed = len(self.entries) - len(entries)
+            self.entries = entries
+            return removed
+
+    def clear(self) -> None:
+        """Tüm kayıtları sil"""
+        with self.lock:
+            self.entries.clear()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """Önbellek istatistiklerini döndür"""
+        total = self.hits + self.misses
+        return {
+            "size": len(self.entries),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / total if total else 0.0
+        }
@@ -0,0 +1,345 @@
+from array import array
+from heapq import heappush, heappop, heapify
+from typing import Dict, List, Optional, Tuple
+from .network import CompiledNetwork
+from .storage import write_arrays, map_arrays, is_current
+
+Label = Tuple[float, float, float]  # (ücret, süre, mesafe), sözlük sırasıyla karşılaştırılır
+UNREACHED: Label = (float('inf'), float('inf'), float('inf'))
+
+def _add(first: Label, second: Label) -> Label:
+    return (first[0] + second[0], first[1] + second[1], first[2] + second[2])
+
+class ContractionHierarchy:
+    """Kontraksiyon hiyerarşisi: düğüm sıralaması, kısayol kenarları ve sorgu motoru"""
+
+    # Dosya biçimi: 2. sürümden itibaren yaylar süre ve mesafeyi de taşır
+    VERSION = 2
+
+    # Dosyaya yazılan diziler
+    ARRAY_FIELDS = ("ranks", "arc_tails", "arc_heads", "arc_costs", "arc_times", "arc_distances",
+                    "arc_edges", "arc_first", "arc_second",
+                    "up_offsets", "up_heads", "up_arcs",
+                    "down_offsets", "down_tails", "down_arcs")
+
+    def __init__(self, num_stops: int, digest: str, ranks, arc_tails, arc_heads,
+                 arc_costs, arc_times, arc_distances, arc_edges, arc_first, arc_second,
+                 up_offsets, up_heads, up_arcs, down_offsets, down_tails, down_arcs):
+        self.num_stops = num_stops
+        self.digest = digest  # Hiyerarşinin üretildiği ağ dosyasının özeti
+        self.ranks = ranks  # Durakların kontraksiyon sırası
+        # Yay (arc) bilgileri: özgün kenarlar için arc_edges >= 0, kısayollar
+        # için arc_first/arc_second birleştirilen iki alt yayı gösterir
+        self.arc_tails = arc_tails
+        self.arc_heads = arc_heads
+        self.arc_costs = arc_costs
+        self.arc_times = arc_times
+        self.arc_distances = arc_distances
+        self.arc_edges = arc_edges
+        self.arc_first = arc_first
+        self.arc_second = arc_second
+        # İleri arama için sırası yükselen yaylar (kuyruk -> baş)
+        self.up_offsets = up_offsets
+        self.up_heads = up_heads
+        self.up_arcs = up_arcs
+        # Geri arama için başa göre gruplanmış, kuyruğu daha yüksek sıralı yaylar
+        self.down_offsets = down_offsets
+        self.down_tails = down_tails
+        self.down_arcs = down_arcs
+        self.mapping = None
+
+    @classmethod
+    def build(cls, network: CompiledNetwork, digest: str,
+              witness_limit: int = 500) -> 'ContractionHierarchy':
+        """Ağın kontraksiyon hiyerarşisini oluştur. Yaylar shortest_path ile aynı
+        (ücret, süre, mesafe) sırasıyla karşılaştırılır; eşit ücretli yollarda da aynı yol bulunur."""
+        n = network.num_stops
+        arc_labels: List[Label] = []
+        arc_edges: List[int] = []
+        arc_first: List[int] = []
+        arc_second: List[int] = []
+        arc_tails: List[int] = []
+        arc_heads: List[int] = []
+
+        def add_arc(tail: int, head: int, label: Label, edge: int, first: int, second: int) -> int:
+            arc_labels.append(label)
+            arc_edges.append(edge)
+            arc_first.append(first)
+            arc_second.append(second)
+            arc_tails.append(tail)
+            arc_heads.append(head)
+            return len(arc_labels) - 1
+
+        # Kalan graf: her durak çifti için en iyi etiketli yay tutulur
+        outgoing: List[Dict[int, int]] = [{} for _ in range(n)]
+        incoming: List[Dict[int, int]] = [{} for _ in range(n)]
+        superseded = set()  # Daha iyisi eklenen yaylar sorgu grafına girmez
+
+        def replace_arc(tail: int, head: int, label: Label, edge: int, first: int, second: int) -> None:
+            existing = outgoing[tail].get(head)
+            if existing is not None:
+                if arc_labels[existing] <= label:
+                    return
+                superseded.add(existing)
+            arc = add_arc(tail, head, label, edge, first, second)
+            outgoing[tail][head] = arc
+            incoming[head][tail] = arc
+        for edge in range(network.num_edges):
+            tail = network.sources[edge]
+            head = network.targets[edge]
+            cost = network.costs[edge]
+            if tail == head or cost == float('inf'):
+                continue  # Döngüler ve kapalı kenarlar hiyerarşiye girmez
+            replace_arc(tail, head, (cost, network.times[edge], network.distances[edge]), edge, -1, -1)
+
+        def witness_labels(start: int, skip: int, limit: Label) -> Dict[int, Label]:
+            # skip durağı olmadan start'tan sınırlı Dijkstra (tanık arama)
+            labels = {start: (0.0, 0.0, 0.0)}
+            pq = [(0.0, 0.0, 0.0, start)]
+            settled = 0
+            while pq and settled < witness_limit:
+                cost, time, distance, node = heappop(pq)
+                label = (cost, time, distance)
+                if label > labels.get(node, UNREACHED):
+                    continue
+                if label > limit:
+                    break
+                settled += 1
+                for head, arc in outgoing[node].items():
+                    if head == skip:
+                        continue
+                    new_label = _add(label, arc_labels[arc])
+                    if new_label < labels.get(head, UNREACHED):
+                        labels[head] = new_label
+                        heappush(pq, new_label + (head,))
+            return labels
+
+        def shortcuts(node: int) -> List[Tuple[int, int, Label, int, int]]:
+            # node çıkarılırsa gereken kısayollar: (kuyruk, baş, etiket, yay1, yay2)
+            needed = []
+            heads = outgoing[node]
+            if not heads:
+                return needed
+            max_out = max(arc_labels[arc] for arc in heads.values())
+            for tail, in_arc in incoming[node].items():
+                in_label = arc_labels[in_arc]
+                witnesses = witness_labels(tail, node, _add(in_label, max_out))
+                for head, out_arc in heads.items():
+                    if head == tail:
+                        continue
+                    label = _add(in_label, arc_labels[out_arc])
+                    # Tanık yol ancak kesin daha iyiyse kısayol gereksizdir
+                    if witnesses.get(head, UNREACHED) > label:
+                        needed.append((tail, head, label, in_arc, out_arc))
+            return needed
+
+        contracted_neighbors = [0] * n
+
+        def priority(node: int) -> int:
+            # Kenar farkı + çıkarılmış komşu sayısı
+            degree = len(outgoing[node]) + len(incoming[node])
+            return len(shortcuts(node)) - degree + contracted_neighbors[node]
+
+        pq = [(priority(node), node) for node in range(n)]
+        heapify(pq)
+        ranks = array('l', [0]) * n
+        contracted = bytearray(n)
+        rank = 0
+
+        # Tembel güncelleme: öncelik değiştiyse durak kuyruğa geri konur
+        while pq:
+            current_priority, node = heappop(pq)
+            if contracted[node]:
+                continue
+            new_priority = priority(node)
+            if pq and new_priority > pq[0][0]:
+                heappush(pq, (new_priority, node))
+                continue
+
+            for tail, head, label, first, second in shortcuts(node):
+                replace_arc(tail, head, label, -1, first, second)
+
+            # Durağı kalan graftan çıkar
+            for head in outgoing[node]:
+                del incoming[head][node]
+                contracted_neighbors[head] += 1
+            for tail in incoming[node]:
+                del outgoing[tail][node]
+                contracted_neighbors[tail] += 1
+            outgoing[node] = {}
+            incoming[node] = {}
+
+            contracted[node] = 1
+            ranks[node] = rank
+            rank += 1
+
+        # Sorgu grafları: yalnızca sırası yükselen yönde ilerleyen yaylar
+        up_lists: List[List[Tuple[int, int]]] = [[] for _ in range(n)]
+        down_lists: List[List[Tuple[int, int]]] = [[] for _ in range(n)]
+        for arc in range(len(arc_labels)):
+            if arc in superseded:
+                continue
+            tail = arc_tails[arc]
+            head = arc_heads[arc]
+            if ranks[head] > ranks[tail]:
+                up_lists[tail].append((head, arc))
+            else:
+                down_lists[head].append((tail, arc))
+
+        up_offsets, up_heads, up_arcs = cls._pack(up_lists)
+        down_offsets, down_tails, down_arcs = cls._pack(down_lists)
+
+        return cls(n, digest, ranks, array('l', arc_tails), array('l', arc_heads),
+                   array('d', [label[0] for label in arc_labels]),
+                   array('d', [label[1] for label in arc_labels]),
+                   array('d', [label[2] for label in arc_labels]),
+                   array('l', arc_edges),
+                   array('l', arc_first), array('l', arc_second),
+                   up_offsets, up_heads, up_arcs, down_offsets, down_tails, down_arcs)
+
+    @staticmethod
+    def _pack(lists: List[List[Tuple[int, int]]]) -> Tuple[array, array, array]:
+        """Komşuluk listelerini CSR dizilerine dönüştür"""
+        offsets = array('l', [0])
+        nodes = array('l')
+        arcs = array('l')
+        for entries in lists:
+            for node, arc in entries:
+                nodes.append(node)
+                arcs.append(arc)
+            offsets.append(len(nodes))
+        return offsets, nodes, arcs
+
+    def save(self, path: str) -> None:
+        """Hiyerarşiyi bellek eşlemeye uygun ikili dosyaya yaz"""
+        write_arrays(path, {name: getattr(self, name) for name in self.ARRAY_FIELDS},
+                     {"kind": "contraction_hierarchy", "stops": self.num_stops, "digest": self.digest,
+                      "version": self.VERSION})
+
+    @classmethod
+    def load(cls, path: str) -> 'ContractionHierarchy':
+        """Kaydedilmiş hiyerarşiyi kopyalamadan bellek eşleyerek yükle"""
+        meta, views, mapped = map_arrays(path)
+        if meta.get("kind") != "contraction_hierarchy":
+            raise ValueError(f"Dosya bir kontraksiyon hiyerarşisi değil: {path}")
+        if meta.get("version", 1) != cls.VERSION:
+            raise ValueError(f"Kontraksiyon hiyerarşisi dosyası eski biçimde: {path}")
+        hierarchy = cls(meta["stops"], meta["digest"], *(views[name] for name in cls.ARRAY_FIELDS))
+        hierarchy.mapping = mapped  # Eşleme, görünümler yaşadıkça açık kalmalı
+        return hierarchy
+
+    @classmethod
+    def open(cls, path: str, network: CompiledNetwork, digest: str) -> 'ContractionHierarchy':
+        """Dosyadaki hiyerarşi güncelse yükle, değilse yeniden oluşturup kaydet"""
+        if not is_current(path, "contraction_hierarchy", digest, network.num_stops, cls.VERSION):
+            cls.build(network, digest).save(path)
+        return cls.load(path)
+
+    def _unpack(self, arc: int, path: List[int]) -> None:
+        """Kısayol yayını özgün yaylara aç"""
+        stack = [arc]
+        while stack:
+            current = stack.pop()
+            if self.arc_edges[current] >= 0:
+                path.append(current)
+            else:
+                # Sıra korunsun diye ikinci alt yay önce yığına konur
+                stack.append(self.arc_second[current])
+                stack.append(self.arc_first[current])
+
+    def path(self, source: int, target: int, stats: Optional[Dict[str, int]] = None) -> List[int]:
+        """Ücreti en düşük yolu hiyerarşi üzerinde çift yönlü arayıp kenar listesini döndür.
+        Eşit ücretli yollar arasında shortest_path ile aynı yol seçilir."""
+        arc_costs = self.arc_costs
+        arc_times = self.arc_times
+        arc_distances = self.arc_distances
+        origin: Label = (0.0, 0.0, 0.0)
+        forward_labels: Dict[int, Label] = {source: origin}
+        backward_labels: Dict[int, Label] = {target: origin}
+        forward_arcs: Dict[int, int] = {}
+        backward_arcs: Dict[int, int] = {}
+        forward_pq = [(0.0, 0.0, 0.0, source)]
+        backward_pq = [(0.0, 0.0, 0.0, target)]
+        best = origin if source == target else UNREACHED
+        meeting = source if source == target else -1
+        settled = 0
+
+        # Her iki arama da yalnızca yukarı doğru ilerler; kuyruk başı en iyi
+        # yolu geçemiyorsa o yön durur
+        while forward_pq or backward_pq:
+            if forward_pq and forward_pq[0][:3] >= best:
+                forward_pq = []
+            if backward_pq and backward_pq[0][:3] >= best:
+                backward_pq = []
+            if not forward_pq and not backward_pq:
+                break
+
+            forward = bool(forward_pq) and (not backward_pq or forward_pq[0] <= backward_pq[0])
+            if forward:
+                entry = heappop(forward_pq)
+                node = entry[3]
+                label = entry[:3]
+                if label > forward_labels[node]:
+                    continue
+                settled += 1
+                if node in backward_labels:
+                    total = _add(label, backward_labels[node])
+                    if total < best:
+                        best = total
+                        meeting = node
+                for position in range(self.up_offsets[node], self.up_offsets[node + 1]):
+                    head = self.up_heads[position]
+                    arc = self.up_arcs[position]
+                    new_label = (label[0] + arc_costs[arc], label[1] + arc_times[arc],
+                                 label[2] + arc_distances[arc])
+                    if new_label < forward_labels.get(head, UNREACHED):
+                        forward_labels[head] = new_label
+                        forward_arcs[head] = arc
+                        heappush(forward_pq, new_label + (head,))
+            else:
+                entry = heappop(backward_pq)
+                node = entry[3]
+                label = entry[:3]
+                if label > backward_labels[node]:
+                    continue
+                settled += 1
+                if node in forward_labels:
+                    total = _add(forward_labels[node], label)
+                    if total < best:
+                        best = total
+                        meeting = node
+                for position in range(self.down_offsets[node], self.down_offsets[node + 1]):
+                    tail = self.down_tails[position]
+                    arc = self.down_arcs[position]
+                    new_label = (label[0] + arc_costs[arc], label[1] + arc_times[arc],
+                                 label[2] + arc_distances[arc])
+                    if new_label < backward_labels.get(tail, UNREACHED):
+                        backward_labels[tail] = new_label
+                        backward_arcs[tail] = arc
+                        heappush(backward_pq, new_label + (tail,))
+
+        if stats is not None:
+            stats["settled"] = settled
+        if meeting == -1:
+            return []
+
+        # Kaynaktan buluşma noktasına, oradan hedefe yayları topla ve aç
+        up_path = []
+        node = meeting
+        while node != source:
+            arc = forward_arcs[node]
+            up_path.append(arc)
+            node = self.arc_tails[arc]
+        up_path.reverse()
+
+        down_path = []
+        node = meeting
+        while node != target:
+            arc = backward_arcs[node]
+            down_path.append(arc)
+            node = self.arc_heads[arc]
+
+        arcs: List[int] = []
+        for arc in up_path + down_path:
+            self._unpack(arc, arcs)
+        return [self.arc_edges[arc] for arc in arcs]
@@ -0,0 +1,49 @@
+from typing import Any, Dict, List, Sequence, Tuple
+
+Point = Tuple[float, float]  # (boylam, enlem) — GeoJSON koordinat sırası
+
+def _cross(origin: Point, a: Point, b: Point) -> float:
+    return (a[0] - origin[0]) * (b[1] - origin[1]) - (a[1] - origin[1]) * (b[0] - origin[0])
+
+def convex_hull(points: Sequence[Point]) -> List[Point]:
+    """Noktaların dışbükey zarfı (Andrew monoton zincir), saat yönünün tersine"""
+    points = sorted(set(points))
+    if len(points) <= 2:
+        return points
+
+    lower: List[Point] = []
+    for point in points:
+        while len(lower) >= 2 and _cross(lower[-2], lower[-1], point) <= 0:
+            lower.pop()
+        lower.append(point)
+    upper: List[Point] = []
+    for point in reversed(points):
+        while len(upper) >= 2 and _cross(upper[-2], upper[-1], point) <= 0:
+            upper.pop()
+        upper.append(point)
+    # Her zincirin son noktası diğerinin ilk noktası
+    return lower[:-1] + upper[:-1]
+
+def hull_geometry(points: Sequence[Point]) -> Dict[str, Any]:
+    """Zarfı GeoJSON geometrisine çevir; üçten az köşede Point/LineString"""
+    hull = convex_hull(points)
+    if len(hull) == 1:
+        return {"type": "Point", "coordinates": list(hull[0])}
+    if len(hull) == 2:
+        return {"type": "LineString", "coordinates": [list(point) for point in hull]}
+    # Çokgen halkası kapalı olmalı (ilk nokta sonda tekrar edilir)
+    return {"type": "Polygon", "coordinates": [[list(point) for point in hull + hull[:1]]]}
+
+def isochrone_collection(origin: Point, reached: Sequence[Tuple[Point, float]],
+                         limits: Sequence[float], metric: str) -> Dict[str, Any]:
+    """Her sınır için o sınır içinde kalan durakların zarfından oluşan FeatureCollection.
+    reached: (durak koordinatı, değer) çiftleri; büyük sınırlar önce (harita katman sırası)."""
+    features = []
+    for limit in sorted(limits, reverse=True):
+        points = [point for point, value in reached if value <= limit]
+        features.append({
+            "type": "Feature",
+            "geometry": hull_geometry([origin] + points),
+            "properties": {"metric": metric, "limit": limit, "stops": len(points)}
+        })
+    return {"type": "FeatureCollection", "features": features}
@@ -0,0 +1,180 @@
+import codecs
+import hashlib
+import json
+import sys
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+from models import StopTable
+from .network import CompiledNetwork, VEHICLE_BUS, VEHICLE_TRAM
+
+WHITESPACE = " \t\n\r"
+
+def _interned(pairs: List[Tuple[str, Any]]) -> Dict[str, Any]:
+    # raw_decode anahtar tekilleştirmesini her çağrıda sıfırlar; anahtarlar
+    # ("stopId", "mesafe", ...) eleman başına kopyalanmasın diye paylaştırılır
+    return {sys.intern(key): value for key, value in pairs}
+
+class StopStream:
+    """Durak dosyasını parça parça okuyup "duraklar" elemanlarını tek tek üreten ayrıştırıcı"""
+
+    def __init__(self, path: str, chunk_size: int = 1 << 16):
+        self.path = path
+        self.chunk_size = chunk_size
+        self.extras: Dict[str, Any] = {}  # "duraklar" dışındaki üst düzey alanlar
+        self.digest = None  # Dosyanın tamamı okununca SHA-1 özeti
+        self._file = None
+        self._decoder = json.JSONDecoder(object_pairs_hook=_interned)
+        self._text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self._hash = hashlib.sha1()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        """Tüketilen kısmı at ve arabelleğe yeni bir parça ekle"""
+        if self._eof:
+            return False
+        chunk = self._file.read(self.chunk_size)
+        self._hash.update(chunk)
+        if not chunk:
+            self._eof = True
+        self._buffer = self._buffer[self._pos:] + self._text_decoder.decode(chunk, final=not chunk)
+        self._pos = 0
+        return True
+
+    def _peek(self) -> str:
+        """Boşlukları atlayıp sıradaki karakteri döndür (dosya sonunda boş metin)"""
+        while True:
+            buffer = self._buffer
+            pos = self._pos
+            while pos < len(buffer) and buffer[pos] in WHITESPACE:
+                pos += 1
+            self._pos = pos
+            if pos < len(buffer):
+                return buffer[pos]
+            if not self._fill():
+                return ""
+
+    def _expect(self, characters: str) -> str:
+        character = self._peek()
+        if not character or character not in characters:
+            raise ValueError(f"Geçersiz durak dosyası ({self.path}): "
+                             f"'{characters}' beklenirken '{character}' bulundu")
+        self._pos += 1
+        return character
+
+    def _value(self) -> Any:
+        """Sıradaki JSON değerini çöz; değer arabellek sonunda bölündüyse arabelleği doldur"""
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # Arabellek sonunda biten bir sayı ya da sabit yarım kalmış olabilir
+            if end == len(self._buffer) and not self._eof:
+                self._fill()
+                continue
+            self._pos = end
+            return value
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        with open(self.path, "rb") as self._file:
+            self._expect("{")
+            if self._peek() == "}":
+                self._pos += 1
+            else:
+                while True:
+                    key = self._value()
+                    self._expect(":")
+                    if key == "duraklar":
+                        yield from self._stops()
+                    else:
+                        self.extras[key] = self._value()
+                    if self._expect(",}") == "}":
+                        break
+
+            if self._peek():
+                raise ValueError(f"Geçersiz durak dosyası ({self.path}): fazladan içerik")
+            self.digest = self._hash.hexdigest()
+
+    def _stops(self) -> Iterator[Dict[str, Any]]:
+        """"duraklar" dizisinin elemanlarını sırayla üret"""
+        self._expect("[")
+        if self._peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield self._value()
+            if self._expect(",]") == "]":
+                return
+
+def compile_stops(records: Iterable[Dict[str, Any]]) -> Tuple[StopTable, CompiledNetwork]:
+    """Ham "duraklar" elemanlarından durak tablosunu ve ağı tek geçişte derle.
+    Ham elemanlar işlendikten sonra tutulmaz; yalnızca sütun düzenindeki tablo kalır."""
+    table = StopTable()
+
+    offsets = array('l', [0])
+    target_ids: List[str] = []  # Hedefler son geçişte indekse çevrilir
+    costs = array('d')
+    times = array('d')
+    distances = array('d')
+    transfers = array('b')
+    vehicles = array('b')
+
+    for stop_data in records:
+        stop_type = stop_data["type"]
+        table.add(stop_data["id"], stop_data["name"], stop_type,
+                  stop_data["lat"], stop_data["lon"], stop_data["sonDurak"])
+
+        # Kenarlar CompiledNetwork.from_stops ile aynı sırada eklenir
+        vehicle = VEHICLE_BUS if stop_type == "bus" else VEHICLE_TRAM
+        for next_stop_data in stop_data["nextStops"]:
+            target_ids.append(next_stop_data["stopId"])
+            costs.append(next_stop_data["ucret"])
+            times.append(next_stop_data["sure"])
+            distances.append(next_stop_data["mesafe"])
+            transfers.append(0)
+            vehicles.append(vehicle)
+
+        transfer = stop_data.get("transfer")
+        if transfer:
+            target_ids.append(transfer["transferStopId"])
+            costs.append(transfer["transferUcret"])
+            times.append(transfer["transferSure"])
+            distances.append(0.0)  # Aktarma mesafesi önemsiz
+            transfers.append(1)
+            vehicles.append(VEHICLE_BUS if stop_type == "tram" else VEHICLE_TRAM)
+
+        offsets.append(len(target_ids))
+
+    # Son geçiş: stopId/transferStopId referanslarını doğrula ve indekse çevir
+    stop_ids = table.stop_ids
+    index = table.index
+    targets = array('l', [0]) * len(target_ids)
+    source = 0
+    for edge, target_id in enumerate(target_ids):
+        while offsets[source + 1] <= edge:
+            source += 1
+        target = index.get(target_id)
+        if target is None:
+            field = "transferStopId" if transfers[edge] else "stopId"
+            raise ValueError(f"Bilinmeyen durak referansı: {stop_ids[source]} -> "
+                             f"{field}={target_id}")
+        targets[edge] = target
+    del target_ids
+
+    # Ağ koordinat dizilerini, kimlik listesini ve indeksi tabloyla paylaşır
+    network = CompiledNetwork(stop_ids, table.lats, table.lons, offsets, targets,
+                              costs, times, distances, transfers, vehicles, index=index)
+    table.edges = network
+    table.positions = None  # Yalnızca ekleme sırasında gerekli
+    return table, network
+
+def load_stops(path: str, chunk_size: int = 1 << 16) -> Tuple[StopTable, CompiledNetwork, str]:
+    """Durakları akış halinde oku, tabloyu ve ağı gelen elemanlarla birlikte derle (tablo, ağ, özet)"""
+    stream = StopStream(path, chunk_size)
+    table, network = compile_stops(stream)
+    return table, network, stream.digest
@@ -0,0 +1,53 @@
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+class ReadWriteLock:
+    """Çok okuyucu / tek yazıcı kilidi; bekleyen yazıcı yeni okuyuculardan önceliklidir.
+    Okuma kilidi aynı iş parçacığında iç içe alınabilir; okuma tutarken yazma istenemez."""
+
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.readers = 0  # Okuma kilidini tutan iş parçacığı sayısı
+        self.writer = False
+        self.waiting_writers = 0
+        self.local = threading.local()  # İş parçacığının iç içe okuma derinliği
+
+    @contextmanager
+    def read(self) -> Iterator[None]:
+        depth = getattr(self.local, "depth", 0)
+        if depth == 0:
+            with self.condition:
+                while self.writer or self.waiting_writers:
+                    self.condition.wait()
+                self.readers += 1
+        self.local.depth = depth + 1
+        try:
+            yield
+        finally:
+            self.local.depth = depth
+            if depth == 0:
+                with self.condition:
+                    self.readers -= 1
+                    if self.readers == 0:
+                        self.condition.notify_all()
+
+    @contextmanager
+    def write(self) -> Iterator[None]:
+        if getattr(self.local, "depth", 0):
+            # Kendi okumasını bekleyen yazıcı kilitlenirdi
+            raise RuntimeError("Okuma kilidi tutulurken yazma kilidi alınamaz")
+        with self.condition:
+            self.waiting_writers += 1
+            try:
+                while self.writer or self.readers:
+                    self.condition.wait()
+            finally:
+                self.waiting_writers -= 1
+            self.writer = True
+        try:
+            yield
+        finally:
+            with self.condition:
+                self.writer = False
+                self.condition.notify_all()
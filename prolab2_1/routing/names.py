@@ -0,0 +1,73 @@
+import re
+from bisect import bisect_left
+from heapq import nsmallest
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Türkçe harflerin aksansız küçük karşılıkları; İ/I/ı/i hepsi "i" olur.
+# str.lower() "İ" harfini "i̇" (noktalı birleşik) yaptığından önce çevrilir.
+TURKISH_FOLD = str.maketrans({
+    "İ": "i", "I": "i", "ı": "i", "Ş": "s", "ş": "s", "Ç": "c", "ç": "c",
+    "Ğ": "g", "ğ": "g", "Ö": "o", "ö": "o", "Ü": "u", "ü": "u",
+    "Â": "a", "â": "a", "Î": "i", "î": "i", "Û": "u", "û": "u"
+})
+TOKEN_PATTERN = re.compile(r"\w+")
+
+def fold_name(text: str) -> str:
+    """Metni aksansız, küçük harfli ve tek boşluklu arama biçimine çevir"""
+    return " ".join(TOKEN_PATTERN.findall(text.translate(TURKISH_FOLD).lower()))
+
+class NameIndex:
+    """Durak adları üzerinde tam eşleşme ve aksansız önek (type-ahead) araması"""
+
+    def __init__(self, names: Sequence[str]):
+        self.names = names
+        self.folded = [fold_name(name) for name in names]
+
+        # Tam ad -> ilk durak indeksi (aynı adlı duraklarda dosyadaki ilk durak)
+        self.exact: Dict[str, int] = {}
+        for index, name in enumerate(names):
+            self.exact.setdefault(name, index)
+
+        # Sıralı (kelime, durak) çiftleri: önek araması iki ikili aramayla yapılır
+        pairs = sorted((token, index) for index, folded in enumerate(self.folded)
+                       for token in folded.split())
+        self.tokens = [token for token, _ in pairs]
+        self.token_stops = [index for _, index in pairs]
+
+    def lookup(self, name: str) -> Optional[int]:
+        """Adı birebir eşleşen ilk durağın indeksi"""
+        return self.exact.get(name)
+
+    def prefix_matches(self, prefix: str) -> set:
+        """Herhangi bir kelimesi verilen önekle başlayan durakların indeksleri"""
+        start = bisect_left(self.tokens, prefix)
+        end = bisect_left(self.tokens, prefix + "\uffff", start)
+        return set(self.token_stops[start:end])
+
+    def search(self, query: str, k: int = 10) -> List[Tuple[int, str]]:
+        """Sorgunun tüm kelimelerini önek olarak içeren en iyi k durak (indeks, ad)"""
+        folded = fold_name(query)
+        words = folded.split()
+        if not words:
+            candidates = range(len(self.names))
+        else:
+            # En seçici kelimeden başlayarak kesişim al
+            candidates = None
+            for word in sorted(set(words), key=len, reverse=True):
+                matches = self.prefix_matches(word)
+                candidates = matches if candidates is None else candidates & matches
+                if not candidates:
+                    return []
+
+        def rank(index: int) -> tuple:
+            # Tam eşleşme, ad başında eşleşme, kelime başında eşleşme sırasıyla
+            name = self.folded[index]
+            if name == folded:
+                kind = 0
+            elif name.startswith(folded):
+                kind = 1
+            else:
+                kind = 2
+            return kind, len(name), name, index
+
+        return [(index, self.names[index]) for index in nsmallest(k, candidates, key=rank)]
@@ -0,0 +1,357 @@
+from array import array
+from heapq import heappush, heappop
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+from models import Stop, haversine
+from .storage import write_arrays, map_arrays
+
+# Kenar araç kodları
+VEHICLE_BUS = 0
+VEHICLE_TRAM = 1
+
+class CompiledNetwork:
+    """Durak ağının tamsayı indeksli, CSR düzeninde derlenmiş hali"""
+
+    # Dosyaya yazılan diziler
+    ARRAY_FIELDS = ("lats", "lons", "offsets", "targets", "sources",
+                    "costs", "times", "distances", "transfers", "vehicles",
+                    "reverse_offsets", "reverse_edges")
+
+    def __init__(self, stop_ids: Optional[List[str]], lats: array, lons: array,
+                 offsets: array, targets: array,
+                 costs: array, times: array, distances: array,
+                 transfers: array, vehicles: array, sources: Optional[array] = None,
+                 reverse_offsets: Optional[array] = None, reverse_edges: Optional[array] = None,
+                 index: Optional[Dict[str, int]] = None):
+        self.stop_ids = stop_ids  # İndeks -> durak kimliği (işçi süreçlerde olmayabilir)
+        # Durak kimliği -> indeks (durak tablosuyla paylaşılabilir)
+        if index is None:
+            index = {stop_id: i for i, stop_id in enumerate(stop_ids or [])}
+        self.index: Dict[str, int] = index
+        self.lats = lats  # Durak enlemleri
+        self.lons = lons  # Durak boylamları
+        self.offsets = offsets  # i. durağın kenarları: offsets[i]..offsets[i+1]
+        self.targets = targets  # Kenarın hedef durak indeksi
+        self.costs = costs  # Kenar ücreti
+        self.times = times  # Kenar süresi
+        self.distances = distances  # Kenar mesafesi
+        self.transfers = transfers  # Aktarma kenarı mı? (0/1)
+        self.vehicles = vehicles  # Kenarın araç kodu
+
+        # Yol geri sarımı için her kenarın kaynak durağı
+        if sources is None:
+            sources = array('l', [0]) * len(targets)
+            for i in range(len(offsets) - 1):
+                for e in range(offsets[i], offsets[i + 1]):
+                    sources[e] = i
+        self.sources = sources
+
+        # Geriye doğru arama için ters komşuluk: i. durağa giren kenarlar
+        # reverse_edges[reverse_offsets[i]..reverse_offsets[i+1]]
+        if reverse_offsets is None or reverse_edges is None:
+            reverse_offsets, reverse_edges = self._build_reverse(len(offsets) - 1, targets)
+        self.reverse_offsets = reverse_offsets
+        self.reverse_edges = reverse_edges
+        self._cost_per_km: Optional[float] = None  # min_cost_per_km önbelleği
+
+    @staticmethod
+    def _build_reverse(num_stops: int, targets: array) -> Tuple[array, array]:
+        """Kenarları hedef durağa göre sayma sıralamasıyla grupla"""
+        reverse_offsets = array('l', [0]) * (num_stops + 1)
+        for target in targets:
+            reverse_offsets[target + 1] += 1
+        for i in range(num_stops):
+            reverse_offsets[i + 1] += reverse_offsets[i]
+
+        positions = array('l', reverse_offsets)
+        reverse_edges = array('l', [0]) * len(targets)
+        for edge, target in enumerate(targets):
+            reverse_edges[positions[target]] = edge
+            positions[target] += 1
+        return reverse_offsets, reverse_edges
+
+    @classmethod
+    def from_stops(cls, stops: Mapping[str, Stop]) -> 'CompiledNetwork':
+        """Durak nesnelerinden derlenmiş ağı oluştur"""
+        stop_ids = list(stops)
+        index = {stop_id: i for i, stop_id in enumerate(stop_ids)}
+
+        lats = array('d')
+        lons = array('d')
+        offsets = array('l', [0])
+        targets = array('l')
+        costs = array('d')
+        times = array('d')
+        distances = array('d')
+        transfers = array('b')
+        vehicles = array('b')
+
+        for stop in stops.values():
+            lats.append(stop.lat)
+            lons.append(stop.lon)
+            
+            # Doğrudan sonraki duraklar
+            vehicle = VEHICLE_BUS if stop.type == "bus" else VEHICLE_TRAM
+            for next_stop_data in stop.next_stops:
+                targets.append(index[next_stop_data["stopId"]])
+                costs.append(next_stop_data["ucret"])
+                times.append(next_stop_data["sure"])
+                distances.append(next_stop_data["mesafe"])
+                transfers.append(0)
+                vehicles.append(vehicle)
+
+            # Aktarma kenarı
+            if stop.transfer:
+                targets.append(index[stop.transfer["transferStopId"]])
+                costs.append(stop.transfer["transferUcret"])
+                times.append(stop.transfer["transferSure"])
+                distances.append(0.0)  # Aktarma mesafesi önemsiz
+                transfers.append(1)
+                vehicles.append(VEHICLE_BUS if stop.type == "tram" else VEHICLE_TRAM)
+
+            offsets.append(len(targets))
+
+        return cls(stop_ids, lats, lons, offsets, targets, costs, times, distances, transfers, vehicles)
+
+    def save(self, path: str) -> None:
+        """Ağı bellek eşlemeye uygun ikili dosyaya yaz"""
+        arrays = {name: getattr(self, name) for name in self.ARRAY_FIELDS}
+        arrays["stop_ids"] = array('B', "\0".join(self.stop_ids or []).encode("utf-8"))
+        write_arrays(path, arrays, {"kind": "network"})
+
+    @classmethod
+    def load(cls, path: str, with_ids: bool = True) -> 'CompiledNetwork':
+        """Kaydedilmiş ağı kopyalamadan bellek eşleyerek yükle"""
+        meta, views, mapped = map_arrays(path)
+        if meta.get("kind") != "network":
+            raise ValueError(f"Dosya bir ağ dosyası değil: {path}")
+
+        stop_ids = None
+        if with_ids:
+            raw_ids = bytes(views["stop_ids"]).decode("utf-8")
+            stop_ids = raw_ids.split("\0") if len(views["offsets"]) > 1 else []
+
+        network = cls(stop_ids, views["lats"], views["lons"], views["offsets"],
+                      views["targets"], views["costs"], views["times"], views["distances"],
+                      views["transfers"], views["vehicles"], sources=views["sources"],
+                      reverse_offsets=views["reverse_offsets"], reverse_edges=views["reverse_edges"])
+        network.mapping = mapped  # Eşleme, görünümler yaşadıkça açık kalmalı
+        return network
+
+    def min_cost_per_km(self) -> float:
+        """Kenarlardaki en düşük ücret/kuş uçuşu mesafe oranı (A* alt sınırı için)"""
+        if self._cost_per_km is None:
+            ratio = float('inf')
+            for edge in range(len(self.targets)):
+                source = self.sources[edge]
+                target = self.targets[edge]
+                span = haversine(self.lats[source], self.lons[source],
+                                 self.lats[target], self.lons[target])
+                # Yer değiştirmeyen kenarlar alt sınırı etkilemez
+                if span > 0:
+                    ratio = min(ratio, self.costs[edge] / span)
+            self._cost_per_km = 0.0 if ratio == float('inf') else max(ratio, 0.0)
+        return self._cost_per_km
+
+    def make_writable(self, *names: str) -> None:
+        """Bellek eşlenmiş (salt okunur) dizileri yerinde değiştirilebilir kopyalara çevir"""
+        for name in names:
+            values = getattr(self, name)
+            if not isinstance(values, array):
+                copy = array(values.format)
+                copy.frombytes(values.cast("B"))
+                setattr(self, name, copy)
+
+    @property
+    def num_stops(self) -> int:
+        return len(self.offsets) - 1
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.targets)
+
+    def edge_path(self, predecessors: List[int], target: int) -> List[int]:
+        """Öncül kenar dizisinden hedefe giden kenar listesini çıkar"""
+        path = []
+        edge = predecessors[target]
+        while edge != -1:
+            path.append(edge)
+            edge = predecessors[self.sources[edge]]
+        path.reverse()
+        return path
+
+def shortest_path(network: CompiledNetwork, source: int, target: int,
+                  stats: Optional[Dict[str, int]] = None) -> List[int]:
+    """Ücreti en düşük yolu Dijkstra ile bul, kenar indekslerini döndür.
+    Eşit ücretli yollardan süresi, o da eşitse mesafesi kısa olan seçilir;
+    diğer arama stratejileri ve rota tablosu aynı sırayı izler."""
+    n = network.num_stops
+    offsets = network.offsets
+    targets = network.targets
+    edge_costs = network.costs
+    edge_times = network.times
+    edge_distances = network.distances
+    inf = float('inf')
+
+    costs = [inf] * n
+    times = [inf] * n
+    distances = [inf] * n
+    predecessors = [-1] * n
+    visited = bytearray(n)
+
+    costs[source] = 0.0
+    times[source] = 0.0
+    distances[source] = 0.0
+    pq = [(0.0, 0.0, 0.0, source)]
+    settled = 0
+
+    while pq:
+        current_cost, current_time, current_distance, current = heappop(pq)
+
+        if current == target:
+            break
+
+        if visited[current]:
+            continue
+
+        visited[current] = 1
+        settled += 1
+
+        for edge in range(offsets[current], offsets[current + 1]):
+            next_index = targets[edge]
+            if visited[next_index]:
+                continue
+
+            # Etiketler (ücret, süre, mesafe) sözlük sırasıyla karşılaştırılır; süre ve
+            # mesafe yalnızca ücretler eşitken hesaba girer. Kapalı (sonsuz ücretli)
+            # kenarlar yol açmaz
+            new_cost = current_cost + edge_costs[edge]
+            old_cost = costs[next_index]
+            if new_cost <= old_cost and new_cost < inf:
+                new_time = current_time + edge_times[edge]
+                new_distance = current_distance + edge_distances[edge]
+                if new_cost == old_cost and (new_time, new_distance) >= (times[next_index], distances[next_index]):
+                    continue
+                costs[next_index] = new_cost
+                times[next_index] = new_time
+                distances[next_index] = new_distance
+                predecessors[next_index] = edge
+                heappush(pq, (new_cost, new_time, new_distance, next_index))
+
+    if stats is not None:
+        stats["settled"] = settled
+    return network.edge_path(predecessors, target)
+
+def shortest_path_tree(network: CompiledNetwork, source: int,
+                       max_cost: float = float('inf')) -> Tuple[List[float], List[float], List[float], List[int]]:
+    """Kaynaktan tüm duraklara ücreti en düşük yol ağacını (ücret, süre, mesafe, öncül kenar) hesapla.
+    max_cost verilirse ücreti bu sınırı aşan duraklarda arama durur; bu durakların değerleri kesin değildir."""
+    n = network.num_stops
+    offsets = network.offsets
+    targets = network.targets
+    edge_costs = network.costs
+    edge_times = network.times
+    edge_distances = network.distances
+    inf = float('inf')
+
+    costs = [inf] * n
+    times = [inf] * n
+    distances = [inf] * n
+    predecessors = [-1] * n
+    visited = bytearray(n)
+
+    costs[source] = 0.0
+    times[source] = 0.0
+    distances[source] = 0.0
+    pq = [(0.0, 0.0, 0.0, source)]
+
+    # shortest_path ile aynı gevşetme kuralı; hedefte durmadan tüm ağaç kurulur
+    while pq:
+        current_cost, current_time, current_distance, current = heappop(pq)
+
+        if current_cost > max_cost:
+            break  # Kalan tüm duraklar sınırın ötesinde
+
+        if visited[current]:
+            continue
+
+        visited[current] = 1
+
+        for edge in range(offsets[current], offsets[current + 1]):
+            next_index = targets[edge]
+            if visited[next_index]:
+                continue
+
+            new_cost = current_cost + edge_costs[edge]
+            old_cost = costs[next_index]
+            if new_cost <= old_cost and new_cost < inf:
+                new_time = current_time + edge_times[edge]
+                new_distance = current_distance + edge_distances[edge]
+                if new_cost == old_cost and (new_time, new_distance) >= (times[next_index], distances[next_index]):
+                    continue
+                costs[next_index] = new_cost
+                times[next_index] = new_time
+                distances[next_index] = new_distance
+                predecessors[next_index] = edge
+                heappush(pq, (new_cost, new_time, new_distance, next_index))
+
+    return costs, times, distances, predecessors
+
+def tree_values(network: CompiledNetwork, source: int,
+                targets: Sequence[int]) -> Tuple[array, array, array, array]:
+    """Tek yol ağacından verilen hedeflere ham ücret, süre, mesafe ve aktarma sayısı.
+    Ulaşılamayan hedeflerde değerler sonsuz, aktarma sayısı -1."""
+    costs, times, distances, predecessors = shortest_path_tree(network, source)
+    sources = network.sources
+    edge_transfers = network.transfers
+
+    # Aktarma sayıları ağaçta köke doğru yürünerek bulunur; yol üzerindeki duraklar saklanır
+    transfers = {source: 0}
+    target_transfers = array('l')
+    for target in targets:
+        if costs[target] == float('inf'):
+            target_transfers.append(-1)
+            continue
+        chain = []
+        node = target
+        while node not in transfers:
+            chain.append(node)
+            node = sources[predecessors[node]]
+        count = transfers[node]
+        for node in reversed(chain):
+            count += edge_transfers[predecessors[node]]
+            transfers[node] = count
+        target_transfers.append(count)
+
+    return (array('d', [costs[target] for target in targets]),
+            array('d', [times[target] for target in targets]),
+            array('d', [distances[target] for target in targets]),
+            target_transfers)
+
+def reverse_path_costs(network: CompiledNetwork, target: int) -> List[float]:
+    """Tüm duraklardan hedefe en düşük ücretler (ters kenarlar üzerinde Dijkstra)"""
+    n = network.num_stops
+    reverse_offsets = network.reverse_offsets
+    reverse_edges = network.reverse_edges
+    sources = network.sources
+    edge_costs = network.costs
+
+    costs = [float('inf')] * n
+    visited = bytearray(n)
+    costs[target] = 0.0
+    pq = [(0.0, target)]
+
+    while pq:
+        current_cost, current = heappop(pq)
+        if visited[current]:
+            continue
+        visited[current] = 1
+
+        for position in range(reverse_offsets[current], reverse_offsets[current + 1]):
+            edge = reverse_edges[position]
+            previous = sources[edge]
+            new_cost = current_cost + edge_costs[edge]
+            if new_cost < costs[previous]:
+                costs[previous] = new_cost
+                heappush(pq, (new_cost, previous))
+
+    return costs
@@ -0,0 +1,115 @@
+import os
+import tempfile
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+from .network import CompiledNetwork, shortest_path, tree_values
+
+# İşçi süreçteki paylaşılan ağ (süreç başına bir kez eşlenir)
+_worker_network: Optional[CompiledNetwork] = None
+
+def _init_worker(path: str) -> None:
+    """İşçi süreç başlangıcında paylaşılan ağ dosyasını eşle"""
+    global _worker_network
+    _worker_network = CompiledNetwork.load(path, with_ids=False)
+
+def _search_chunk(jobs: List[Optional[Tuple[int, int]]]) -> List[List[int]]:
+    """Bir grup (kaynak, hedef) sorgusunu işçi süreçte çöz"""
+    return [shortest_path(_worker_network, job[0], job[1]) if job is not None else []
+            for job in jobs]
+
+def _tree_chunk(sources: List[int], targets: array) -> List[Tuple[array, array, array, array]]:
+    """Bir grup kaynağın yol ağacı değerlerini işçi süreçte hesapla"""
+    return [tree_values(_worker_network, source, targets) for source in sources]
+
+def _shared_directory() -> Optional[str]:
+    # Linux'ta /dev/shm bellekte tutulur; yoksa varsayılan geçici dizin
+    return "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+class ParallelRouter:
+    """Derlenmiş ağı süreçler arasında paylaşarak toplu yol araması yapar"""
+
+    def __init__(self, network: CompiledNetwork, processes: Optional[int] = None,
+                 chunk_size: int = 64):
+        self.network = network
+        self.processes = processes or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.path: Optional[str] = None
+        self.executor: Optional[ProcessPoolExecutor] = None
+
+    def __enter__(self) -> 'ParallelRouter':
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        self.close()
+
+    def start(self) -> None:
+        """Paylaşılan ağ dosyasını yaz ve süreç havuzunu başlat"""
+        # Ağ bir kez yazılır, her işçi aynı dosyayı bellek eşler; böylece
+        # tüm işçiler aynı fiziksel sayfaları paylaşır
+        if self.processes <= 1 or self.executor is not None:
+            return
+        handle, self.path = tempfile.mkstemp(prefix="network-", suffix=".bin",
+                                             dir=_shared_directory())
+        os.close(handle)
+        self.network.save(self.path)
+        self.executor = ProcessPoolExecutor(max_workers=self.processes,
+                                            initializer=_init_worker,
+                                            initargs=(self.path,))
+
+    def close(self) -> None:
+        """Süreç havuzunu kapat ve paylaşılan dosyayı sil"""
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+        if self.path is not None:
+            os.remove(self.path)
+            self.path = None
+
+    def map_paths(self, jobs: Iterable[Optional[Tuple[int, int]]]) -> Iterator[List[int]]:
+        """Sorguların kenar yollarını giriş sırasıyla, akış halinde döndür (None -> boş yol)"""
+        jobs = iter(jobs)
+
+        # Tek süreçte havuz kurmadan doğrudan çöz
+        if self.executor is None:
+            for job in jobs:
+                yield shortest_path(self.network, job[0], job[1]) if job is not None else []
+            return
+
+        # Bellek sınırlı kalsın diye yalnızca belirli sayıda parça havada tutulur
+        in_flight = deque()
+        max_in_flight = self.processes * 2
+        while True:
+            chunk = list(islice(jobs, self.chunk_size))
+            if chunk:
+                in_flight.append(self.executor.submit(_search_chunk, chunk))
+            if in_flight and (not chunk or len(in_flight) >= max_in_flight):
+                yield from in_flight.popleft().result()
+            if not chunk and not in_flight:
+                break
+
+    def map_trees(self, sources: Iterable[int],
+                  targets: Sequence[int]) -> Iterator[Tuple[array, array, array, array]]:
+        """Her kaynak için hedeflere tree_values sonucunu giriş sırasıyla döndür"""
+        sources = iter(sources)
+        targets = array('l', targets)
+
+        if self.executor is None:
+            for source in sources:
+                yield tree_values(self.network, source, targets)
+            return
+
+        # map_paths ile aynı akış; her iş tam bir ağaç araması olduğundan küçük parçalar yeterli
+        in_flight = deque()
+        max_in_flight = self.processes * 2
+        while True:
+            chunk = list(islice(sources, self.chunk_size))
+            if chunk:
+                in_flight.append(self.executor.submit(_tree_chunk, chunk, targets))
+            if in_flight and (not chunk or len(in_flight) >= max_in_flight):
+                yield from in_flight.popleft().result()
+            if not chunk and not in_flight:
+                break
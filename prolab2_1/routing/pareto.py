@@ -0,0 +1,82 @@
+from heapq import heappush, heappop
+from typing import List, NamedTuple, Optional, Sequence
+from .network import CompiledNetwork
+
+INF = float('inf')
+
+class ParetoPath(NamedTuple):
+    edges: List[int]  # Kenar indeksleri
+    cost: float  # Ham toplam ücret
+    time: float  # Ham toplam süre
+    transfers: int  # Aktarma sayısı
+
+def _dominated(labels: Sequence[tuple], bag: List[int], cost: float, time: float, transfers: int) -> bool:
+    """Torbadaki bir etiket (ücret, süre, aktarma) üçlüsünü baskılıyor mu?"""
+    for label_id in bag:
+        label = labels[label_id]
+        if label[0] <= cost and label[1] <= time and label[2] <= transfers:
+            return True
+    return False
+
+def pareto_paths(network: CompiledNetwork, source: int, target: int,
+                 max_labels: int = 16, max_total_labels: Optional[int] = None) -> List[ParetoPath]:
+    """Ücret, süre ve aktarma sayısına göre Pareto-optimal tüm yolları tek aramada bul"""
+    n = network.num_stops
+    offsets = network.offsets
+    targets = network.targets
+    edge_costs = network.costs
+    edge_times = network.times
+    edge_transfers = network.transfers
+
+    # Etiket: (ücret, süre, aktarma, durak, üst etiket, gelinen kenar)
+    labels = [(0.0, 0.0, 0, source, -1, -1)]
+    bags: List[List[int]] = [[] for _ in range(n)]  # Durak başına kalıcı etiketler
+    target_bag = bags[target]
+    pq = [(0.0, 0.0, 0, 0)]
+
+    # Sözlük sırasıyla işlenen etiketler, daha önce kalıcılaşanları baskılayamaz
+    while pq:
+        cost, time, transfers, label_id = heappop(pq)
+        node = labels[label_id][3]
+
+        bag = bags[node]
+        if len(bag) >= max_labels or _dominated(labels, bag, cost, time, transfers):
+            continue
+        if node != target and _dominated(labels, target_bag, cost, time, transfers):
+            continue
+        bag.append(label_id)
+
+        if node == target:
+            continue
+
+        for edge in range(offsets[node], offsets[node + 1]):
+            next_index = targets[edge]
+            new_cost = cost + edge_costs[edge]
+            if new_cost == INF:
+                continue  # Kapatılmış kenar
+            new_time = time + edge_times[edge]
+            new_transfers = transfers + edge_transfers[edge]
+
+            # Hedefte ya da komşuda baskılanan etiketler hiç kuyruğa girmez
+            if _dominated(labels, bags[next_index], new_cost, new_time, new_transfers):
+                continue
+            if _dominated(labels, target_bag, new_cost, new_time, new_transfers):
+                continue
+            if max_total_labels is not None and len(labels) >= max_total_labels:
+                continue
+
+            labels.append((new_cost, new_time, new_transfers, next_index, label_id, edge))
+            heappush(pq, (new_cost, new_time, new_transfers, len(labels) - 1))
+
+    # Hedefteki etiketleri üst etiket zinciriyle geri sar
+    paths = []
+    for label_id in target_bag:
+        cost, time, transfers = labels[label_id][:3]
+        edges = []
+        current = label_id
+        while labels[current][5] != -1:
+            edges.append(labels[current][5])
+            current = labels[current][4]
+        edges.reverse()
+        paths.append(ParetoPath(edges, cost, time, transfers))
+    return paths
@@ -0,0 +1,232 @@
+from enum import Enum
+from heapq import heappush, heappop
+from typing import Dict, List, Optional
+from models import haversine
+from .network import CompiledNetwork, shortest_path
+from .hierarchy import ContractionHierarchy
+
+class SearchStrategy(Enum):
+    DIJKSTRA = "dijkstra"  # Tek yönlü Dijkstra
+    ASTAR = "astar"  # Haversine alt sınırlı A*
+    BIDIRECTIONAL = "bidirectional"  # Çift yönlü Dijkstra
+    CONTRACTION_HIERARCHY = "ch"  # Önceden hazırlanmış kontraksiyon hiyerarşisi
+
+def astar_path(network: CompiledNetwork, source: int, target: int,
+               stats: Optional[Dict[str, int]] = None) -> List[int]:
+    """Ücreti en düşük yolu A* ile bul, kenar indekslerini döndür"""
+    n = network.num_stops
+    offsets = network.offsets
+    targets = network.targets
+    edge_costs = network.costs
+    edge_times = network.times
+    edge_distances = network.distances
+    lats = network.lats
+    lons = network.lons
+
+    # Alt sınır: kalan kuş uçuşu mesafe x en düşük km başı ücret. Üçgen eşitsizliği
+    # nedeniyle tutarlıdır; kayan nokta hatasına karşı oran biraz küçültülür
+    ratio = network.min_cost_per_km() * (1 - 1e-9)
+    target_lat = lats[target]
+    target_lon = lons[target]
+    estimates: Dict[int, float] = {}
+
+    def estimate(index: int) -> float:
+        value = estimates.get(index)
+        if value is None:
+            value = ratio * haversine(lats[index], lons[index], target_lat, target_lon)
+            estimates[index] = value
+        return value
+
+    inf = float('inf')
+    costs = [inf] * n
+    times = [inf] * n
+    distances = [inf] * n
+    predecessors = [-1] * n
+    visited = bytearray(n)
+
+    costs[source] = 0.0
+    times[source] = 0.0
+    distances[source] = 0.0
+    pq = [(estimate(source), 0.0, 0.0, source)]
+    settled = 0
+
+    while pq:
+        current_estimate, current_time, current_distance, current = heappop(pq)
+
+        if current == target:
+            break
+
+        if visited[current]:
+            continue
+
+        visited[current] = 1
+        settled += 1
+        base_cost = costs[current]
+
+        for edge in range(offsets[current], offsets[current + 1]):
+            next_index = targets[edge]
+            if visited[next_index]:
+                continue
+
+            # shortest_path ile aynı kural: eşit ücrette süresi, sonra mesafesi kısa olan yol
+            new_cost = base_cost + edge_costs[edge]
+            old_cost = costs[next_index]
+            if new_cost <= old_cost and new_cost < inf:
+                new_time = current_time + edge_times[edge]
+                new_distance = current_distance + edge_distances[edge]
+                if new_cost == old_cost and (new_time, new_distance) >= (times[next_index], distances[next_index]):
+                    continue
+                costs[next_index] = new_cost
+                times[next_index] = new_time
+                distances[next_index] = new_distance
+                predecessors[next_index] = edge
+                heappush(pq, (new_cost + estimate(next_index), new_time, new_distance, next_index))
+
+    if stats is not None:
+        stats["settled"] = settled
+    return network.edge_path(predecessors, target)
+
+def bidirectional_path(network: CompiledNetwork, source: int, target: int,
+                       stats: Optional[Dict[str, int]] = None) -> List[int]:
+    """Ücreti en düşük yolu çift yönlü Dijkstra ile bul, kenar indekslerini döndür"""
+    if source == target:
+        if stats is not None:
+            stats["settled"] = 0
+        return []
+
+    n = network.num_stops
+    offsets = network.offsets
+    targets = network.targets
+    sources = network.sources
+    reverse_offsets = network.reverse_offsets
+    reverse_edges = network.reverse_edges
+    edge_costs = network.costs
+    edge_times = network.times
+    edge_distances = network.distances
+    inf = float('inf')
+
+    # İleri arama kaynaktan, geri arama hedeften ters kenarlar üzerinde ilerler.
+    # Etiketler (ücret, süre, mesafe) sözlük sırasıyla karşılaştırılır: eşit ücretli
+    # yollar arasında shortest_path ile aynı yol seçilir
+    forward_costs = [inf] * n
+    forward_times = [inf] * n
+    forward_distances = [inf] * n
+    backward_costs = [inf] * n
+    backward_times = [inf] * n
+    backward_distances = [inf] * n
+    forward_edges = [-1] * n  # Durağa giren kenar (ileri ağaç)
+    backward_edges = [-1] * n  # Duraktan çıkan kenar (geri ağaç)
+    forward_visited = bytearray(n)
+    backward_visited = bytearray(n)
+
+    forward_costs[source] = forward_times[source] = forward_distances[source] = 0.0
+    backward_costs[target] = backward_times[target] = backward_distances[target] = 0.0
+    forward_pq = [(0.0, 0.0, 0.0, source)]
+    backward_pq = [(0.0, 0.0, 0.0, target)]
+
+    best = (inf, inf, inf)  # Bulunan en iyi yolun etiketi
+    best_cost = inf
+    meeting_edge = -1  # İki ağacı birleştiren kenar
+    settled = 0
+
+    while forward_pq and backward_pq:
+        # Kuyrukların alt sınırları toplamı en iyi yolu geçemiyorsa dur
+        forward_top = forward_pq[0]
+        backward_top = backward_pq[0]
+        if (forward_top[0] + backward_top[0], forward_top[1] + backward_top[1],
+                forward_top[2] + backward_top[2]) >= best:
+            break
+
+        if forward_top <= backward_top:
+            current_cost, current_time, current_distance, current = heappop(forward_pq)
+            if forward_visited[current]:
+                continue
+            forward_visited[current] = 1
+            settled += 1
+
+            for edge in range(offsets[current], offsets[current + 1]):
+                new_cost = current_cost + edge_costs[edge]
+                if new_cost == inf:
+                    continue  # Kapalı kenar
+                next_index = targets[edge]
+                new_time = current_time + edge_times[edge]
+                new_distance = current_distance + edge_distances[edge]
+                if not forward_visited[next_index]:
+                    old_cost = forward_costs[next_index]
+                    if new_cost < old_cost or (new_cost == old_cost and (new_time, new_distance) <
+                                               (forward_times[next_index], forward_distances[next_index])):
+                        forward_costs[next_index] = new_cost
+                        forward_times[next_index] = new_time
+                        forward_distances[next_index] = new_distance
+                        forward_edges[next_index] = edge
+                        heappush(forward_pq, (new_cost, new_time, new_distance, next_index))
+                total = new_cost + backward_costs[next_index]
+                if total <= best_cost:
+                    candidate = (total, new_time + backward_times[next_index],
+                                 new_distance + backward_distances[next_index])
+                    if candidate < best:
+                        best = candidate
+                        best_cost = total
+                        meeting_edge = edge
+        else:
+            current_cost, current_time, current_distance, current = heappop(backward_pq)
+            if backward_visited[current]:
+                continue
+            backward_visited[current] = 1
+            settled += 1
+
+            for position in range(reverse_offsets[current], reverse_offsets[current + 1]):
+                edge = reverse_edges[position]
+                new_cost = current_cost + edge_costs[edge]
+                if new_cost == inf:
+                    continue
+                previous_index = sources[edge]
+                new_time = current_time + edge_times[edge]
+                new_distance = current_distance + edge_distances[edge]
+                if not backward_visited[previous_index]:
+                    old_cost = backward_costs[previous_index]
+                    if new_cost < old_cost or (new_cost == old_cost and (new_time, new_distance) <
+                                               (backward_times[previous_index], backward_distances[previous_index])):
+                        backward_costs[previous_index] = new_cost
+                        backward_times[previous_index] = new_time
+                        backward_distances[previous_index] = new_distance
+                        backward_edges[previous_index] = edge
+                        heappush(backward_pq, (new_cost, new_time, new_distance, previous_index))
+                total = forward_costs[previous_index] + new_cost
+                if total <= best_cost:
+                    candidate = (total, forward_times[previous_index] + new_time,
+                                 forward_distances[previous_index] + new_distance)
+                    if candidate < best:
+                        best = candidate
+                        best_cost = total
+                        meeting_edge = edge
+
+    if stats is not None:
+        stats["settled"] = settled
+    if meeting_edge == -1:
+        return []
+
+    # Birleşme kenarından geriye ileri ağacı, ileriye geri ağacı izle
+    path = network.edge_path(forward_edges, sources[meeting_edge])
+    path.append(meeting_edge)
+    current = targets[meeting_edge]
+    while current != target:
+        edge = backward_edges[current]
+        path.append(edge)
+        current = targets[edge]
+    return path
+
+def find_path(network: CompiledNetwork, source: int, target: int,
+              strategy: SearchStrategy = SearchStrategy.DIJKSTRA,
+              stats: Optional[Dict[str, int]] = None,
+              hierarchy: Optional[ContractionHierarchy] = None) -> List[int]:
+    """Seçilen arama stratejisiyle ücreti en düşük yolu bul"""
+    if strategy == SearchStrategy.CONTRACTION_HIERARCHY:
+        if hierarchy is None:
+            raise ValueError("Kontraksiyon hiyerarşisi hazırlanmadı")
+        return hierarchy.path(source, target, stats)
+    if strategy == SearchStrategy.ASTAR:
+        return astar_path(network, source, target, stats)
+    if strategy == SearchStrategy.BIDIRECTIONAL:
+        return bidirectional_path(network, source, target, stats)
+    return shortest_path(network, source, target, stats)
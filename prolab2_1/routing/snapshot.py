@@ -0,0 +1,86 @@
+import os
+import struct
+from array import array
+from typing import Mapping
+from models import Stop, StopTable
+from .network import CompiledNetwork
+from .storage import write_arrays, map_arrays, read_meta
+
+# Anlık görüntü şeması değiştiğinde artırılır; eski dosyalar yeniden üretilir
+SNAPSHOT_VERSION = 1
+
+class NetworkSnapshot:
+    """Derlenmiş ağ ve durak tablosunun hızlı açılış için ikili anlık görüntüsü"""
+
+    def __init__(self, network: CompiledNetwork, table: StopTable, digest: str):
+        self.network = network
+        self.table = table  # Kimlik, ad, tür ve son durak bilgileri (metinler tekilleştirilmiş)
+        self.digest = digest  # Kaynak JSON dosyasının özeti
+        self.mapping = None
+
+    @classmethod
+    def build(cls, stops: Mapping[str, Stop], network: CompiledNetwork, digest: str) -> 'NetworkSnapshot':
+        """Durak nesneleri ve derlenmiş ağdan anlık görüntüyü oluştur"""
+        table = stops if isinstance(stops, StopTable) else StopTable.from_stops(stops.values(), network)
+        return cls(network, table, digest)
+
+    def save(self, path: str, source_path: str) -> None:
+        """Anlık görüntüyü kaynak dosyanın boyut ve değişiklik zamanıyla birlikte yaz"""
+        source = os.stat(source_path)
+        arrays = {name: getattr(self.network, name) for name in CompiledNetwork.ARRAY_FIELDS}
+        arrays.update({
+            "strings": array('B', "\0".join(self.table.strings).encode("utf-8")),
+            "id_refs": self.table.id_refs,
+            "name_refs": self.table.name_refs,
+            "type_refs": self.table.type_refs,
+            "terminals": self.table.terminals
+        })
+        write_arrays(path, arrays, {
+            "kind": "snapshot",
+            "version": SNAPSHOT_VERSION,
+            "stops": self.network.num_stops,
+            "strings": len(self.table.strings),
+            "digest": self.digest,
+            "source_size": source.st_size,
+            "source_mtime_ns": source.st_mtime_ns
+        })
+
+    @classmethod
+    def load(cls, path: str) -> 'NetworkSnapshot':
+        """Anlık görüntüyü bellek eşleyerek yükle; diziler kopyalanmaz"""
+        meta, views, mapped = map_arrays(path)
+        if meta.get("kind") != "snapshot" or meta.get("version") != SNAPSHOT_VERSION:
+            raise ValueError(f"Dosya uyumlu bir ağ anlık görüntüsü değil: {path}")
+
+        strings = bytes(views["strings"]).decode("utf-8").split("\0") if meta["strings"] else []
+        table = StopTable(strings, views["id_refs"], views["name_refs"], views["type_refs"],
+                          views["lats"], views["lons"], views["terminals"])
+
+        # Ağ, kimlik listesini ve indeks sözlüğünü tabloyla paylaşır
+        network = CompiledNetwork(table.stop_ids, views["lats"], views["lons"], views["offsets"],
+                                  views["targets"], views["costs"], views["times"],
+                                  views["distances"], views["transfers"], views["vehicles"],
+                                  sources=views["sources"],
+                                  reverse_offsets=views["reverse_offsets"],
+                                  reverse_edges=views["reverse_edges"],
+                                  index=table.index)
+        network.mapping = mapped
+        table.edges = network
+
+        snapshot = cls(network, table, meta["digest"])
+        snapshot.mapping = mapped  # Eşleme, görünümler yaşadıkça açık kalmalı
+        return snapshot
+
+    @staticmethod
+    def is_current(path: str, source_path: str) -> bool:
+        """Anlık görüntü var, şeması güncel ve kaynak dosya sonradan değişmemiş mi?"""
+        if not os.path.exists(path):
+            return False
+        try:
+            meta = read_meta(path)
+            source = os.stat(source_path)
+        except (ValueError, OSError, struct.error):
+            return False
+        return (meta.get("kind") == "snapshot" and meta.get("version") == SNAPSHOT_VERSION and
+                meta.get("source_size") == source.st_size and
+                meta.get("source_mtime_ns") == source.st_mtime_ns)
@@ -0,0 +1,159 @@
+import math
+from bisect import insort
+from heapq import nsmallest
+from typing import Dict, List, Optional, Sequence, Tuple
+from models import Location, haversine
+
+EARTH_RADIUS = 6371  # Dünya'nın yarıçapı (kilometre), haversine ile aynı
+
+class SpatialIndex:
+    """Durak koordinatları üzerinde ızgara (grid) tabanlı mekânsal indeks"""
+
+    def __init__(self, lats: Sequence[float], lons: Sequence[float], cell_size_km: Optional[float] = None):
+        self.lats = lats
+        self.lons = lons
+        self.size = len(lats)
+        self.cells: Dict[Tuple[int, int], List[int]] = {}
+
+        if self.size == 0:
+            return
+
+        min_lat, max_lat = min(lats), max(lats)
+        min_lon, max_lon = min(lons), max(lons)
+        mean_lat = (min_lat + max_lat) / 2
+        km_per_deg = math.radians(1) * EARTH_RADIUS
+
+        # Hücre boyutu: hücre başına ortalama birkaç durak düşecek şekilde
+        if cell_size_km is None:
+            height = (max_lat - min_lat) * km_per_deg
+            width = (max_lon - min_lon) * km_per_deg * math.cos(math.radians(mean_lat))
+            cell_size_km = max(0.1, math.sqrt(max(height * width, 1e-6) / self.size) * 2)
+
+        self.cell_lat = cell_size_km / km_per_deg
+        self.cell_lon = self.cell_lat / max(math.cos(math.radians(mean_lat)), 1e-6)
+
+        for i in range(self.size):
+            key = (math.floor(lats[i] / self.cell_lat), math.floor(lons[i] / self.cell_lon))
+            self.cells.setdefault(key, []).append(i)
+
+        rows = [key[0] for key in self.cells]
+        cols = [key[1] for key in self.cells]
+        self.row_range = (min(rows), max(rows))
+        self.col_range = (min(cols), max(cols))
+
+        # Boylam farkı için alt sınırda kullanılan en küçük cos(enlem)
+        self.min_cos_lat = min(math.cos(math.radians(lat)) for lat in (min_lat, max_lat))
+
+    def remove(self, index: int) -> None:
+        """Durağı sonraki sorgulardan çıkar (ör. kapatılan durak)"""
+        key = (math.floor(self.lats[index] / self.cell_lat), math.floor(self.lons[index] / self.cell_lon))
+        bucket = self.cells.get(key)
+        if bucket and index in bucket:
+            bucket.remove(index)
+
+    def add(self, index: int) -> None:
+        """Çıkarılan durağı sorgulara geri ekle (ör. yeniden açılan durak)"""
+        key = (math.floor(self.lats[index] / self.cell_lat), math.floor(self.lons[index] / self.cell_lon))
+        bucket = self.cells.setdefault(key, [])
+        if index not in bucket:
+            # Hücreler indeks sırasında kurulur; eşit mesafede aynı durak seçilsin
+            insort(bucket, index)
+
+    def _lower_bound(self, location: Location, ring: int) -> float:
+        """ring. halkanın dışında kalan duraklar için mesafe alt sınırı"""
+        # Enlem farkı en az ring * cell_lat derece
+        lat_bound = EARTH_RADIUS * math.radians(ring * self.cell_lat)
+
+        # Boylam farkı en az ring * cell_lon derece
+        dlon = ring * self.cell_lon
+        if dlon >= 180:
+            return 0.0
+        factor = math.cos(math.radians(location.lat)) * self.min_cos_lat
+        a = max(factor, 0.0) * math.sin(math.radians(dlon) / 2) ** 2
+        lon_bound = 2 * EARTH_RADIUS * math.asin(min(1.0, math.sqrt(a)))
+
+        # Kayan nokta hatalarına karşı küçük bir pay bırak
+        return min(lat_bound, lon_bound) * (1 - 1e-9)
+
+    def _ring_cells(self, row: int, col: int, ring: int) -> List[int]:
+        """Verilen halkadaki hücrelerde bulunan durak indeksleri"""
+        row_min, row_max = self.row_range
+        col_min, col_max = self.col_range
+        found = []
+
+        for i in range(max(row - ring, row_min), min(row + ring, row_max) + 1):
+            if i == row - ring or i == row + ring:
+                columns = range(max(col - ring, col_min), min(col + ring, col_max) + 1)
+            else:
+                columns = [j for j in (col - ring, col + ring) if col_min <= j <= col_max]
+            for j in columns:
+                bucket = self.cells.get((i, j))
+                if bucket:
+                    found.extend(bucket)
+
+        return found
+
+    def _covered(self, row: int, col: int, ring: int) -> bool:
+        """Halka tüm ızgarayı kapsıyor mu?"""
+        return (row - ring <= self.row_range[0] and row + ring >= self.row_range[1] and
+                col - ring <= self.col_range[0] and col + ring >= self.col_range[1])
+
+    def _start(self, location: Location) -> Tuple[int, int, int]:
+        """Sorgu hücresi ve boş halkaları atlayan başlangıç halkası"""
+        row = math.floor(location.lat / self.cell_lat)
+        col = math.floor(location.lon / self.cell_lon)
+        ring = max(0, self.row_range[0] - row, row - self.row_range[1],
+                   self.col_range[0] - col, col - self.col_range[1])
+        return row, col, ring
+
+    def k_nearest(self, location: Location, k: int) -> List[Tuple[int, float]]:
+        """En yakın k durağı (indeks, mesafe) olarak, yakından uzağa döndür"""
+        if self.size == 0 or k <= 0:
+            return []
+
+        # Adaylar halka halka genişleyen hücrelerden toplanır; mesafeler
+        # Location.distance_to ile aynı formülle hesaplandığı için sonuç
+        # doğrusal taramayla birebir aynıdır
+        row, col, ring = self._start(location)
+        candidates = []
+        while True:
+            for i in self._ring_cells(row, col, ring):
+                distance = haversine(location.lat, location.lon, self.lats[i], self.lons[i])
+                candidates.append((distance, i))
+
+            if self._covered(row, col, ring):
+                break
+            if len(candidates) >= k:
+                kth = nsmallest(k, candidates)[-1][0]
+                if kth < self._lower_bound(location, ring):
+                    break
+            ring += 1
+
+        return [(i, distance) for distance, i in nsmallest(k, candidates)]
+
+    def nearest(self, location: Location) -> Tuple[int, float]:
+        """En yakın durağın indeksini ve mesafesini döndür"""
+        result = self.k_nearest(location, 1)
+        if not result:
+            return -1, float('inf')
+        return result[0]
+
+    def within_radius(self, location: Location, km: float) -> List[Tuple[int, float]]:
+        """Verilen yarıçap içindeki durakları yakından uzağa döndür"""
+        if self.size == 0:
+            return []
+
+        row, col, ring = self._start(location)
+        found = []
+        while True:
+            for i in self._ring_cells(row, col, ring):
+                distance = haversine(location.lat, location.lon, self.lats[i], self.lons[i])
+                if distance <= km:
+                    found.append((distance, i))
+
+            if self._covered(row, col, ring) or self._lower_bound(location, ring) > km:
+                break
+            ring += 1
+
+        found.sort()
+        return [(i, distance) for distance, i in found]
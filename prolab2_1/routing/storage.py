@@ -0,0 +1,88 @@
+import json
+import mmap
+import os
+import struct
+from array import array
+from typing import Any, Dict, Tuple
+
+# Dosya başlığı: sihirli sayı, biçim sürümü, JSON başlık uzunluğu
+MAGIC = b"TSAR"
+FORMAT_VERSION = 1
+PREAMBLE = struct.Struct("<4sII")
+ALIGNMENT = 8
+
+def _aligned(offset: int) -> int:
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+def write_arrays(path: str, arrays: Dict[str, array], meta: Dict[str, Any]) -> None:
+    """Dizileri bellek eşlemeye uygun tek bir ikili dosyaya yaz"""
+    # Önce başlık boyutunu sabitlemek için ofsetsiz tanımları hazırla
+    # Diziler array ya da (eşlenmiş dosyadan gelen) memoryview olabilir
+    entries = [{"name": name, "typecode": getattr(values, "typecode", None) or values.format,
+                "itemsize": values.itemsize, "length": len(values), "offset": 0}
+               for name, values in arrays.items()]
+
+    # Ofsetler başlık uzunluğuna bağlı; uzunluk sabitlenene kadar tekrarla
+    header = b""
+    while True:
+        offset = _aligned(PREAMBLE.size + len(header))
+        for entry in entries:
+            entry["offset"] = offset
+            offset = _aligned(offset + entry["length"] * entry["itemsize"])
+        new_header = json.dumps({"meta": meta, "arrays": entries}).encode("utf-8")
+        settled = len(new_header) == len(header)
+        header = new_header
+        if settled:
+            break
+
+    # Yarım kalmış dosya okunmasın diye önce geçici dosyaya yaz
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as file:
+        file.write(PREAMBLE.pack(MAGIC, FORMAT_VERSION, len(header)))
+        file.write(header)
+        for entry, values in zip(entries, arrays.values()):
+            file.write(b"\0" * (entry["offset"] - file.tell()))
+            file.write(values)
+        file.write(b"\0" * (_aligned(file.tell()) - file.tell()))
+    os.replace(temp_path, path)
+
+def read_meta(path: str) -> Dict[str, Any]:
+    """Dosyanın yalnızca başlık bilgisini oku"""
+    with open(path, "rb") as file:
+        magic, version, header_length = PREAMBLE.unpack(file.read(PREAMBLE.size))
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"Geçersiz dizi dosyası: {path}")
+        return json.loads(file.read(header_length).decode("utf-8"))["meta"]
+
+def is_current(path: str, kind: str, digest: str, num_stops: int, version: int = 1) -> bool:
+    """Dosya var ve verilen ağ özeti/durak sayısıyla, verilen biçim sürümünde üretilmiş mi?"""
+    if not os.path.exists(path):
+        return False
+    try:
+        meta = read_meta(path)
+    except (ValueError, OSError, struct.error):
+        return False
+    return (meta.get("kind") == kind and meta.get("digest") == digest and
+            meta.get("stops") == num_stops and meta.get("version", 1) == version)
+
+def map_arrays(path: str) -> Tuple[Dict[str, Any], Dict[str, memoryview], mmap.mmap]:
+    """Dosyayı salt okunur bellek eşle, dizileri kopyalamadan döndür"""
+    with open(path, "rb") as file:
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    magic, version, header_length = PREAMBLE.unpack_from(mapped, 0)
+    if magic != MAGIC or version != FORMAT_VERSION:
+        mapped.close()
+        raise ValueError(f"Geçersiz dizi dosyası: {path}")
+
+    header = json.loads(mapped[PREAMBLE.size:PREAMBLE.size + header_length].decode("utf-8"))
+    buffer = memoryview(mapped)
+    views = {}
+    for entry in header["arrays"]:
+        if array(entry["typecode"]).itemsize != entry["itemsize"]:
+            raise ValueError(f"Dizi eleman boyutu bu platformla uyumsuz: {entry['name']}")
+        start = entry["offset"]
+        end = start + entry["length"] * entry["itemsize"]
+        views[entry["name"]] = buffer[start:end].cast(entry["typecode"])
+
+    return header["meta"], views, mapped
@@ -0,0 +1,119 @@
+from array import array
+from typing import List, Tuple
+from .network import CompiledNetwork, shortest_path_tree
+from .storage import write_arrays, map_arrays, is_current
+
+class RouteTable:
+    """Tüm durak çiftleri için önceden hesaplanmış ücret/süre/mesafe ve öncül tablosu"""
+
+    def __init__(self, num_stops: int, costs, times, distances, predecessors,
+                 sources, digest: str):
+        self.num_stops = num_stops
+        self.costs = costs  # n x n, satır = kaynak durak
+        self.times = times
+        self.distances = distances
+        self.predecessors = predecessors  # Hedefe giren son kenar, yoksa -1
+        self.sources = sources  # Kenarın kaynak durağı (yol geri sarımı için)
+        self.digest = digest  # Tablonun üretildiği ağ dosyasının özeti
+        self.mapping = None
+
+    @classmethod
+    def build(cls, network: CompiledNetwork, digest: str) -> 'RouteTable':
+        """Her duraktan bir yol ağacı kurarak tabloyu oluştur"""
+        n = network.num_stops
+        costs = array('d')
+        times = array('d')
+        distances = array('d')
+        predecessors = array('l')
+
+        for source in range(n):
+            tree_costs, tree_times, tree_distances, tree_predecessors = shortest_path_tree(network, source)
+            costs.extend(tree_costs)
+            times.extend(tree_times)
+            distances.extend(tree_distances)
+            predecessors.extend(tree_predecessors)
+
+        return cls(n, costs, times, distances, predecessors, network.sources, digest)
+
+    def save(self, path: str) -> None:
+        """Tabloyu bellek eşlemeye uygun ikili dosyaya yaz"""
+        write_arrays(path, {
+            "costs": self.costs,
+            "times": self.times,
+            "distances": self.distances,
+            "predecessors": self.predecessors,
+            "sources": self.sources
+        }, {"kind": "route_table", "stops": self.num_stops, "digest": self.digest})
+
+    @classmethod
+    def load(cls, path: str) -> 'RouteTable':
+        """Kaydedilmiş tabloyu kopyalamadan bellek eşleyerek yükle"""
+        meta, views, mapped = map_arrays(path)
+        if meta.get("kind") != "route_table":
+            raise ValueError(f"Dosya bir rota tablosu değil: {path}")
+        table = cls(meta["stops"], views["costs"], views["times"], views["distances"],
+                    views["predecessors"], views["sources"], meta["digest"])
+        table.mapping = mapped  # Eşleme, görünümler yaşadıkça açık kalmalı
+        return table
+
+    @classmethod
+    def open(cls, path: str, network: CompiledNetwork, digest: str) -> 'RouteTable':
+        """Dosyadaki tablo güncelse yükle, değilse yeniden oluşturup kaydet"""
+        if not is_current(path, "route_table", digest, network.num_stops):
+            cls.build(network, digest).save(path)
+        return cls.load(path)
+
+    def affected_rows(self, network: CompiledNetwork, changes) -> List[int]:
+        """Kenar değişikliklerinden etkilenebilecek satırlar (kaynak duraklar).
+        changes: (kenar, yeni ücret) çiftleri; ağ dizileri zaten güncellenmiş olmalı."""
+        n = self.num_stops
+        inf = float('inf')
+        rows = []
+        for source in range(n):
+            row = source * n
+            for edge, new_cost in changes:
+                tail = network.sources[edge]
+                head = network.targets[edge]
+                # Ağaçta kullanılan kenar değiştiyse ya da kenar yeni (eşit) bir kısayol açıyorsa
+                if self.predecessors[row + head] == edge or (
+                        self.costs[row + tail] < inf and new_cost < inf and
+                        self.costs[row + tail] + new_cost <= self.costs[row + head]):
+                    rows.append(source)
+                    break
+        return rows
+
+    def repair(self, network: CompiledNetwork, rows: List[int]) -> None:
+        """Verilen satırların yol ağaçlarını güncel ağla yeniden hesapla"""
+        if self.mapping is not None:
+            # Eşlenmiş dosya salt okunur; tablo belleğe kopyalanır (dosya kaynak ağa ait kalır)
+            for name in ("costs", "times", "distances", "predecessors"):
+                values = getattr(self, name)
+                copy = array(values.format)
+                copy.frombytes(values.cast("B"))
+                setattr(self, name, copy)
+            self.mapping = None
+
+        n = self.num_stops
+        for source in rows:
+            tree_costs, tree_times, tree_distances, tree_predecessors = shortest_path_tree(network, source)
+            row = source * n
+            self.costs[row:row + n] = array('d', tree_costs)
+            self.times[row:row + n] = array('d', tree_times)
+            self.distances[row:row + n] = array('d', tree_distances)
+            self.predecessors[row:row + n] = array('l', tree_predecessors)
+
+    def lookup(self, source: int, target: int) -> Tuple[float, float, float]:
+        """İki durak arasındaki ham ücret, süre ve mesafeyi döndür"""
+        cell = source * self.num_stops + target
+        return self.costs[cell], self.times[cell], self.distances[cell]
+
+    def path(self, source: int, target: int) -> List[int]:
+        """Öncül tablosunu geri sararak kenar listesini çıkar"""
+        row = source * self.num_stops
+        path = []
+        edge = self.predecessors[row + target]
+        while edge != -1:
+            path.append(edge)
+            edge = self.predecessors[row + self.sources[edge]]
+        path.reverse()
+        return path
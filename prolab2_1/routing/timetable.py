@@ -0,0 +1,265 @@
+import json
+import math
+from array import array
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+from .network import CompiledNetwork
+
+# Sefer dosyası şeması (süreler dakika, saatler "SS:DD"):
+# {"hatlar": [
+#     {"id": "B1", "duraklar": ["bus_otogar", "bus_sekapark", ...],
+#      "kalkislar": ["06:00", "06:20", ...]},                          # açık kalkış saatleri
+#     {"id": "T1", "duraklar": [...],
+#      "ilkSefer": "06:00", "sonSefer": "23:00", "sikilik": 10}       # veya sefer aralığı
+# ]}
+# Kalkışlar hattın ilk durağındandır; sonraki durak varışları ağdaki kenarın
+# "sure" değeriyle hesaplanır. Ardışık duraklar ağda aktarma dışı bir kenarla bağlı olmalı.
+# Canlı güncellemeler: kenar süresi değişince (gecikme) retime ile o kenarı kullanan
+# seferlerin sonraki tüm varışları kayar; kapatılan (süresi sonsuz) kenarlarda sefer
+# planlanan süreyle devam eder ama o bağlantı kullanılmaz.
+
+def parse_clock(value: Union[str, float, int]) -> float:
+    """"SS:DD" saatini ya da dakika değerini gece yarısından itibaren dakikaya çevir"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        hours, minutes = value.split(":")
+        return int(hours) * 60 + float(minutes)
+    except (AttributeError, ValueError):
+        raise ValueError(f"Geçersiz saat: {value!r} (SS:DD bekleniyor)")
+
+def format_clock(minutes: float) -> str:
+    """Dakika değerini "SS:DD" biçimine çevir (gece yarısını aşan saatler 24+)"""
+    total = int(round(minutes))
+    return f"{total // 60:02d}:{total % 60:02d}"
+
+class Timetable:
+    """Kalkış saatine sıralı bağlantı dizisi üzerinde Connection Scan Algorithm ile en erken varış"""
+
+    def __init__(self, network: CompiledNetwork, departures: array, arrivals: array,
+                 edges: array, trips: array, trip_offsets: array, trip_order: array,
+                 trip_legs: array, lines: Sequence[str]):
+        self.network = network
+        # Bağlantılar (kalkış saatine göre sıralı, sütun düzeninde)
+        self.departures = departures  # Kalkış saati (dakika)
+        self.arrivals = arrivals  # Varış saati (dakika)
+        self.edges = edges  # Ağdaki kenar indeksi (kalkış/varış durağı ve ücret buradan)
+        self.trips = trips  # Sefer numarası
+        self.trip_legs = trip_legs  # Bağlantının sefer içindeki sırası
+        # Sefer -> sıralı dizideki bağlantılar (trip_order[trip_offsets[t] + sıra])
+        self.trip_offsets = trip_offsets
+        self.trip_order = trip_order
+        self.lines = lines  # Sefer -> hat kimliği
+
+    @property
+    def num_connections(self) -> int:
+        return len(self.departures)
+
+    @property
+    def num_trips(self) -> int:
+        return len(self.trip_offsets) - 1
+
+    @staticmethod
+    def line_edge(network: CompiledNetwork, line_id: str, source_id: str, target_id: str) -> int:
+        """Hat üzerindeki iki ardışık durak arasındaki aktarma dışı kenar"""
+        source = network.index.get(source_id)
+        target = network.index.get(target_id)
+        if source is None or target is None:
+            raise ValueError(f"Hat {line_id}: bilinmeyen durak "
+                             f"{source_id if source is None else target_id}")
+        for edge in range(network.offsets[source], network.offsets[source + 1]):
+            if network.targets[edge] == target and not network.transfers[edge]:
+                return edge
+        raise ValueError(f"Hat {line_id}: {source_id} -> {target_id} bağlantısı ağda yok")
+
+    @staticmethod
+    def line_departures(line: Dict[str, Any]) -> List[float]:
+        """Hattın ilk duraktan kalkış saatleri (açık liste veya sefer aralığından)"""
+        if "kalkislar" in line:
+            return sorted(parse_clock(value) for value in line["kalkislar"])
+        first = parse_clock(line["ilkSefer"])
+        last = parse_clock(line["sonSefer"])
+        headway = float(line["sikilik"])
+        if headway <= 0:
+            raise ValueError(f"Hat {line['id']}: sefer aralığı pozitif olmalı")
+        if last < first:
+            raise ValueError(f"Hat {line['id']}: son sefer ilk seferden önce olamaz "
+                             f"(gece yarısından sonrası için 24:30 gibi yazın)")
+        return [first + i * headway for i in range(int((last - first) // headway) + 1)]
+
+    @classmethod
+    def from_lines(cls, network: CompiledNetwork, lines: Sequence[Dict[str, Any]]) -> 'Timetable':
+        """Hat tanımlarından seferleri üret ve bağlantı dizisini derle"""
+        connections = []  # (kalkış, varış, kenar, sefer, sıra)
+        trip_lines = []
+        for line in lines:
+            stop_ids = line["duraklar"]
+            if len(stop_ids) < 2:
+                raise ValueError(f"Hat {line['id']}: en az iki durak gerekli")
+            line_edges = [cls.line_edge(network, line["id"], a, b)
+                          for a, b in zip(stop_ids, stop_ids[1:])]
+            for departure in cls.line_departures(line):
+                trip = len(trip_lines)
+                trip_lines.append(line["id"])
+                time = departure
+                for leg, edge in enumerate(line_edges):
+                    arrival = time + network.times[edge]
+                    connections.append((time, arrival, edge, trip, leg))
+                    time = arrival
+
+        return cls(network, *cls._compile(connections, len(trip_lines)), trip_lines)
+
+    @staticmethod
+    def _compile(connections: List[Tuple[float, float, int, int, int]],
+                 num_trips: int) -> Tuple[array, array, array, array, array, array, array]:
+        """(kalkış, varış, kenar, sefer, sıra) listesini sıralı sütun dizilerine çevir"""
+        # Tarama sırası: kalkış saati; eşitlikte varış ve sefer içi sıra korunur
+        connections.sort(key=lambda connection: (connection[0], connection[1], connection[3], connection[4]))
+
+        trip_sizes = [0] * num_trips
+        for connection in connections:
+            trip_sizes[connection[3]] += 1
+        trip_offsets = array('l', [0])
+        for size in trip_sizes:
+            trip_offsets.append(trip_offsets[-1] + size)
+        trip_order = array('l', [0]) * len(connections)
+        for position, (_, _, _, trip, leg) in enumerate(connections):
+            trip_order[trip_offsets[trip] + leg] = position
+
+        return (array('d', [connection[0] for connection in connections]),
+                array('d', [connection[1] for connection in connections]),
+                array('l', [connection[2] for connection in connections]),
+                array('l', [connection[3] for connection in connections]),
+                trip_offsets, trip_order,
+                array('l', [connection[4] for connection in connections]))
+
+    def retime(self, edges: Iterable[int]) -> int:
+        """Süresi değişen kenarları kullanan seferlerin saatlerini ağdaki güncel sürelerle
+        yeniden hesapla (ilk kalkış sabit kalır). Etkilenen sefer sayısını döndür."""
+        changed = set(edges)
+        affected = {self.trips[connection] for connection in range(self.num_connections)
+                    if self.edges[connection] in changed}
+        if not affected:
+            return 0
+
+        times = self.network.times
+        connections = []
+        for trip in range(self.num_trips):
+            positions = self.trip_order[self.trip_offsets[trip]:self.trip_offsets[trip + 1]]
+            time = self.departures[positions[0]] if positions else 0.0
+            for leg, position in enumerate(positions):
+                edge = self.edges[position]
+                if trip in affected:
+                    # Kapatılmış kenarda planlanan süre korunur (bağlantı zaten atlanır)
+                    duration = times[edge]
+                    if math.isinf(duration):
+                        duration = self.arrivals[position] - self.departures[position]
+                    departure, arrival = time, time + duration
+                    time = arrival
+                else:
+                    departure, arrival = self.departures[position], self.arrivals[position]
+                connections.append((departure, arrival, edge, trip, leg))
+
+        (self.departures, self.arrivals, self.edges, self.trips, self.trip_offsets,
+         self.trip_order, self.trip_legs) = self._compile(connections, self.num_trips)
+        return len(affected)
+
+    @classmethod
+    def load(cls, path: str, network: CompiledNetwork) -> 'Timetable':
+        """Sefer dosyasını oku"""
+        with open(path, "r", encoding="utf-8") as file:
+            data = json.load(file)
+        return cls.from_lines(network, data["hatlar"])
+
+    def earliest_arrival(self, source: int, target: int,
+                         departure: float) -> Optional[List[Tuple[int, float, float]]]:
+        """source durağından departure saatinde çıkarak target'a en erken varış.
+        Adımlar (kenar, kalkış, varış) listesi; aktarma kenarları yürüme adımıdır.
+        Varılamıyorsa None."""
+        if source == target:
+            return []
+
+        network = self.network
+        offsets = network.offsets
+        targets = network.targets
+        transfers = network.transfers
+        times = network.times
+        departures = self.departures
+        arrivals = self.arrivals
+        edges = self.edges
+        trips = self.trips
+        sources = network.sources
+
+        earliest = array('d', [math.inf]) * network.num_stops
+        via_connection = array('l', [-1]) * network.num_stops  # Duraktan inilen bağlantı
+        via_board = array('l', [-1]) * network.num_stops  # O seferde binilen bağlantı
+        via_walk = array('l', [-1]) * network.num_stops  # Yürünen aktarma kenarı
+        boarded = array('l', [-1]) * self.num_trips  # Sefere binilen ilk bağlantı
+
+        def walk_from(stop: int) -> None:
+            # Aktarma süreleri asgari değiştirme süresi olarak uygulanır; ağdaki gibi
+            # art arda aktarmalara da izin verilir
+            pending = [stop]
+            while pending:
+                current = pending.pop()
+                for edge in range(offsets[current], offsets[current + 1]):
+                    if transfers[edge]:
+                        other = targets[edge]
+                        arrival = earliest[current] + times[edge]
+                        if arrival < earliest[other]:
+                            earliest[other] = arrival
+                            via_walk[other] = edge
+                            via_connection[other] = -1
+                            pending.append(other)
+
+        earliest[source] = departure
+        walk_from(source)
+
+        # Tek doğrusal tarama: kalkış saatinden sonraki bağlantılar sırayla
+        for connection in range(bisect_left(departures, departure), len(departures)):
+            time = departures[connection]
+            if time >= earliest[target]:
+                break
+            trip = trips[connection]
+            edge = edges[connection]
+            if times[edge] == math.inf:
+                # Kapatılmış kenar: bu bağlantı kullanılamaz, sefer sonraki duraklarda
+                # yeniden binilmedikçe bu noktadan öteye taşımaz
+                boarded[trip] = -1
+                continue
+            if boarded[trip] < 0:
+                if earliest[sources[edge]] > time:
+                    continue
+                boarded[trip] = connection
+            arrival = arrivals[connection]
+            stop = targets[edge]
+            if arrival < earliest[stop]:
+                earliest[stop] = arrival
+                via_connection[stop] = connection
+                via_board[stop] = boarded[trip]
+                via_walk[stop] = -1
+                walk_from(stop)
+
+        if math.isinf(earliest[target]):
+            return None
+
+        # Geriye doğru yolculuğu kur
+        steps = []
+        stop = target
+        while stop != source:
+            if via_walk[stop] >= 0:
+                edge = via_walk[stop]
+                previous = sources[edge]
+                steps.append((edge, earliest[previous], earliest[previous] + times[edge]))
+                stop = previous
+                continue
+            last = via_connection[stop]
+            first = via_board[stop]
+            trip = trips[last]
+            base = self.trip_offsets[trip]
+            for leg in range(self.trip_legs[last], self.trip_legs[first] - 1, -1):
+                connection = self.trip_order[base + leg]
+                steps.append((edges[connection], departures[connection], arrivals[connection]))
+            stop = sources[edges[first]]
+        steps.reverse()
+        return steps
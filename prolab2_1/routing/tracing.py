@@ -0,0 +1,70 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from typing import Any, Dict, Iterator, List
+
+class Tracer:
+    """Rota hesaplama aşamaları için zamanlanmış aralık (span) kaydedici"""
+
+    def __init__(self, max_spans: int = 100000):
+        # Kayıt: (ad, başlangıç ns, süre ns, iş parçacığı, ek bilgiler)
+        self.spans: deque = deque(maxlen=max_spans)
+
+    @contextmanager
+    def span(self, name: str, **args: Any) -> Iterator[None]:
+        """Blok süresini verilen adla kaydet"""
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.spans.append((name, start, time.perf_counter_ns() - start,
+                               threading.get_ident(), args))
+
+    def clear(self) -> None:
+        """Kayıtlı aralıkları sil"""
+        self.spans.clear()
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Aşama başına çağrı sayısı, toplam ve ortalama süre (ms)"""
+        totals: Dict[str, List[float]] = {}
+        for name, start, duration, thread, args in list(self.spans):
+            entry = totals.setdefault(name, [0, 0.0])
+            entry[0] += 1
+            entry[1] += duration / 1e6
+        return {name: {"count": count, "total_ms": total, "mean_ms": total / count}
+                for name, (count, total) in totals.items()}
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """Kayıtları Chrome trace (chrome://tracing, Perfetto) biçimine dönüştür"""
+        pid = os.getpid()
+        events = []
+        for name, start, duration, thread, args in list(self.spans):
+            events.append({
+                "name": name,
+                "cat": "route",
+                "ph": "X",  # Tamamlanmış olay
+                "ts": start / 1000,  # Mikro saniye
+                "dur": duration / 1000,
+                "pid": pid,
+                "tid": thread,
+                "args": {key: str(value) for key, value in args.items()}
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export_chrome_trace(self, path: str) -> None:
+        """Kayıtları Chrome trace JSON dosyasına yaz"""
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.to_chrome_trace(), file)
+
+class NullTracer:
+    """İzleme kapalıyken kullanılan, hiçbir şey kaydetmeyen izleyici"""
+
+    _span = nullcontext()
+
+    def span(self, name: str, **args: Any):
+        return self._span
+
+NULL_TRACER = NullTracer()
@@ -0,0 +1,421 @@
+import argparse
+import asyncio
+import json
+import logging
+import signal
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from typing import Any, Dict, Hashable, Optional, Tuple
+from urllib.parse import urlsplit, parse_qs
+from models import (
+    Location, Passenger, GeneralPassenger, StudentPassenger, TeacherPassenger, ElderlyPassenger,
+    CompactRoute
+)
+from transportation_system import TransportationSystem
+
+logger = logging.getLogger(__name__)
+
+PASSENGERS = {
+    "general": GeneralPassenger,
+    "student": StudentPassenger,
+    "teacher": TeacherPassenger,
+    "elderly": ElderlyPassenger,
+}
+
+# Canlı ağ güncellemeleri: işlem -> (TransportationSystem metodu, gövde alanları)
+UPDATE_ACTIONS = {
+    "update_edge": ("update_edge", ("from", "to", "sure", "ucret")),
+    "update_transfer": ("update_transfer", ("stop", "sure", "ucret")),
+    "disable_edge": ("disable_edge", ("from", "to")),
+    "disable_transfer": ("disable_transfer", ("stop",)),
+    "close_stop": ("close_stop", ("stop",)),
+    "enable_edge": ("enable_edge", ("from", "to")),
+    "enable_transfer": ("enable_transfer", ("stop",)),
+    "reopen_stop": ("reopen_stop", ("stop",)),
+}
+
+class HTTPError(Exception):
+    """İstemciye JSON hata gövdesiyle döndürülecek HTTP hatası"""
+
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+def parse_location(data: Any, field: str) -> Location:
+    """{"lat": .., "lon": ..} nesnesinden konum oluştur"""
+    try:
+        return Location(float(data["lat"]), float(data["lon"]))
+    except (TypeError, KeyError, ValueError):
+        raise HTTPError(HTTPStatus.BAD_REQUEST, f"Geçersiz konum: {field}")
+
+def parse_passenger(name: Any) -> Passenger:
+    passenger_class = PASSENGERS.get(name or "general")
+    if passenger_class is None:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, f"Bilinmeyen yolcu tipi: {name}")
+    return passenger_class()
+
+def stop_to_json(stop) -> Dict[str, Any]:
+    return {"id": stop.id, "name": stop.name, "type": stop.type, "lat": stop.lat, "lon": stop.lon}
+
+def route_to_json(result: CompactRoute, segments: bool = True) -> Dict[str, Any]:
+    """Kompakt rota sonucunu JSON'a dönüştür; parçalar yalnızca istenirse üretilir"""
+    data = {
+        "start_stop": stop_to_json(result.start_stop),
+        "end_stop": stop_to_json(result.end_stop),
+        "total_cost": result.total_cost,
+        "total_time": result.total_time,
+        "total_distance": result.total_distance,
+        "transfer_count": result.transfer_count,
+        "requires_initial_taxi": result.requires_initial_taxi,
+        "requires_final_taxi": result.requires_final_taxi,
+    }
+    if segments:
+        data["segments"] = [{
+            "from": segment.from_stop.id,
+            "to": segment.to_stop.id,
+            "vehicle": segment.vehicle.__class__.__name__,
+            "distance": segment.distance,
+            "cost": segment.cost,
+            "time": segment.time,
+            "is_transfer": segment.is_transfer,
+        } for segment in result.segments]
+    return data
+
+class RoutingService:
+    """TransportationSystem için asyncio tabanlı JSON HTTP servisi (yalnızca standart kütüphane)"""
+
+    MAX_BODY = 1 << 20  # İstek gövdesi üst sınırı (bayt)
+    MAX_HEADERS = 100
+    IDLE_TIMEOUT = 30.0  # Kalıcı bağlantılarda boşta bekleme süresi (saniye)
+
+    def __init__(self, system: TransportationSystem, host: str = "127.0.0.1", port: int = 8080,
+                 workers: int = 4, max_pending: int = 256, max_batch: int = 1000):
+        self.system = system
+        self.host = host
+        self.port = port
+        self.max_pending = max_pending  # Kuyruktaki en fazla arama; aşılırsa 503
+        self.max_batch = max_batch
+        # Aramalar olay döngüsünü bloklamasın diye sınırlı iş parçacığı havuzunda çalışır
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="route")
+        self.server: Optional[asyncio.AbstractServer] = None
+        self.pending = 0  # Havuzda bekleyen ya da çalışan arama sayısı
+        self.in_flight: Dict[Hashable, asyncio.Future] = {}  # Birleştirilen aynı aramalar
+        self.connections: set = set()
+        self.update_lock = asyncio.Lock()  # Ağ güncellemeleri sırayla uygulanır
+        self.active_requests = 0
+        self.idle = asyncio.Event()
+        self.idle.set()
+
+        # İstatistikler
+        self.requests = 0
+        self.coalesced = 0
+        self.rejected = 0
+
+    async def start(self) -> None:
+        self.server = await asyncio.start_server(self.handle_connection, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        logger.info("Rota servisi dinleniyor: %s:%d", self.host, self.port)
+
+    async def serve_forever(self) -> None:
+        """Sunucuyu başlat, SIGINT/SIGTERM gelince düzgünce kapat"""
+        await self.start()
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, stop.set)
+            except (NotImplementedError, RuntimeError):
+                pass  # Sinyal işleyicisi desteklenmeyen platformlar
+        await stop.wait()
+        await self.shutdown()
+
+    async def shutdown(self, timeout: float = 10.0) -> None:
+        """Yeni bağlantıları reddet, süren istekleri bitir, havuzu kapat"""
+        logger.info("Rota servisi kapatılıyor")
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        try:
+            await asyncio.wait_for(self.idle.wait(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Süren istekler %s sn içinde bitmedi", timeout)
+        # Boşta bekleyen kalıcı bağlantıları kapat
+        for writer in list(self.connections):
+            writer.close()
+        self.executor.shutdown(wait=True)
+
+    async def run_search(self, key: Hashable, function, *args):
+        """Aramayı havuzda çalıştır; aynı anahtarlı eşzamanlı istekler tek aramayı paylaşır"""
+        future = self.in_flight.get(key)
+        if future is not None:
+            self.coalesced += 1
+            return await asyncio.shield(future)
+
+        # Kuyruk doluysa bekletmek yerine hemen geri çevir (geri basınç)
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise HTTPError(HTTPStatus.SERVICE_UNAVAILABLE, "Sunucu yoğun, daha sonra tekrar deneyin")
+
+        loop = asyncio.get_running_loop()
+        self.pending += 1
+        future = loop.run_in_executor(self.executor, function, *args)
+        self.in_flight[key] = future
+        try:
+            return await asyncio.shield(future)
+        finally:
+            if future.done():
+                self.in_flight.pop(key, None)
+                self.pending -= 1
+            else:
+                # İstemci koptu; arama bitince kayıt temizlenir
+                future.add_done_callback(lambda _: self._release(key, future))
+
+    def _release(self, key: Hashable, future: asyncio.Future) -> None:
+        if self.in_flight.get(key) is future:
+            del self.in_flight[key]
+        self.pending -= 1
+
+    def route_json(self, start: Location, end: Location, passenger: Passenger,
+                   segments: bool) -> Dict[str, Any]:
+        """Havuzda çalışır: en yakın duraklar, yol ve fiyat tek okuma kilidi altında hesaplanır"""
+        system = self.system
+        # Arada bir güncelleme uygulanamaz; duraklar, önbellek anahtarı ve toplamlar aynı
+        # ağ sürümüne aittir. Önbelleğe yalnızca stop_path bakar (ıska bir kez sayılır)
+        with system.network_lock.read():
+            start_stop, start_distance = system.find_nearest_stop(start)
+            end_stop, end_distance = system.find_nearest_stop(end)
+            path = system.stop_path(start_stop, end_stop)
+            # Ödeme alınmaz
+            result = system.build_compact_result(start, end, passenger, start_stop, start_distance,
+                                                 end_stop, end_distance, path)
+            return route_to_json(result, segments=segments)
+
+    async def route(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        start = parse_location(body.get("start"), "start")
+        end = parse_location(body.get("end"), "end")
+        passenger = parse_passenger(body.get("passenger"))
+        segments = bool(body.get("segments", True))
+        # Aynı içerikli eşzamanlı istekler tek aramayı paylaşır (/batch ile aynı anahtar yapısı)
+        key = ("route", type(passenger).__name__, segments, start.lat, start.lon, end.lat, end.lon)
+        try:
+            return await self.run_search(key, self.route_json, start, end, passenger, segments)
+        except ValueError as error:  # Açık durak kalmadıysa
+            raise HTTPError(HTTPStatus.SERVICE_UNAVAILABLE, str(error))
+
+    async def batch(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        pairs = body.get("pairs")
+        if not isinstance(pairs, list):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "'pairs' listesi gerekli")
+        if len(pairs) > self.max_batch:
+            raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                            f"Toplu istek en fazla {self.max_batch} çift içerebilir")
+        passenger = parse_passenger(body.get("passenger"))
+        locations = [(parse_location(pair.get("start") if isinstance(pair, dict) else None, f"pairs[{i}].start"),
+                      parse_location(pair.get("end") if isinstance(pair, dict) else None, f"pairs[{i}].end"))
+                     for i, pair in enumerate(pairs)]
+        segments = body.get("segments", False)
+
+        # Toplu istek havuzda tek iş olarak çalışır, tek bir kuyruk yeri tutar
+        def run():
+            return [route_to_json(result, segments=segments)
+                    for result in self.system.find_routes(locations, passenger, processes=1,
+                                                          compact=True)]
+
+        # Aynı içerikli eşzamanlı toplu istekler tek işi paylaşır; anahtar yolcu tipi, parça
+        # seçeneği ve koordinatların kendisidir (yuvarlanmaz, erişim mesafeleri sonuca girer)
+        key = ("batch", type(passenger).__name__, bool(segments),
+               tuple((start.lat, start.lon, end.lat, end.lon) for start, end in locations))
+        try:
+            return {"results": await self.run_search(key, run)}
+        except ValueError as error:  # Açık durak kalmadıysa
+            raise HTTPError(HTTPStatus.SERVICE_UNAVAILABLE, str(error))
+
+    async def updates(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        """Kapanma/gecikme güncellemelerini sırayla uygula; hata olursa öncekiler geçerli kalır"""
+        updates = body.get("updates")
+        if not isinstance(updates, list) or not updates:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "'updates' listesi gerekli")
+        calls = []
+        for i, update in enumerate(updates):
+            action = update.get("action") if isinstance(update, dict) else None
+            if action not in UPDATE_ACTIONS:
+                raise HTTPError(HTTPStatus.BAD_REQUEST, f"updates[{i}]: bilinmeyen işlem {action}")
+            method, fields = UPDATE_ACTIONS[action]
+            calls.append((getattr(self.system, method), [update.get(field) for field in fields]))
+
+        def run():
+            return [function(*args) for function, args in calls]
+
+        # Güncelleme havuzda çalışır (ağaç hesapları olay döngüsünü bloklamaz); her güncelleme
+        # ağın yazma kilidini alır, süren aramaların bitmesini bekler
+        async with self.update_lock:
+            try:
+                results = await self.run_search(("updates", id(calls)), run)
+            except (ValueError, TypeError) as error:
+                raise HTTPError(HTTPStatus.BAD_REQUEST, str(error))
+        return {"results": results, "version": self.system.network_version}
+
+    def nearest(self, query: Dict[str, list]) -> Dict[str, Any]:
+        try:
+            location = Location(float(query["lat"][0]), float(query["lon"][0]))
+            k = int(query.get("k", ["1"])[0])
+        except (KeyError, ValueError):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "'lat' ve 'lon' sayısal olmalı")
+        if not 1 <= k <= 100:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "'k' 1 ile 100 arasında olmalı")
+        # Izgara indeksi sorgusu kısa sürer, olay döngüsünde yanıtlanır
+        return {"stops": [dict(stop_to_json(stop), distance=distance)
+                          for stop, distance in self.system.find_nearest_stops(location, k)]}
+
+    def stops(self, query: Dict[str, list]) -> Dict[str, Any]:
+        try:
+            k = int(query.get("k", ["10"])[0])
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "'k' tam sayı olmalı")
+        if not 1 <= k <= 100:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "'k' 1 ile 100 arasında olmalı")
+        # Ad indeksi sorgusu kısa sürer, olay döngüsünde yanıtlanır
+        return {"stops": [stop_to_json(stop)
+                          for stop in self.system.search_stops(query.get("q", [""])[0], k)]}
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "pending": self.pending,
+            "in_flight": len(self.in_flight),
+            "coalesced": self.coalesced,
+            "rejected": self.rejected,
+            "cache": self.system.route_cache.stats(),
+        }
+
+    async def dispatch(self, method: str, target: str, body: bytes) -> Tuple[HTTPStatus, Dict[str, Any]]:
+        """İsteği ilgili uç noktaya yönlendir"""
+        url = urlsplit(target)
+        if method == "GET" and url.path == "/health":
+            return HTTPStatus.OK, {"status": "ok", "stops": len(self.system.stops)}
+        if method == "GET" and url.path == "/stats":
+            return HTTPStatus.OK, self.stats()
+        if method == "GET" and url.path == "/nearest":
+            return HTTPStatus.OK, self.nearest(parse_qs(url.query))
+        if method == "GET" and url.path == "/stops":
+            return HTTPStatus.OK, self.stops(parse_qs(url.query))
+        if method == "POST" and url.path in ("/route", "/batch", "/updates"):
+            try:
+                data = json.loads(body or b"{}")
+            except ValueError:
+                raise HTTPError(HTTPStatus.BAD_REQUEST, "Geçersiz JSON gövdesi")
+            if not isinstance(data, dict):
+                raise HTTPError(HTTPStatus.BAD_REQUEST, "JSON nesnesi bekleniyor")
+            handler = {"/route": self.route, "/batch": self.batch, "/updates": self.updates}[url.path]
+            return HTTPStatus.OK, await handler(data)
+        if url.path in ("/health", "/stats", "/nearest", "/stops", "/route", "/batch", "/updates"):
+            raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, f"Desteklenmeyen yöntem: {method}")
+        raise HTTPError(HTTPStatus.NOT_FOUND, f"Bulunamadı: {url.path}")
+
+    async def read_request(self, reader: asyncio.StreamReader) -> Optional[Tuple[str, str, Dict[str, str], bytes]]:
+        """Bir HTTP/1.1 isteği oku; bağlantı kapandıysa None"""
+        line = await asyncio.wait_for(reader.readline(), self.IDLE_TIMEOUT)
+        if not line:
+            return None
+        try:
+            method, target, version = line.decode("latin-1").split()
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Geçersiz istek satırı")
+
+        headers: Dict[str, str] = {"_version": version}
+        # Başlık ve gövde okumaları da süre sınırlıdır; yavaş istemci bağlantıyı tutamaz
+        while True:
+            line = await asyncio.wait_for(reader.readline(), self.IDLE_TIMEOUT)
+            if line in (b"\r\n", b"\n", b""):
+                break
+            if len(headers) > self.MAX_HEADERS:
+                raise HTTPError(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, "Çok fazla başlık")
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        try:
+            length = int(headers.get("content-length", "0"))
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Geçersiz Content-Length")
+        if length > self.MAX_BODY:
+            raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "İstek gövdesi çok büyük")
+        body = await asyncio.wait_for(reader.readexactly(length), self.IDLE_TIMEOUT) if length else b""
+        return method.upper(), target, headers, body
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections.add(writer)
+        try:
+            while True:
+                keep_alive = False
+                try:
+                    request = await self.read_request(reader)
+                    if request is None:
+                        break
+                    method, target, headers, body = request
+                    connection = headers.get("connection", "").lower()
+                    keep_alive = (connection == "keep-alive" if headers["_version"] == "HTTP/1.0"
+                                  else connection != "close")
+
+                    self.requests += 1
+                    self.active_requests += 1
+                    self.idle.clear()
+                    try:
+                        status, payload = await self.dispatch(method, target, body)
+                    finally:
+                        self.active_requests -= 1
+                        if self.active_requests == 0:
+                            self.idle.set()
+                except HTTPError as error:
+                    status, payload = error.status, {"error": error.message}
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except Exception:
+                    logger.exception("İstek işlenirken beklenmeyen hata")
+                    status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": "Sunucu hatası"}
+
+                # Kapanış sırasında kalıcı bağlantılar sürdürülmez
+                if self.server is not None and not self.server.is_serving():
+                    keep_alive = False
+                self.write_response(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            self.connections.discard(writer)
+            writer.close()
+
+    @staticmethod
+    def write_response(writer: asyncio.StreamWriter, status: HTTPStatus,
+                       payload: Dict[str, Any], keep_alive: bool) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        headers = [
+            f"HTTP/1.1 {status.value} {status.phrase}",
+            "Content-Type: application/json; charset=utf-8",
+            f"Content-Length: {len(body)}",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}",
+        ]
+        if status == HTTPStatus.SERVICE_UNAVAILABLE:
+            headers.append("Retry-After: 1")
+        writer.write(("\r\n".join(headers) + "\r\n\r\n").encode("latin-1") + body)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rota planlama HTTP servisi")
+    parser.add_argument("--json", default="Duraklar.json", help="Durak dosyası")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=4, help="Arama iş parçacığı sayısı")
+    parser.add_argument("--max-pending", type=int, default=256, help="Kuyruk sınırı (aşılırsa 503)")
+    parser.add_argument("--cache-size", type=int, default=4096)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    system = TransportationSystem(args.json, cache_size=args.cache_size, snapshot=True)
+    service = RoutingService(system, args.host, args.port, workers=args.workers,
+                             max_pending=args.max_pending)
+    asyncio.run(service.serve_forever())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+import os
+import sys
+
+import pytest
+
+# Modüller (models, routing, transportation_system) proje dizininden içe aktarılır
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_DIR not in sys.path:
+    sys.path.insert(0, PROJECT_DIR)
+
+DURAKLAR = os.path.join(PROJECT_DIR, "Duraklar.json")
+
+@pytest.fixture(scope="session")
+def duraklar_path() -> str:
+    """Depodaki örnek ağ dosyası"""
+    return DURAKLAR
+
+@pytest.fixture(scope="session")
+def generated_path(tmp_path_factory) -> str:
+    """Sentetik üreticiyle yazılmış 300 duraklı ağ dosyası"""
+    from benchmarks.generator import write_network
+    path = str(tmp_path_factory.mktemp("network") / "network.json")
+    write_network(path, 300, seed=7)
+    return path
+
+@pytest.fixture(params=["duraklar", "generated"])
+def network_path(request, generated_path) -> str:
+    """Duraklar.json ve sentetik ağ üzerinde ayrı ayrı çalışan testler için"""
+    return DURAKLAR if request.param == "duraklar" else generated_path
@@ -0,0 +1,58 @@
+from models import CashPayment, ElderlyPassenger, GeneralPassenger, Location, StudentPassenger
+from routing import RouteCache
+from transportation_system import TransportationSystem
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+def test_lru_eviction_and_stats():
+    cache = RouteCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # "b" en eski kullanılan olur
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    stats = cache.stats()
+    assert (stats["size"], stats["hits"], stats["misses"], stats["evictions"]) == (2, 3, 1, 1)
+
+def test_ttl_expiry():
+    clock = FakeClock()
+    cache = RouteCache(maxsize=4, ttl=10.0, clock=clock)
+    cache.put("a", 1)
+    clock.now = 9.9
+    assert cache.get("a") == 1
+    clock.now = 10.0
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+def test_disabled_cache_stores_nothing():
+    cache = RouteCache(maxsize=0)
+    cache.put("a", 1)
+    assert cache.get("a") is None and len(cache) == 0
+
+def test_rekey_moves_and_drops_entries():
+    cache = RouteCache(maxsize=4)
+    for key in ("a", "b", "c"):
+        cache.put(key, key.upper())
+    removed = cache.rekey(lambda key, value: None if key == "b" else key + "2")
+    assert removed == 1
+    assert list(cache.entries) == ["a2", "c2"]
+    assert cache.get("c2") == "C"
+
+def test_cache_is_shared_across_passengers(duraklar_path):
+    cached = TransportationSystem(duraklar_path, cache_size=64)
+    uncached = TransportationSystem(duraklar_path, cache_size=0)
+    start, end = Location(40.7655, 29.9400), Location(40.7800, 29.9900)
+    for passenger in (GeneralPassenger(), StudentPassenger(), ElderlyPassenger()):
+        result = cached.find_route(start, end, passenger, CashPayment(1000))["route"]
+        expected = uncached.find_route(start, end, passenger, CashPayment(1000))["route"]
+        assert (result.total_cost, result.total_time, result.total_distance) == \
+            (expected.total_cost, expected.total_time, expected.total_distance)
+    # Yolcu tipi anahtarın parçası değildir: ilk arama dışındaki tüm sorgular önbellekten gelir
+    stats = cached.route_cache.stats()
+    assert (stats["size"], stats["misses"], stats["hits"]) == (1, 1, 2)
@@ -0,0 +1,92 @@
+import threading
+
+import pytest
+
+from models import CardRegistry, CreditCardPayment, KentCardPayment, Ledger
+
+def make_registry(count, balance, shards=8):
+    registry = CardRegistry(shards=shards)
+    for number in range(count):
+        registry.register(KentCardPayment(f"kart-{number}", balance))
+    return registry
+
+def test_register_and_lookup():
+    registry = make_registry(20, 10.0, shards=4)
+    assert len(registry) == 20 and "kart-3" in registry and "yok" not in registry
+    assert sorted(card.card_number for card in registry) == sorted(f"kart-{n}" for n in range(20))
+    card = registry.get("kart-3")
+    assert card.lock is registry.shards[registry.shard_index("kart-3")].lock
+    with pytest.raises(ValueError, match="zaten kayıtlı"):
+        registry.register(KentCardPayment("kart-3", 5.0))
+    with pytest.raises(ValueError, match="Kayıtlı olmayan"):
+        registry.get("yok")
+    with pytest.raises(ValueError):
+        CardRegistry(shards=0)
+
+def test_concurrent_payments_keep_balances_exact():
+    registry = make_registry(6, 300.0, shards=2)
+    successes = [0] * 6
+    counter_lock = threading.Lock()
+
+    def pay(worker):
+        for step in range(400):
+            card = (worker + step) % 6
+            if registry.process_payment(f"kart-{card}", 1.0):
+                with counter_lock:
+                    successes[card] += 1
+
+    threads = [threading.Thread(target=pay, args=(worker,)) for worker in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # 8 x 400 ödeme 6 karta dağılır; her kart en fazla 300 kez ödeyebilir, eksiye düşmez
+    balances = registry.balances()
+    for card in range(6):
+        assert successes[card] == 300
+        assert balances[f"kart-{card}"] == 0.0
+        assert registry.get(f"kart-{card}").ledger.count > 300
+
+def test_batch_matches_sequential_payments():
+    payments = [(f"kart-{n % 5}", float(1 + n % 4)) for n in range(60)]
+    batched = make_registry(5, 25.0, shards=3)
+    sequential = make_registry(5, 25.0, shards=3)
+    results = batched.process_payments(payments)
+    assert results == [sequential.process_payment(number, amount) for number, amount in payments]
+    assert batched.balances() == sequential.balances()
+    assert False in results  # Bakiyesi yetmeyen ödemeler reddedilir
+
+    # Aynı kartın ödemeleri verilen sırayla uygulanır
+    card = batched.get("kart-0")
+    assert [entry["amount"] for entry in card.transaction_history] == \
+        [amount for number, amount in payments if number == "kart-0"]
+
+def test_durable_commit_waits_outside_shard_lock(tmp_path):
+    registry = CardRegistry(shards=1)
+    lock = registry.shards[0].lock
+    cards = [registry.register(CreditCardPayment(f"kredi-{n}", "12/30", "000", limit=50.0,
+                                                 ledger=Ledger(journal_path=str(tmp_path / f"{n}.journal"),
+                                                               durable=True)))
+             for n in range(3)]
+    held = []
+    for card in cards:
+        commit = card.ledger.commit
+
+        def checked_commit(sequence, commit=commit):
+            held.append(lock.locked())
+            commit(sequence)
+        card.ledger.commit = checked_commit
+
+    assert registry.process_payment("kredi-0", 10.0)
+    assert registry.process_payments([("kredi-1", 20.0), ("kredi-2", 60.0), ("kredi-1", 5.0)]) == \
+        [True, False, True]
+    # Her defter bir kez beklenir ve beklerken parça kilidi serbesttir
+    assert held == [False] * 3
+    for card in cards:
+        card.ledger.close()
+
+    restored = CreditCardPayment("kredi-1", "12/30", "000", limit=50.0,
+                                 ledger=Ledger(journal_path=str(tmp_path / "1.journal")))
+    assert restored.get_balance() == 25.0
+    restored.ledger.close()
@@ -0,0 +1,124 @@
+import queue
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("tkinter")
+pytest.importorskip("folium")
+pytest.importorskip("tkintermapview")
+
+import gui
+from models import CashPayment, GeneralPassenger, Location, StudentPassenger
+from transportation_system import TransportationSystem
+
+class FakeRoot:
+    """root.after çağrılarını biriktirip testin elle çalıştırmasına izin verir"""
+    def __init__(self):
+        self.callbacks = []
+
+    def after(self, delay, callback):
+        self.callbacks.append(callback)
+
+    def run_pending(self):
+        callbacks, self.callbacks = self.callbacks, []
+        for callback in callbacks:
+            callback()
+
+class FakeProgress:
+    def __init__(self):
+        self.visible = False
+        self.running = False
+
+    def grid(self):
+        self.visible = True
+
+    def grid_remove(self):
+        self.visible = False
+
+    def start(self, interval):
+        self.running = True
+
+    def stop(self):
+        self.running = False
+
+def make_gui(path):
+    # Tk pencereleri kurulmadan yalnızca rota işçisi ve sonuç yoklaması
+    app = object.__new__(gui.TransportationGUI)
+    app.root = FakeRoot()
+    app.system = TransportationSystem(path)
+    app.progress = FakeProgress()
+    app.generation = 0
+    app.pending_request = None
+    app.request_lock = threading.Lock()
+    app.request_ready = threading.Event()
+    app.results = queue.Queue()
+    app.polling = False
+    app.pending_payment = None
+    app.pending_passenger = None
+    app.shown = []
+    app.display_results = lambda route, passenger, payment: app.shown.append((route, passenger, payment))
+    app.display_route_on_map = lambda route: None
+    app.worker = threading.Thread(target=app.route_worker, daemon=True)
+    app.worker.start()
+    return app
+
+def wait_until_idle(app, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while app.polling:
+        assert time.monotonic() < deadline, "rota sonucu gelmedi"
+        time.sleep(0.01)
+        app.root.run_pending()
+
+def test_latest_request_supersedes_earlier_ones(duraklar_path):
+    app = make_gui(duraklar_path)
+    plan_route = app.system.plan_route
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def blocking_plan_route(start, end, passenger):
+        calls.append(passenger)
+        started.set()
+        release.wait()
+        return plan_route(start, end, passenger)
+    app.system.plan_route = blocking_plan_route
+
+    lats, lons = app.system.network.lats, app.system.network.lons
+    start, end = Location(min(lats), min(lons)), Location(max(lats), max(lons))
+    payments = [CashPayment(100.0) for _ in range(3)]
+    passengers = [GeneralPassenger(), GeneralPassenger(), StudentPassenger()]
+
+    app.submit_route(start, end, passengers[0], payments[0])
+    assert started.wait(5)
+    # İşçi ilk istekle meşgulken gelen ikinci istek üçüncüsüyle değiştirilir
+    app.submit_route(start, end, passengers[1], payments[1])
+    app.submit_route(start, end, passengers[2], payments[2])
+    assert app.progress.visible and app.progress.running
+    release.set()
+    wait_until_idle(app)
+
+    assert calls == [passengers[0], passengers[2]]
+    assert len(app.shown) == 1
+    route, passenger, payment = app.shown[0]
+    assert passenger is passengers[2] and payment is payments[2]
+    assert not app.progress.visible and not app.progress.running
+
+    # Yalnızca gösterilen sonuç ücretlendirilir, tutar find_route ile aynıdır
+    app.system.plan_route = plan_route
+    expected = CashPayment(100.0)
+    app.system.find_route(start, end, StudentPassenger(), expected)
+    assert [p.get_balance() for p in payments] == [100.0, 100.0, expected.get_balance()]
+
+def test_worker_errors_are_reported(duraklar_path, monkeypatch):
+    app = make_gui(duraklar_path)
+    errors = []
+    monkeypatch.setattr(gui.messagebox, "showerror", lambda title, message: errors.append(message))
+    for index in range(app.system.network.num_stops):
+        app.system.close_stop(app.system.network.stop_ids[index])
+
+    payment = CashPayment(100.0)
+    app.submit_route(Location(40.76, 29.94), Location(40.77, 29.95), GeneralPassenger(), payment)
+    wait_until_idle(app)
+    assert errors and "tüm duraklar kapalı" in errors[0]
+    assert app.shown == [] and payment.get_balance() == 100.0
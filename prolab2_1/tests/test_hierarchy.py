@@ -0,0 +1,77 @@
+import math
+import random
+
+import pytest
+
+from models import GeneralPassenger, Location
+from routing import ContractionHierarchy, SearchStrategy, load_stops, shortest_path
+from routing.storage import read_meta, write_arrays
+from transportation_system import TransportationSystem
+
+def sample_pairs(n, count=400, seed=0):
+    if n * n <= count:
+        return [(source, target) for source in range(n) for target in range(n)]
+    rnd = random.Random(seed)
+    return [(rnd.randrange(n), rnd.randrange(n)) for _ in range(count)]
+
+def test_hierarchy_matches_dijkstra(network_path):
+    _, network, digest = load_stops(network_path)
+    hierarchy = ContractionHierarchy.build(network, digest)
+    for source, target in sample_pairs(network.num_stops):
+        # Eşit ücretli yollarda da aynı kenar listesi; açılan yollar döngüsüzdür
+        edges = hierarchy.path(source, target)
+        assert edges == shortest_path(network, source, target), (source, target)
+        stops = [network.targets[edge] for edge in edges]
+        assert len(set(stops)) == len(stops) and source not in stops
+
+def test_hierarchy_skips_closed_edges(generated_path):
+    _, network, digest = load_stops(generated_path)
+    rnd = random.Random(2)
+    for edge in rnd.sample(range(network.num_edges), network.num_edges // 5):
+        network.costs[edge] = network.times[edge] = math.inf
+    hierarchy = ContractionHierarchy.build(network, digest)
+    for source, target in sample_pairs(network.num_stops, 200, seed=3):
+        assert hierarchy.path(source, target) == shortest_path(network, source, target)
+
+def test_open_saves_and_maps_hierarchy(tmp_path, duraklar_path):
+    _, network, digest = load_stops(duraklar_path)
+    path = str(tmp_path / "network.ch.bin")
+    built = ContractionHierarchy.open(path, network, digest)
+    loaded = ContractionHierarchy.open(path, network, digest)
+    assert loaded.mapping is not None
+    for name in ContractionHierarchy.ARRAY_FIELDS:
+        assert list(getattr(loaded, name)) == list(getattr(built, name))
+    for source, target in sample_pairs(network.num_stops):
+        assert loaded.path(source, target) == built.path(source, target)
+
+def test_open_rebuilds_old_format(tmp_path, duraklar_path):
+    _, network, digest = load_stops(duraklar_path)
+    path = str(tmp_path / "network.ch.bin")
+    built = ContractionHierarchy.build(network, digest)
+    # Süre ve mesafe dizileri olmayan 1. sürüm dosyası
+    fields = [name for name in ContractionHierarchy.ARRAY_FIELDS if name not in ("arc_times", "arc_distances")]
+    write_arrays(path, {name: getattr(built, name) for name in fields},
+                 {"kind": "contraction_hierarchy", "stops": network.num_stops, "digest": digest})
+    with pytest.raises(ValueError):
+        ContractionHierarchy.load(path)
+    ContractionHierarchy.open(path, network, digest)
+    assert read_meta(path)["version"] == ContractionHierarchy.VERSION
+
+def test_edge_changes_drop_hierarchy(tmp_path, generated_path):
+    system = TransportationSystem(generated_path, cache_size=0)
+    system.enable_contraction_hierarchy(str(tmp_path / "network.ch.bin"))
+    assert system.search_strategy is SearchStrategy.CONTRACTION_HIERARCHY
+    lats, lons = system.network.lats, system.network.lons
+    start, end = Location(lats[0], lons[0]), Location(lats[-1], lons[-1])
+    edge = system.network.offsets[0]  # İlk durağın ilk kenarı
+
+    system.apply_edge_changes([(edge, math.inf, math.inf)])
+    assert system.hierarchy is None
+    assert system.search_strategy is SearchStrategy.DIJKSTRA
+    # Güncel ağ üzerinde hiyerarşisiz kurulan sistemle aynı rota
+    plain = TransportationSystem(generated_path, cache_size=0)
+    plain.apply_edge_changes([(edge, math.inf, math.inf)])
+    route = system.plan_route(start, end, GeneralPassenger())["route"]
+    expected = plain.plan_route(start, end, GeneralPassenger())["route"]
+    assert [(segment.from_stop.id, segment.to_stop.id) for segment in route.segments] == \
+        [(segment.from_stop.id, segment.to_stop.id) for segment in expected.segments]
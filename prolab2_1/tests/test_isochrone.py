@@ -0,0 +1,79 @@
+import math
+import random
+
+import pytest
+
+from models import ElderlyPassenger, GeneralPassenger, Location, StudentPassenger
+from routing import convex_hull
+from transportation_system import TransportationSystem
+
+def reached_by_route(route, max_time, max_cost):
+    path = route.path
+    if math.isinf(route.total_cost) or (path.edges is not None and len(path.edges) == 0
+                                        and path.start != path.end):
+        return False  # Ulaşılamayan hedef
+    return (max_time is None or route.total_time <= max_time) and \
+        (max_cost is None or route.total_cost <= max_cost)
+
+@pytest.mark.parametrize("passenger, from_stop, max_time, max_cost", [
+    (GeneralPassenger(), False, None, 40),
+    (StudentPassenger(), True, 45, None),
+    (ElderlyPassenger(), False, 60, 20),
+])
+def test_reachable_matches_plan_route(network_path, passenger, from_stop, max_time, max_cost):
+    system = TransportationSystem(network_path, cache_size=0)
+    rnd = random.Random(2)
+    lats, lons = system.stop_coordinates()
+    if from_stop:
+        origin = system.stop_at(rnd.randrange(system.network.num_stops))
+    else:
+        origin = Location(float(lats.mean()), float(lons.mean()))
+    reached = {item.stop.id: item for item in
+               system.reachable_from(origin, passenger, max_time=max_time, max_cost=max_cost)}
+    assert reached
+
+    for index in rnd.sample(range(system.network.num_stops), min(80, system.network.num_stops)):
+        stop = system.stop_at(index)
+        if system.find_nearest_stop(stop)[0].id != stop.id:
+            continue  # Aynı konumdaki başka bir durağa düşer
+        route = system.plan_route(origin, stop, passenger, compact=True)
+        item = reached.get(stop.id)
+        assert (item is not None) == reached_by_route(route, max_time, max_cost)
+        if item is not None:
+            assert item.total_cost == pytest.approx(route.total_cost)
+            assert item.total_time == pytest.approx(route.total_time)
+            assert item.transfer_count == route.transfer_count
+
+def test_convex_hull():
+    square = [(0, 0), (2, 0), (2, 2), (0, 2)]
+    # İç noktalar, kenar üzerindeki noktalar ve tekrarlar zarfa girmez
+    points = square + [(1, 1), (1, 0), (0, 0), (0.5, 1.5)]
+    assert convex_hull(points) == [(0, 0), (2, 0), (2, 2), (0, 2)]
+    assert convex_hull([(1, 1), (1, 1)]) == [(1, 1)]
+    assert convex_hull([(0, 0), (1, 1), (2, 2)]) == [(0, 0), (2, 2)]
+
+def test_isochrone_geojson(generated_path):
+    system = TransportationSystem(generated_path, cache_size=0)
+    lats, lons = system.stop_coordinates()
+    origin = Location(float(lats.mean()), float(lons.mean()))
+    passenger = GeneralPassenger()
+    limits = [15, 45, 30]
+    collection = system.isochrone_geojson(origin, passenger, limits)
+    reachable = system.reachable_from(origin, passenger, max_time=max(limits))
+
+    assert collection["type"] == "FeatureCollection"
+    features = collection["features"]
+    # Büyük sınır önce çizilir; her katmandaki durak sayısı süre sınırına uyar
+    assert [feature["properties"]["limit"] for feature in features] == [45, 30, 15]
+    for feature in features:
+        limit = feature["properties"]["limit"]
+        assert feature["properties"]["stops"] == sum(item.total_time <= limit for item in reachable)
+        geometry = feature["geometry"]
+        if geometry["type"] == "Polygon":
+            ring = geometry["coordinates"][0]
+            assert ring[0] == ring[-1]
+
+    with pytest.raises(ValueError):
+        system.isochrone_geojson(origin, passenger, [])
+    with pytest.raises(ValueError):
+        system.isochrone_geojson(origin, passenger, [10], metric="mesafe")
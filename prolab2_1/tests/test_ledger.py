@@ -0,0 +1,92 @@
+import math
+from datetime import datetime, timedelta
+
+import pytest
+
+from models import CashPayment, Ledger
+from models.ledger import JOURNAL_HEADER, RECORD
+
+def test_ring_buffer_keeps_latest_records():
+    ledger = Ledger(capacity=3)
+    assert len(ledger) == 0 and ledger.recent() == []
+    for amount in range(1, 6):
+        ledger.record(float(amount), amount % 2 == 0, 100.0 - amount)
+    assert len(ledger) == 3 and ledger.count == 5
+    assert [(amount, balance, success) for _, amount, balance, success in ledger.recent()] == \
+        [(3.0, 97.0, False), (4.0, 96.0, True), (5.0, 95.0, False)]
+    timestamps = [timestamp for timestamp, _, _, _ in ledger.recent()]
+    assert timestamps == sorted(timestamps)
+    assert ledger.last_balance == 95.0
+
+def test_buffer_range_query_and_missing_balance():
+    ledger = Ledger(capacity=4)
+    ledger.record(1.0, True, None)  # Bakiyesiz yöntem (ör. kredi kartı)
+    assert math.isnan(ledger.recent()[0][2])
+    entries = ledger.between(datetime.fromtimestamp(0), datetime.now() + timedelta(days=1))
+    assert [(entry["amount"], entry["success"]) for entry in entries] == [(1.0, True)]
+    assert ledger.between(datetime.fromtimestamp(0), datetime.fromtimestamp(1)) == []
+
+def test_capacity_must_be_positive():
+    with pytest.raises(ValueError):
+        Ledger(capacity=0)
+
+def test_journal_round_trip(tmp_path):
+    path = str(tmp_path / "card.journal")
+    ledger = Ledger(capacity=4, journal_path=path, durable=True)
+    balance = 100.0
+    for amount in range(1, 11):
+        balance -= amount
+        ledger.commit(ledger.record(float(amount), True, balance))
+    stamps = [timestamp for timestamp, _, _, _ in ledger.recent()]
+    ledger.close()
+
+    # Yeniden açılan defter son işlemleri ve toplam sayıyı günlükten yükler
+    replayed = Ledger(capacity=4, journal_path=path)
+    assert replayed.count == 10
+    assert replayed.last_balance == balance
+    assert [amount for _, amount, _, _ in replayed.recent()] == [7.0, 8.0, 9.0, 10.0]
+    assert [timestamp for timestamp, _, _, _ in replayed.recent()] == stamps
+
+    # Aralık sorgusu arabellekten taşan eski kayıtları da günlükten bulur
+    everything = replayed.between(datetime.fromtimestamp(0), datetime.now() + timedelta(days=1))
+    assert [entry["amount"] for entry in everything] == [float(amount) for amount in range(1, 11)]
+    after = datetime.fromtimestamp(stamps[-1]) + timedelta(seconds=1)
+    assert replayed.between(after, after + timedelta(days=1)) == []
+    assert replayed.between(datetime.fromtimestamp(0), datetime.fromtimestamp(1)) == []
+
+    replayed.record(5.0, False, balance)
+    replayed.close()
+    assert Ledger(capacity=4, journal_path=path).count == 11
+
+
+def test_truncated_journal_record_is_dropped(tmp_path):
+    path = str(tmp_path / "card.journal")
+    ledger = Ledger(capacity=8, journal_path=path)
+    for amount in (1.0, 2.0, 3.0):
+        ledger.record(amount, True, 10.0 - amount)
+    ledger.close()
+
+    # Yarım yazılmış son kayıt yeniden açılışta yok sayılır ve kesilir
+    with open(path, "r+b") as file:
+        file.truncate(JOURNAL_HEADER.size + 2 * RECORD.size + 5)
+    replayed = Ledger(capacity=8, journal_path=path)
+    assert replayed.count == 2 and replayed.last_balance == 8.0
+    replayed.close()
+
+def test_invalid_journal_raises(tmp_path):
+    path = tmp_path / "card.journal"
+    path.write_bytes(b"XXXX" + bytes(20))
+    with pytest.raises(ValueError, match="Geçersiz"):
+        Ledger(journal_path=str(path))
+
+def test_payment_balance_restored_from_journal(tmp_path):
+    path = str(tmp_path / "cash.journal")
+    payment = CashPayment(50.0, ledger=Ledger(journal_path=path, durable=True))
+    assert payment.process_payment(20.0) and not payment.process_payment(40.0)
+    payment.ledger.close()
+
+    restored = CashPayment(0.0, ledger=Ledger(journal_path=path))
+    assert restored.get_balance() == 30.0
+    assert [(entry["amount"], entry["success"]) for entry in restored.transaction_history] == \
+        [(20.0, True), (40.0, False)]
+    restored.ledger.close()
@@ -0,0 +1,129 @@
+import random
+
+import pytest
+
+from models import GeneralPassenger, Location
+from transportation_system import TransportationSystem
+
+def stop_pairs(system, count=40, seed=3):
+    rnd = random.Random(seed)
+    n = system.network.num_stops
+    return [(system.stop_at(rnd.randrange(n)), system.stop_at(rnd.randrange(n))) for _ in range(count)]
+
+def path_summary(system, pairs):
+    summary = []
+    for start_stop, end_stop in pairs:
+        path = system.stop_path(start_stop, end_stop)
+        summary.append((None if path.edges is None else list(path.edges),
+                        path.cost, path.time, path.distance))
+    return summary
+
+def used_edge(system, pairs):
+    # Ağ üzerinden giden (direkt olmayan) bir yolun ilk kenarı
+    for start_stop, end_stop in pairs:
+        path = system.search_stop_path(start_stop, end_stop)
+        if path.edges:
+            return path.edges[0]
+    pytest.skip("Ağ üzerinden giden yol yok")
+
+def edge_stops(system, edge):
+    network = system.network
+    return network.stop_ids[network.sources[edge]], network.stop_ids[network.targets[edge]]
+
+@pytest.mark.parametrize("table", [False, True])
+def test_update_edge_matches_fresh_system(tmp_path, generated_path, table):
+    system = TransportationSystem(generated_path)
+    if table:
+        system.enable_route_table(str(tmp_path / "routes.bin"))
+    pairs = stop_pairs(system)
+    path_summary(system, pairs)  # Önbellek dolar
+    edge = used_edge(system, pairs)
+    source, target = edge_stops(system, edge)
+
+    summary = system.update_edge(source, target, sure=system.network.times[edge] + 30,
+                                 ucret=system.network.costs[edge] + 50)
+    assert summary["cache_invalidated"] >= 1
+
+    fresh = TransportationSystem(generated_path, cache_size=0)
+    fresh.update_edge(source, target, sure=fresh.network.times[edge] + 30,
+                      ucret=fresh.network.costs[edge] + 50)
+    assert path_summary(system, pairs) == path_summary(fresh, pairs)
+
+def test_disable_and_enable_edge_restore_values(generated_path):
+    system = TransportationSystem(generated_path)
+    network = system.network
+    pairs = stop_pairs(system)
+    before = path_summary(system, pairs)
+    edge = used_edge(system, pairs)
+    source, target = edge_stops(system, edge)
+    original = (network.costs[edge], network.times[edge])
+
+    system.disable_edge(source, target)
+    assert network.costs[edge] == float("inf")
+    assert all(edge not in (path[0] or ()) for path in path_summary(system, pairs))
+
+    # Kapalıyken gelen gecikme kaybolmaz, açılınca geçerli olur
+    system.update_edge(source, target, sure=original[1] + 10)
+    assert network.times[edge] == float("inf")
+    system.enable_edge(source, target)
+    assert (network.costs[edge], network.times[edge]) == (original[0], original[1] + 10)
+
+    system.update_edge(source, target, sure=original[1])
+    assert path_summary(system, pairs) == before
+    assert not system.closed_edges and not system.disabled_edges
+    with pytest.raises(ValueError):
+        system.enable_edge(source, target)
+
+def test_close_and_reopen_stop(generated_path):
+    system = TransportationSystem(generated_path)
+    network = system.network
+    pairs = stop_pairs(system)
+    before = path_summary(system, pairs)
+    costs, times = list(network.costs), list(network.times)
+    stop = system.stop_at(network.sources[used_edge(system, pairs)])
+    location = Location(stop.lat, stop.lon)
+    assert system.find_nearest_stop(location)[0].id == stop.id
+
+    system.close_stop(stop.id)
+    assert system.find_nearest_stop(location)[0].id != stop.id
+    # Durak kapalıyken açılan bağlantısı, durak açılana kadar kapalı kalır
+    neighbour = network.targets[network.offsets[network.index[stop.id]]]
+    system.disable_edge(stop.id, network.stop_ids[neighbour])
+    with pytest.raises(ValueError):
+        system.reopen_stop("yok")
+
+    system.reopen_stop(stop.id)
+    assert system.find_nearest_stop(location)[0].id == stop.id
+    edge = system.edge_index(stop.id, network.stop_ids[neighbour])
+    assert network.costs[edge] == float("inf")
+    system.enable_edge(stop.id, network.stop_ids[neighbour])
+
+    assert list(network.costs) == costs and list(network.times) == times
+    assert path_summary(system, pairs) == before
+    assert not system.closed_stops and not system.closed_edges
+    with pytest.raises(ValueError):
+        system.reopen_stop(stop.id)
+
+def test_update_while_consuming_find_routes(generated_path):
+    system = TransportationSystem(generated_path)
+    rnd = random.Random(5)
+    lats, lons = system.network.lats, system.network.lons
+    pairs = [(Location(rnd.uniform(min(lats), max(lats)), rnd.uniform(min(lons), max(lons))),
+              Location(rnd.uniform(min(lats), max(lats)), rnd.uniform(min(lons), max(lons))))
+             for _ in range(12)]
+    passenger = GeneralPassenger()
+    edge = used_edge(system, [(system.find_nearest_stop(start)[0], system.find_nearest_stop(end)[0])
+                              for start, end in pairs])
+    source, target = edge_stops(system, edge)
+
+    results = []
+    for i, result in enumerate(system.find_routes(pairs, passenger, processes=2, chunk_size=3,
+                                                  compact=True)):
+        results.append(result)
+        if i == 2:
+            # Okuma kilidi yield sırasında tutulmadığı için aynı iş parçacığı güncelleyebilir
+            system.disable_edge(source, target)
+    for result, (start, end) in zip(results[3:], pairs[3:]):
+        expected = system.plan_route(start, end, passenger, compact=True)
+        assert (result.total_cost, result.total_time, result.end_stop.id) == \
+            (expected.total_cost, expected.total_time, expected.end_stop.id)
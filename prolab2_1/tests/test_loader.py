@@ -0,0 +1,62 @@
+import hashlib
+import json
+
+import pytest
+
+from routing import compile_stops, load_stops
+
+def compiled(path, chunk_size=None):
+    if chunk_size is None:
+        with open(path, encoding="utf-8") as file:
+            return compile_stops(json.load(file)["duraklar"])
+    table, network, _ = load_stops(path, chunk_size)
+    return table, network
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 7, 64, 1 << 16])
+def test_streaming_loader_matches_json_load(network_path, chunk_size):
+    expected_table, expected = compiled(network_path)
+    table, network = compiled(network_path, chunk_size)
+    assert table.stop_ids == expected_table.stop_ids
+    assert [table.stop(i).name for i in range(len(table))] == \
+        [expected_table.stop(i).name for i in range(len(expected_table))]
+    for name in ("lats", "lons", "offsets", "targets", "costs", "times", "distances",
+                 "transfers", "vehicles"):
+        assert list(getattr(network, name)) == list(getattr(expected, name)), name
+
+def test_streaming_digest_matches_file(duraklar_path):
+    with open(duraklar_path, "rb") as file:
+        expected = hashlib.sha1(file.read()).hexdigest()
+    assert load_stops(duraklar_path, 7)[2] == expected
+
+def write_stops(tmp_path, source, mutate):
+    with open(source, encoding="utf-8") as file:
+        data = json.load(file)
+    mutate(data["duraklar"])
+    path = tmp_path / "stops.json"
+    path.write_text(json.dumps(data), encoding="utf-8")
+    return str(path)
+
+@pytest.mark.parametrize("field", ["stopId", "transferStopId"])
+def test_unknown_reference_raises(tmp_path, duraklar_path, field):
+    def mutate(stops):
+        for stop in stops:
+            if field == "stopId" and stop["nextStops"]:
+                stop["nextStops"][0]["stopId"] = "yok"
+                return
+            if field == "transferStopId" and stop.get("transfer"):
+                stop["transfer"]["transferStopId"] = "yok"
+                return
+    path = write_stops(tmp_path, duraklar_path, mutate)
+    for chunk_size in (3, 1 << 16):
+        with pytest.raises(ValueError, match=field):
+            load_stops(path, chunk_size)
+
+def test_duplicate_and_truncated_files_raise(tmp_path, duraklar_path):
+    path = write_stops(tmp_path, duraklar_path, lambda stops: stops.append(dict(stops[0])))
+    with pytest.raises(ValueError, match="Yinelenen"):
+        load_stops(path, 5)
+    truncated = tmp_path / "truncated.json"
+    with open(duraklar_path, "rb") as file:
+        truncated.write_bytes(file.read()[:-40])
+    with pytest.raises(ValueError):
+        load_stops(str(truncated), 5)
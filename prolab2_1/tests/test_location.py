@@ -0,0 +1,49 @@
+import random
+
+import numpy as np
+import pytest
+
+from models import Location, coordinate_arrays, distance_matrix, haversine, haversine_array, haversine_matrix
+from transportation_system import TransportationSystem
+
+def random_locations(count, seed=0):
+    rnd = random.Random(seed)
+    return [Location(rnd.uniform(40.6, 40.9), rnd.uniform(29.8, 30.1)) for _ in range(count)]
+
+def test_array_kernel_matches_scalar():
+    origin, *others = random_locations(40)
+    lats, lons = coordinate_arrays(others)
+    expected = [haversine(origin.lat, origin.lon, other.lat, other.lon) for other in others]
+    assert haversine_array(origin.lat, origin.lon, lats, lons) == pytest.approx(expected, rel=1e-12)
+    assert origin.distances_to(lats, lons) == pytest.approx(expected, rel=1e-12)
+
+def test_matrix_kernel_matches_scalar():
+    first = random_locations(7, seed=1)
+    second = random_locations(5, seed=2)
+    matrix = haversine_matrix(*coordinate_arrays(first), *coordinate_arrays(second))
+    assert matrix.shape == (7, 5)
+    for i, a in enumerate(first):
+        for j, b in enumerate(second):
+            assert matrix[i, j] == pytest.approx(a.distance_to(b), rel=1e-12)
+
+def test_distance_matrix_is_symmetric_with_zero_diagonal():
+    locations = random_locations(12)
+    # Aynı noktalar ve antipodal noktalar sayısal olarak kararlı kalmalı
+    locations += [Location(locations[0].lat, locations[0].lon), Location(-40.75, -150.0)]
+    matrix = distance_matrix(locations)
+    assert np.allclose(matrix, matrix.T)
+    assert np.all(np.diag(matrix) == 0)
+    assert matrix[0, len(locations) - 2] == 0
+    assert not np.isnan(matrix).any()
+
+def test_system_bulk_distances(duraklar_path):
+    system = TransportationSystem(duraklar_path)
+    points = random_locations(30, seed=3)
+    stop_ids = system.network.stop_ids
+    matrix = system.stop_distance_matrix(points)
+    indices, distances = system.snap_to_stops(*coordinate_arrays(points), chunk_size=7)
+    for row, point in enumerate(points):
+        assert system.stop_distances(point) == pytest.approx(matrix[row], rel=1e-12)
+        stop, distance = system.find_nearest_stop(point)
+        assert stop_ids[indices[row]] == stop.id
+        assert distances[row] == pytest.approx(distance, rel=1e-12)
@@ -0,0 +1,94 @@
+import threading
+import time
+
+import pytest
+
+from routing import ReadWriteLock
+
+def run_thread(target):
+    thread = threading.Thread(target=target)
+    thread.start()
+    return thread
+
+def test_readers_share_the_lock():
+    lock = ReadWriteLock()
+    inside = threading.Barrier(2, timeout=2)
+
+    def reader():
+        with lock.read():
+            inside.wait()  # İki okuyucu aynı anda kilidin içinde olmalı
+
+    threads = [run_thread(reader) for _ in range(2)]
+    for thread in threads:
+        thread.join(2)
+    assert not inside.broken and lock.readers == 0
+
+def test_writer_waits_for_readers_and_excludes_them():
+    lock = ReadWriteLock()
+    events = []
+    reading = threading.Event()
+    release = threading.Event()
+
+    def reader():
+        with lock.read():
+            reading.set()
+            release.wait(2)
+            events.append("read")
+
+    def writer():
+        with lock.write():
+            events.append("write")
+
+    first = run_thread(reader)
+    reading.wait(2)
+    second = run_thread(writer)
+    time.sleep(0.05)
+    assert events == []  # Yazıcı okuyucuyu bekliyor
+    release.set()
+    first.join(2)
+    second.join(2)
+    assert events == ["read", "write"]
+
+def test_waiting_writer_blocks_new_readers():
+    lock = ReadWriteLock()
+    events = []
+    reading = threading.Event()
+    release = threading.Event()
+
+    def first_reader():
+        with lock.read():
+            reading.set()
+            release.wait(2)
+
+    def writer():
+        with lock.write():
+            events.append("write")
+
+    def late_reader():
+        with lock.read():
+            events.append("read")
+
+    threads = [run_thread(first_reader)]
+    reading.wait(2)
+    threads.append(run_thread(writer))
+    while not lock.waiting_writers:
+        time.sleep(0.001)
+    threads.append(run_thread(late_reader))
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join(2)
+    assert events == ["write", "read"]
+
+def test_nested_read_and_write_inside_read():
+    lock = ReadWriteLock()
+    with lock.read():
+        with lock.read():  # Bekleyen yazıcı olsa da iç içe okuma kilitlenmez
+            assert lock.readers == 1
+        with pytest.raises(RuntimeError):
+            with lock.write():
+                pass
+    # Okuma bırakıldıktan sonra yazma alınabilir
+    with lock.write():
+        assert lock.writer
+    assert not lock.writer and lock.readers == 0
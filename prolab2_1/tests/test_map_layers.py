@@ -0,0 +1,150 @@
+import random
+
+import pytest
+
+from map_layers import MapLayerManager, merge_lines, viewport_bounds
+from models import GeneralPassenger, Location
+from transportation_system import TransportationSystem
+
+class FakeObject:
+    def __init__(self, log, kind, args):
+        self.log = log
+        self.kind = kind
+        self.args = args
+        self.deleted = False
+
+    def delete(self):
+        self.deleted = True
+        self.log.append(("delete", self.kind))
+
+class FakeMap:
+    """TkinterMapView'in katman yöneticisinin kullandığı kısmı"""
+    def __init__(self, lat, lon, zoom, width=600, height=800):
+        self.position = (lat, lon)
+        self.zoom = zoom
+        self.width = width
+        self.height = height
+        self.log = []
+
+    def get_position(self):
+        return self.position
+
+    def winfo_width(self):
+        return 1  # Pencere henüz çizilmemiş: istenen boyut kullanılır
+
+    def winfo_height(self):
+        return 1
+
+    def after(self, delay, callback):
+        pass
+
+    def set_path(self, points, **options):
+        self.log.append(("path", len(points)))
+        return FakeObject(self.log, "path", (points, options))
+
+    def set_marker(self, lat, lon, **options):
+        self.log.append(("marker", options["text"]))
+        return FakeObject(self.log, "marker", (lat, lon, options))
+
+def test_viewport_bounds_halve_with_zoom():
+    south, west, north, east = viewport_bounds(40.76, 29.94, 13, 600, 800)
+    assert south < 40.76 < north and west < 29.94 < east
+    assert 29.94 - west == pytest.approx(east - 29.94)
+    closer = viewport_bounds(40.76, 29.94, 14, 600, 800)
+    assert closer[3] - closer[1] == pytest.approx((east - west) / 2)
+    assert closer[2] - closer[0] == pytest.approx((north - south) / 2, rel=1e-3)
+
+def test_merge_lines_cover_each_line_edge_once(network_path):
+    system = TransportationSystem(network_path)
+    network = system.network
+    stop_types = [system.stops[stop_id].type for stop_id in network.stop_ids]
+    expected = {(min(s, t), max(s, t))
+                for s in range(network.num_stops)
+                for edge in range(network.offsets[s], network.offsets[s + 1])
+                for t in (network.targets[edge],)
+                if not network.transfers[edge] and stop_types[s] == stop_types[t] and s != t}
+
+    drawn = []
+    for stop_type, stops in merge_lines(network, stop_types):
+        assert len(stops) >= 2 and all(stop_types[stop] == stop_type for stop in stops)
+        drawn.extend((min(a, b), max(a, b)) for a, b in zip(stops, stops[1:]))
+    assert sorted(drawn) == sorted(expected)
+
+def test_markers_cluster_when_zoomed_out(network_path):
+    system = TransportationSystem(network_path)
+    lats, lons = system.network.lats, system.network.lons
+    center = ((min(lats) + max(lats)) / 2, (min(lons) + max(lons)) / 2)
+
+    # Uzak görünüm: tüm duraklar kümelerde, her durak tek kümeye düşer
+    widget = FakeMap(*center, zoom=8)
+    layers = MapLayerManager(widget, system)
+    layers.refresh()
+    counts = [1 if key[0] == "stop" else key[3] for key in layers.marker_objects]
+    assert sum(counts) == system.network.num_stops
+    assert len(layers.marker_objects) < system.network.num_stops
+    assert len(layers.line_objects) == len(layers.lines)
+
+    # Yakın görünüm: kümeleme yok, yalnızca görünür alandaki duraklar çizilir
+    widget.zoom = MapLayerManager.DETAIL_ZOOM
+    layers.refresh()
+    south, west, north, east = viewport_bounds(*center, MapLayerManager.DETAIL_ZOOM, 600, 800)
+    visible = {index for index in range(system.network.num_stops)
+               if south <= lats[index] <= north and west <= lons[index] <= east}
+    assert set(layers.marker_objects) == {("stop", index) for index in visible}
+
+def test_refresh_only_redraws_differences(generated_path):
+    system = TransportationSystem(generated_path)
+    lats, lons = system.network.lats, system.network.lons
+    widget = FakeMap((min(lats) + max(lats)) / 2, (min(lons) + max(lons)) / 2, zoom=14)
+    layers = MapLayerManager(widget, system)
+    layers.refresh()
+    before = dict(layers.marker_objects)
+    widget.log.clear()
+    layers.refresh()
+    assert widget.log == []  # Görünüm değişmediyse hiçbir şey çizilmez
+
+    # Kaydırınca ortak işaretçiler aynı nesnelerle kalır
+    widget.position = (widget.position[0] + 0.002, widget.position[1])
+    layers.view = None
+    layers.refresh()
+    common = set(before) & set(layers.marker_objects)
+    assert common and all(layers.marker_objects[key] is before[key] for key in common)
+    assert all(before[key].deleted for key in set(before) - common)
+
+def test_show_route_draws_only_changes(duraklar_path):
+    system = TransportationSystem(duraklar_path)
+    widget = FakeMap(40.76, 29.94, zoom=13)
+    layers = MapLayerManager(widget, system)
+    rnd = random.Random(0)
+    lats, lons = system.network.lats, system.network.lons
+
+    def random_route():
+        while True:
+            start = Location(rnd.uniform(min(lats), max(lats)), rnd.uniform(min(lons), max(lons)))
+            end = Location(rnd.uniform(min(lats), max(lats)), rnd.uniform(min(lons), max(lons)))
+            route = system.plan_route(start, end, GeneralPassenger())
+            if route["route"].segments:
+                return route
+
+    # Başlangıç ve bitiş işaretçileri ile her parça için bir çizgi
+    route = random_route()
+    layers.show_route(route)
+    assert len(layers.route_objects) == len(route["route"].segments) + 2
+    widget.log.clear()
+    layers.show_route(route)
+    assert widget.log == []
+
+    # Yeni rotada ortak kalan parçalar aynı nesnelerle kalır, yalnızca fark çizilir
+    before = dict(layers.route_objects)
+    widget.log.clear()
+    layers.show_route(random_route())
+    common = set(before) & set(layers.route_objects)
+    assert all(layers.route_objects[key] is before[key] for key in common)
+    created = [entry for entry in widget.log if entry[0] != "delete"]
+    assert len(created) == len(layers.route_objects) - len(common)
+
+    count = len(layers.route_objects)
+    widget.log.clear()
+    layers.clear_route()
+    assert layers.route_objects == {}
+    assert len(widget.log) == count and all(entry[0] == "delete" for entry in widget.log)
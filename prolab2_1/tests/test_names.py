@@ -0,0 +1,60 @@
+import random
+
+from routing import NameIndex, fold_name
+from transportation_system import TransportationSystem
+
+NAMES = ["Otogar (Bus)", "İzmit Şehir Hastanesi", "Izmit Sahil", "Çayırova Meydanı",
+         "Gölcük Değirmendere", "Otogar (Tram)", "İzmit Şehir Hastanesi", "Körfez Ağaçlı Yol"]
+
+def test_fold_name_ignores_case_accents_and_punctuation():
+    assert fold_name("İZMİT  Şehir-Hastanesi") == "izmit sehir hastanesi"
+    assert fold_name("ıIiİ") == "iiii"
+    assert fold_name("Çayırova Meydanı") == fold_name("cayirova meydani")
+    assert fold_name("Otogar (Bus)") == "otogar bus"
+    assert fold_name("  ") == ""
+
+def brute_force(names, query):
+    words = fold_name(query).split()
+    return {index for index, name in enumerate(names)
+            if all(any(token.startswith(word) for token in fold_name(name).split()) for word in words)}
+
+def test_search_matches_brute_force():
+    rnd = random.Random(0)
+    alphabet = "aeiouklmnrst"
+    names = [" ".join("".join(rnd.choice(alphabet) for _ in range(rnd.randint(2, 6)))
+                      for _ in range(rnd.randint(1, 3))) for _ in range(300)]
+    index = NameIndex(names)
+    for _ in range(200):
+        query = " ".join("".join(rnd.choice(alphabet) for _ in range(rnd.randint(1, 2)))
+                         for _ in range(rnd.randint(1, 2)))
+        expected = brute_force(names, query)
+        found = index.search(query, k=len(names))
+        assert {position for position, _ in found} == expected, query
+        assert all(names[position] == name for position, name in found)
+
+def test_search_is_accent_insensitive_and_ranked():
+    index = NameIndex(NAMES)
+    assert [name for _, name in index.search("izmit")] == \
+        ["Izmit Sahil", "İzmit Şehir Hastanesi", "İzmit Şehir Hastanesi"]
+    assert [name for _, name in index.search("SEH has")] == ["İzmit Şehir Hastanesi"] * 2
+    assert [name for _, name in index.search("cay mey")] == ["Çayırova Meydanı"]
+    # Tam eşleşme önce, sonra adın başında, sonra herhangi bir kelimede eşleşme
+    assert [name for _, name in index.search("otogar bus")] == ["Otogar (Bus)"]
+    assert [position for position, _ in index.search("otogar")] == [0, 5]
+    assert index.search("yol agacli")[0][1] == "Körfez Ağaçlı Yol"
+    assert index.search("xyz") == []
+    assert len(index.search("", k=3)) == 3
+
+def test_exact_lookup_returns_first_duplicate():
+    index = NameIndex(NAMES)
+    assert index.lookup("İzmit Şehir Hastanesi") == 1
+    assert index.lookup("izmit şehir hastanesi") is None
+    assert index.lookup("Yok") is None
+
+def test_system_stop_search(duraklar_path):
+    system = TransportationSystem(duraklar_path)
+    assert system.find_stop_by_name("Sekapark (Tram)").id == system.network.stop_ids[8]
+    assert system.find_stop_by_name("sekapark") is None
+    assert [stop.name for stop in system.search_stops("sek")] == ["Sekapark (Bus)", "Sekapark (Tram)"]
+    assert [stop.name for stop in system.search_stops("YAHYA tram")] == ["Yahya Kaptan (Tram)"]
+    assert len(system.search_stops("", k=4)) == 4
@@ -0,0 +1,59 @@
+import math
+import random
+
+import pytest
+
+from models import ElderlyPassenger, Location, StudentPassenger
+from transportation_system import TransportationSystem
+
+def random_points(system, count, seed):
+    rnd = random.Random(seed)
+    lats, lons = system.stop_coordinates()
+    return [Location(rnd.uniform(lats.min(), lats.max()), rnd.uniform(lons.min(), lons.max()))
+            for _ in range(count)]
+
+def unreachable(route):
+    path = route.path
+    return path.edges is not None and len(path.edges) == 0 and path.start != path.end
+
+def assert_matches_plan_route(system, matrix, origins, destinations, passenger):
+    for i, origin in enumerate(origins):
+        for j, destination in enumerate(destinations):
+            route = system.plan_route(origin, destination, passenger, compact=True)
+            if unreachable(route):
+                # find_route boş yolu erişim bacaklarıyla döndürür; matriste sonsuz ve -1
+                assert math.isinf(matrix["cost"][i, j]) and math.isinf(matrix["time"][i, j])
+                assert matrix["transfers"][i, j] == -1
+                continue
+            assert matrix["cost"][i, j] == pytest.approx(route.total_cost)
+            assert matrix["time"][i, j] == pytest.approx(route.total_time)
+            assert matrix["distance"][i, j] == pytest.approx(route.total_distance)
+            assert matrix["transfers"][i, j] == route.transfer_count
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_od_matrix_matches_plan_route(network_path, processes):
+    system = TransportationSystem(network_path, cache_size=0)
+    origins = random_points(system, 5, seed=1)
+    destinations = random_points(system, 7, seed=2) + origins[:2]
+    for passenger in (StudentPassenger(), ElderlyPassenger()):
+        matrix = system.od_matrix(origins, destinations, passenger, processes=processes)
+        assert matrix["cost"].shape == (len(origins), len(destinations))
+        assert_matches_plan_route(system, matrix, origins, destinations, passenger)
+
+def test_od_matrix_unreachable_pair(generated_path):
+    system = TransportationSystem(generated_path, cache_size=0)
+    network = system.network
+    origins = random_points(system, 3, seed=3)
+    destinations = random_points(system, 6, seed=4)
+    # İlk başlangıç durağından çıkan tüm kenarlar kapanır: direkt bağlantı dışında her
+    # hedef ulaşılamaz olur
+    start = int(system.od_matrix(origins[:1], destinations[:1], StudentPassenger())["origin_stops"][0])
+    system.apply_edge_changes([(edge, math.inf, math.inf)
+                               for edge in range(network.offsets[start], network.offsets[start + 1])])
+
+    passenger = StudentPassenger()
+    matrix = system.od_matrix(origins, destinations, passenger)
+    assert int(matrix["origin_stops"][0]) == start
+    assert any(unreachable(system.plan_route(origins[0], destination, passenger, compact=True))
+               for destination in destinations)
+    assert_matches_plan_route(system, matrix, origins, destinations, passenger)
@@ -0,0 +1,59 @@
+import os
+import random
+
+import pytest
+
+from models import GeneralPassenger, Location, StudentPassenger
+from routing import ParallelRouter, load_stops, shortest_path, tree_values
+from transportation_system import TransportationSystem
+
+def summary(result):
+    route = result["route"]
+    return (result["start_stop"].id, result["end_stop"].id, route.total_cost, route.total_time,
+            route.total_distance, route.transfer_count,
+            [(segment.from_stop.id, segment.to_stop.id) for segment in route.segments])
+
+def random_jobs(network, count, seed=0):
+    rnd = random.Random(seed)
+    n = network.num_stops
+    # None işler boş yol döndürür ve sıradaki yerini korur
+    return [None if i % 9 == 4 else (rnd.randrange(n), rnd.randrange(n)) for i in range(count)]
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_map_paths_matches_serial_search(generated_path, processes):
+    _, network, _ = load_stops(generated_path)
+    jobs = random_jobs(network, 60)
+    with ParallelRouter(network, processes=processes, chunk_size=7) as router:
+        paths = list(router.map_paths(jobs))
+    assert paths == [shortest_path(network, *job) if job is not None else [] for job in jobs]
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_map_trees_matches_tree_values(generated_path, processes):
+    _, network, _ = load_stops(generated_path)
+    sources = list(range(0, network.num_stops, 37))
+    targets = list(range(3, network.num_stops, 11))
+    with ParallelRouter(network, processes=processes, chunk_size=2) as router:
+        trees = list(router.map_trees(sources, targets))
+    assert trees == [tree_values(network, source, targets) for source in sources]
+
+def test_router_removes_shared_file(generated_path):
+    _, network, _ = load_stops(generated_path)
+    router = ParallelRouter(network, processes=2)
+    router.start()
+    path = router.path
+    assert path is not None
+    router.close()
+    assert not os.path.exists(path)
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_find_routes_matches_plan_route(generated_path, compact):
+    system = TransportationSystem(generated_path, cache_size=0)
+    rnd = random.Random(4)
+    lats, lons = system.network.lats, system.network.lons
+    pairs = [(Location(rnd.uniform(min(lats), max(lats)), rnd.uniform(min(lons), max(lons))),
+              Location(rnd.uniform(min(lats), max(lats)), rnd.uniform(min(lons), max(lons))))
+             for _ in range(25)]
+    for passenger in (GeneralPassenger(), StudentPassenger()):
+        results = list(system.find_routes(pairs, passenger, processes=2, chunk_size=4, compact=compact))
+        assert [summary(result) for result in results] == \
+            [summary(system.plan_route(start, end, passenger)) for start, end in pairs]
@@ -0,0 +1,72 @@
+import random
+
+from models import GeneralPassenger, Location, StudentPassenger
+from routing import load_stops, pareto_paths, shortest_path
+from transportation_system import TransportationSystem
+
+def dominates(a, b):
+    return a[0] <= b[0] and a[1] <= b[1] and a[2] <= b[2] and a != b
+
+def random_pairs(network, count, seed=0):
+    rnd = random.Random(seed)
+    return [(rnd.randrange(network.num_stops), rnd.randrange(network.num_stops)) for _ in range(count)]
+
+def test_pareto_paths_are_valid_and_non_dominated(network_path):
+    _, network, _ = load_stops(network_path)
+    for source, target in random_pairs(network, 60):
+        paths = pareto_paths(network, source, target, max_labels=64)
+        labels = [(path.cost, path.time, path.transfers) for path in paths]
+        cheapest = shortest_path(network, source, target)
+        if not cheapest and source != target:
+            assert paths == []  # Ulaşılamayan hedef
+            continue
+        assert not any(dominates(a, b) for a in labels for b in labels)
+
+        for path in paths:
+            # Kenarlar kaynaktan hedefe kesintisiz bir yol oluşturur ve toplamlar tutar
+            current = source
+            for edge in path.edges:
+                assert network.sources[edge] == current
+                current = network.targets[edge]
+            assert current == target
+            assert path.cost == sum(network.costs[edge] for edge in path.edges)
+            assert path.time == sum(network.times[edge] for edge in path.edges)
+            assert path.transfers == sum(network.transfers[edge] for edge in path.edges)
+
+        # En ucuz seçenek Dijkstra ile aynı ücrettedir
+        assert min(label[0] for label in labels) == sum(network.costs[edge] for edge in cheapest)
+
+def test_pareto_paths_include_fastest_route(generated_path):
+    _, network, _ = load_stops(generated_path)
+    _, by_time, _ = load_stops(generated_path)
+    # Ücreti süre olan ağda Dijkstra en hızlı yolu verir
+    by_time.costs[:] = by_time.times
+    for source, target in random_pairs(network, 60, seed=1):
+        fastest = shortest_path(by_time, source, target)
+        paths = pareto_paths(network, source, target, max_labels=64)
+        if not fastest and source != target:
+            assert paths == []
+            continue
+        assert min(path.time for path in paths) == sum(network.times[edge] for edge in fastest)
+
+def test_route_options_are_sorted_trade_offs(network_path):
+    system = TransportationSystem(network_path)
+    rnd = random.Random(3)
+    lats, lons = system.network.lats, system.network.lons
+    for passenger in (GeneralPassenger(), StudentPassenger()):
+        for _ in range(20):
+            start_location = Location(rnd.uniform(min(lats), max(lats)), rnd.uniform(min(lons), max(lons)))
+            end_location = Location(rnd.uniform(min(lats), max(lats)), rnd.uniform(min(lons), max(lons)))
+            options = system.find_route_options(start_location, end_location, passenger)
+            keys = [(option.total_cost, option.total_time, option.transfer_count) for option in options]
+            assert keys == sorted(keys)
+            assert not any(dominates(a, b) for a in keys for b in keys)
+            planned = system.plan_route(start_location, end_location, passenger)
+            route = planned["route"]
+            if not options:
+                assert not route.segments  # Duraklar arasında yol yok
+                continue
+            # plan_route direkt bağlantıyı tercih eder; yoksa en ucuz seçenekle aynıdır
+            assert keys[0][0] <= route.total_cost
+            if system.direct_route(planned["start_stop"], planned["end_stop"]) is None:
+                assert keys[0][0] == route.total_cost
@@ -0,0 +1,64 @@
+import random
+
+import pytest
+
+from models import CashPayment, CompactRoute, ElderlyPassenger, GeneralPassenger, Location, StudentPassenger
+from transportation_system import TransportationSystem
+
+def random_pairs(system, count, seed=0):
+    rnd = random.Random(seed)
+    lats, lons = system.network.lats, system.network.lons
+    def point():
+        return Location(rnd.uniform(min(lats), max(lats)), rnd.uniform(min(lons), max(lons)))
+    return [(point(), point()) for _ in range(count)]
+
+def segment_rows(route):
+    return [(segment.from_stop.id, segment.to_stop.id, segment.vehicle.__class__, segment.distance,
+             segment.cost, segment.time, segment.is_transfer) for segment in route.segments]
+
+@pytest.mark.parametrize("passenger", [GeneralPassenger(), StudentPassenger(), ElderlyPassenger()],
+                         ids=lambda passenger: passenger.passenger_type.value)
+def test_compact_route_matches_full_result(network_path, passenger):
+    system = TransportationSystem(network_path)
+    for start, end in random_pairs(system, 30):
+        full = system.plan_route(start, end, passenger)
+        compact = system.plan_route(start, end, passenger, compact=True)
+        assert isinstance(compact, CompactRoute)
+        route = full["route"]
+        assert compact.total_cost == pytest.approx(route.total_cost)
+        assert compact.total_time == pytest.approx(route.total_time)
+        assert compact.total_distance == pytest.approx(route.total_distance)
+        assert (compact.requires_initial_taxi, compact.requires_final_taxi, compact.transfer_count) == \
+            (route.requires_initial_taxi, route.requires_final_taxi, route.transfer_count)
+
+        # Sözlük biçimi find_route sonucuyla aynı anahtarları ve değerleri verir
+        result = compact.to_dict()
+        assert result["start_stop"].id == full["start_stop"].id
+        assert result["end_stop"].id == full["end_stop"].id
+        assert result["start_access"] == full["start_access"]
+        assert result["end_access"] == full["end_access"]
+        assert segment_rows(result["route"]) == segment_rows(route)
+        stops = [system.stop_at(index).id for index in compact.stop_indices]
+        if route.segments:
+            assert stops == [route.segments[0].from_stop.id] + [segment.to_stop.id for segment in route.segments]
+
+def test_compact_route_is_lazy(duraklar_path):
+    system = TransportationSystem(duraklar_path)
+    start, end = random_pairs(system, 1, seed=1)[0]
+    compact = system.plan_route(start, end, GeneralPassenger(), compact=True)
+    assert (compact._segments, compact._start_access, compact._end_access, compact._route) == (None,) * 4
+
+    segments = compact.segments
+    assert compact.segments is segments
+    assert compact.route is compact.route and compact.route.segments is segments
+    assert compact["start_access"] is compact.start_access
+    with pytest.raises(KeyError):
+        compact["total_cost"]
+
+def test_compact_find_route_charges_same_fare(duraklar_path):
+    system = TransportationSystem(duraklar_path)
+    for start, end in random_pairs(system, 10, seed=2):
+        full_payment, compact_payment = CashPayment(1000.0), CashPayment(1000.0)
+        system.find_route(start, end, StudentPassenger(), full_payment)
+        system.find_route(start, end, StudentPassenger(), compact_payment, compact=True)
+        assert compact_payment.get_balance() == pytest.approx(full_payment.get_balance())
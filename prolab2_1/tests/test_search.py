@@ -0,0 +1,61 @@
+import math
+import random
+
+import pytest
+
+from routing import SearchStrategy, astar_path, bidirectional_path, compile_stops, find_path, load_stops, shortest_path
+
+def record(stop_id, lat, lon, next_stops, transfer=None, stop_type="bus"):
+    return {"id": stop_id, "name": stop_id, "type": stop_type, "lat": lat, "lon": lon,
+            "sonDurak": False, "transfer": transfer,
+            "nextStops": [{"stopId": target, "mesafe": distance, "sure": time, "ucret": cost}
+                          for target, cost, time, distance in next_stops]}
+
+def tie_network():
+    # a -> d üç yoldan eşit ücretle gidilir: b üzerinden yavaş, c ve e üzerinden
+    # eşit sürede; e yolu daha kısadır. Beklenen sıra (ücret, süre, mesafe)
+    _, network = compile_stops([
+        record("a", 40.70, 29.90, [("b", 1.0, 5.0, 1.0), ("c", 1.0, 2.0, 1.0), ("e", 1.0, 2.0, 0.5)]),
+        record("b", 40.71, 29.91, [("d", 1.0, 1.0, 1.0)]),
+        record("c", 40.71, 29.89, [("d", 1.0, 3.0, 1.0)]),
+        record("e", 40.72, 29.90, [("d", 1.0, 3.0, 1.0)]),
+        record("d", 40.73, 29.90, []),
+    ])
+    return network
+
+STRATEGIES = [astar_path, bidirectional_path]
+
+@pytest.mark.parametrize("search", [shortest_path] + STRATEGIES)
+def test_ties_prefer_faster_then_shorter(search):
+    network = tie_network()
+    edges = search(network, network.index["a"], network.index["d"])
+    assert [network.stop_ids[network.targets[edge]] for edge in edges] == ["e", "d"]
+
+@pytest.mark.parametrize("search", STRATEGIES)
+def test_strategies_return_dijkstra_route(network_path, search):
+    _, network, _ = load_stops(network_path)
+    n = network.num_stops
+    rnd = random.Random(5)
+    pairs = [(s, t) for s in range(n) for t in range(n)] if n <= 20 else \
+        [(rnd.randrange(n), rnd.randrange(n)) for _ in range(400)]
+    for source, target in pairs:
+        assert search(network, source, target) == shortest_path(network, source, target), (source, target)
+
+@pytest.mark.parametrize("strategy", [SearchStrategy.DIJKSTRA, SearchStrategy.ASTAR,
+                                      SearchStrategy.BIDIRECTIONAL])
+def test_closed_edges_are_not_used(generated_path, strategy):
+    _, network, _ = load_stops(generated_path)
+    rnd = random.Random(2)
+    closed = set(rnd.sample(range(network.num_edges), network.num_edges // 5))
+    for edge in closed:
+        network.costs[edge] = network.times[edge] = math.inf
+    for _ in range(100):
+        source, target = rnd.randrange(network.num_stops), rnd.randrange(network.num_stops)
+        edges = find_path(network, source, target, strategy)
+        assert not closed.intersection(edges)
+        assert edges == shortest_path(network, source, target)
+
+def test_ch_strategy_requires_hierarchy(duraklar_path):
+    _, network, _ = load_stops(duraklar_path)
+    with pytest.raises(ValueError):
+        find_path(network, 0, 1, SearchStrategy.CONTRACTION_HIERARCHY)
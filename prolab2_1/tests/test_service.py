@@ -0,0 +1,164 @@
+import asyncio
+import json
+import time
+
+import pytest
+
+from models import GeneralPassenger, Location, StudentPassenger
+from service import RoutingService
+from transportation_system import TransportationSystem
+
+async def request(port, method, path, body=None):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    data = b"" if body is None else json.dumps(body).encode("utf-8")
+    writer.write((f"{method} {path} HTTP/1.1\r\nHost: test\r\nConnection: close\r\n"
+                  f"Content-Length: {len(data)}\r\n\r\n").encode("latin-1") + data)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, payload = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(payload)
+
+def serve(system, scenario, **options):
+    """Servisi rastgele bir portta başlat, senaryoyu çalıştır ve kapat"""
+    async def main():
+        service = RoutingService(system, port=0, **options)
+        await service.start()
+        try:
+            return await scenario(service)
+        finally:
+            await service.shutdown()
+    return asyncio.run(main())
+
+def corners(system):
+    lats, lons = system.network.lats, system.network.lons
+    return Location(min(lats), min(lons)), Location(max(lats), max(lons))
+
+def point(location):
+    return {"lat": location.lat, "lon": location.lon}
+
+def test_route_matches_plan_route(network_path):
+    system = TransportationSystem(network_path)
+    start, end = corners(system)
+
+    async def scenario(service):
+        return await request(service.port, "POST", "/route",
+                             {"start": point(start), "end": point(end), "passenger": "student"})
+    status, payload = serve(system, scenario)
+    assert status == 200
+    expected = system.plan_route(start, end, StudentPassenger(), compact=True)
+    assert payload["total_cost"] == pytest.approx(expected.total_cost)
+    assert payload["total_time"] == pytest.approx(expected.total_time)
+    assert payload["start_stop"]["id"] == expected.start_stop.id
+    assert [(segment["from"], segment["to"]) for segment in payload["segments"]] == \
+        [(segment.from_stop.id, segment.to_stop.id) for segment in expected.segments]
+
+def test_batch_and_nearest(network_path):
+    system = TransportationSystem(network_path)
+    start, end = corners(system)
+    pairs = [{"start": point(start), "end": point(end)}, {"start": point(end), "end": point(start)}]
+
+    async def scenario(service):
+        batch = await request(service.port, "POST", "/batch", {"pairs": pairs})
+        routes = [await request(service.port, "POST", "/route", dict(pair, segments=False))
+                  for pair in pairs]
+        nearest = await request(service.port, "GET", f"/nearest?lat={start.lat}&lon={start.lon}&k=3")
+        return batch, routes, nearest
+    (status, batch), routes, (nearest_status, nearest) = serve(system, scenario)
+    assert status == 200 and nearest_status == 200
+    assert batch["results"] == [payload for _, payload in routes]
+    assert [(stop["id"], stop["distance"]) for stop in nearest["stops"]] == \
+        [(stop.id, distance) for stop, distance in system.find_nearest_stops(start, 3)]
+
+@pytest.mark.parametrize("method, path, body, status", [
+    ("POST", "/route", {"start": {"lat": "x"}, "end": {"lat": 0, "lon": 0}}, 400),
+    ("POST", "/route", {"start": {"lat": 0, "lon": 0}, "end": {"lat": 0, "lon": 0},
+                        "passenger": "pilot"}, 400),
+    ("POST", "/batch", {"pairs": "yok"}, 400),
+    ("POST", "/updates", {"updates": [{"action": "yok"}]}, 400),
+    ("GET", "/nearest?lat=a&lon=b", None, 400),
+    ("GET", "/route", None, 405),
+    ("GET", "/yok", None, 404),
+])
+def test_bad_requests(duraklar_path, method, path, body, status):
+    system = TransportationSystem(duraklar_path)
+
+    async def scenario(service):
+        return await request(service.port, method, path, body)
+    response_status, payload = serve(system, scenario)
+    assert response_status == status and "error" in payload
+
+def test_cache_misses_counted_once(duraklar_path):
+    system = TransportationSystem(duraklar_path)
+    start, end = corners(system)
+    body = {"start": point(start), "end": point(end)}
+
+    async def scenario(service):
+        await request(service.port, "POST", "/route", body)
+        first = (await request(service.port, "GET", "/stats"))[1]["cache"]
+        await request(service.port, "POST", "/route", dict(body, passenger="elderly"))
+        second = (await request(service.port, "GET", "/stats"))[1]["cache"]
+        return first, second
+    first, second = serve(system, scenario)
+    assert (first["hits"], first["misses"], first["size"]) == (0, 1, 1)
+    assert (second["hits"], second["misses"]) == (1, 1)
+
+def test_concurrent_identical_searches_coalesce(duraklar_path, monkeypatch):
+    system = TransportationSystem(duraklar_path, cache_size=0)
+    start, end = corners(system)
+    search = system.search_stop_path
+    calls = []
+
+    def slow_search(start_stop, end_stop):
+        calls.append((start_stop.id, end_stop.id))
+        time.sleep(0.2)  # İkinci istek arama sürerken gelsin
+        return search(start_stop, end_stop)
+    monkeypatch.setattr(system, "search_stop_path", slow_search)
+
+    async def scenario(service):
+        body = {"start": point(start), "end": point(end)}
+        results = await asyncio.gather(request(service.port, "POST", "/route", body),
+                                       request(service.port, "POST", "/route", body))
+        return results, service.coalesced
+    (first, second), coalesced = serve(system, scenario)
+    assert first == second and first[0] == 200
+    assert coalesced == 1 and len(calls) == 1
+
+def test_updates_apply_in_order(duraklar_path):
+    system = TransportationSystem(duraklar_path)
+    network = system.network
+    edge = next(edge for edge in range(network.num_edges) if not network.transfers[edge])
+    source, target = network.stop_ids[network.sources[edge]], network.stop_ids[network.targets[edge]]
+
+    async def scenario(service):
+        return await request(service.port, "POST", "/updates", {"updates": [
+            {"action": "update_edge", "from": source, "to": target, "sure": 99},
+            {"action": "update_edge", "from": source, "to": "yok", "sure": 1},
+        ]})
+    status, payload = serve(system, scenario)
+    # Hatalı güncelleme 400 döndürür; ondan önceki uygulanmış kalır
+    assert status == 400
+    assert network.times[edge] == 99.0 and system.network_version == 1
+
+def test_updates_reopen_closed_edges_and_stops(duraklar_path):
+    system = TransportationSystem(duraklar_path)
+    network = system.network
+    edge = next(edge for edge in range(network.num_edges) if not network.transfers[edge])
+    source, target = network.stop_ids[network.sources[edge]], network.stop_ids[network.targets[edge]]
+    costs, times = list(network.costs), list(network.times)
+
+    async def scenario(service):
+        closed = await request(service.port, "POST", "/updates", {"updates": [
+            {"action": "disable_edge", "from": source, "to": target},
+            {"action": "close_stop", "stop": target},
+        ]})
+        reopened = await request(service.port, "POST", "/updates", {"updates": [
+            {"action": "reopen_stop", "stop": target},
+            {"action": "enable_edge", "from": source, "to": target},
+        ]})
+        return closed, reopened
+    closed, reopened = serve(system, scenario)
+    assert closed[0] == reopened[0] == 200
+    assert reopened[1]["version"] == 4
+    assert list(network.costs) == costs and list(network.times) == times
+    assert not system.closed_stops
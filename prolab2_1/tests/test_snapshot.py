@@ -0,0 +1,58 @@
+import os
+import shutil
+
+from models import GeneralPassenger, Location
+from routing import CompiledNetwork, NetworkSnapshot, load_stops
+from transportation_system import TransportationSystem
+
+def stop_rows(stops):
+    return [(stop.id, stop.name, stop.type, stop.lat, stop.lon, stop.son_durak,
+             stop.next_stops, stop.transfer) for stop in stops.values()]
+
+def test_snapshot_round_trip(tmp_path, network_path):
+    table, network, digest = load_stops(network_path)
+    path = str(tmp_path / "network.snapshot.bin")
+    NetworkSnapshot.build(table, network, digest).save(path, network_path)
+    assert NetworkSnapshot.is_current(path, network_path)
+
+    snapshot = NetworkSnapshot.load(path)
+    assert snapshot.digest == digest
+    assert snapshot.network.stop_ids == network.stop_ids
+    for name in CompiledNetwork.ARRAY_FIELDS:
+        assert list(getattr(snapshot.network, name)) == list(getattr(network, name)), name
+    assert stop_rows(snapshot.table) == stop_rows(table)
+
+def test_system_opens_snapshot(tmp_path, network_path):
+    path = str(tmp_path / "network.snapshot.bin")
+    fresh = TransportationSystem(network_path, snapshot=True, snapshot_path=path)
+    assert os.path.exists(path) and getattr(fresh.network, "mapping", None) is None
+    mapped = TransportationSystem(network_path, snapshot=True, snapshot_path=path)
+    assert mapped.network.mapping is not None
+    assert mapped.source_digest == fresh.source_digest
+
+    lats, lons = fresh.network.lats, fresh.network.lons
+    start, end = Location(min(lats), min(lons)), Location(max(lats), max(lons))
+    expected = fresh.plan_route(start, end, GeneralPassenger())["route"]
+    route = mapped.plan_route(start, end, GeneralPassenger())["route"]
+    assert (route.total_cost, route.total_time, route.total_distance) == \
+        (expected.total_cost, expected.total_time, expected.total_distance)
+
+    # Eşlenmiş diziler salt okunur; canlı güncelleme kopyaya yazar
+    mapped.apply_edge_changes([(0, 99.0, None)])
+    assert mapped.network.costs[0] == 99.0
+    assert NetworkSnapshot.load(path).network.costs[0] == fresh.network.costs[0]
+
+def test_changed_source_rebuilds_snapshot(tmp_path, duraklar_path):
+    source = str(tmp_path / "duraklar.json")
+    shutil.copy(duraklar_path, source)
+    path = source + ".snapshot.bin"
+    TransportationSystem(source, snapshot=True)
+    assert NetworkSnapshot.is_current(path, source)
+
+    # Kaynak dosya değişince (boyut ya da zaman) anlık görüntü eskir ve yeniden yazılır
+    with open(source, "a", encoding="utf-8") as file:
+        file.write("\n")
+    assert not NetworkSnapshot.is_current(path, source)
+    system = TransportationSystem(source, snapshot=True)
+    assert getattr(system.network, "mapping", None) is None
+    assert NetworkSnapshot.is_current(path, source)
@@ -0,0 +1,58 @@
+import random
+
+import pytest
+
+from models import GeneralPassenger, Location, haversine
+from routing import SpatialIndex, load_stops
+from transportation_system import TransportationSystem
+
+def brute_force(network, location):
+    return sorted((haversine(location.lat, location.lon, network.lats[i], network.lons[i]), i)
+                  for i in range(network.num_stops))
+
+def random_points(network, count, seed=0):
+    rnd = random.Random(seed)
+    lats, lons = network.lats, network.lons
+    # Ağın biraz dışına taşan noktalar da sorgulanır
+    return [Location(rnd.uniform(min(lats) - 0.05, max(lats) + 0.05),
+                     rnd.uniform(min(lons) - 0.05, max(lons) + 0.05)) for _ in range(count)]
+
+def test_queries_match_linear_scan(network_path):
+    _, network, _ = load_stops(network_path)
+    index = SpatialIndex(network.lats, network.lons)
+    for location in random_points(network, 50):
+        expected = brute_force(network, location)
+        assert index.nearest(location) == (expected[0][1], expected[0][0])
+        assert [i for i, _ in index.k_nearest(location, 5)] == [i for _, i in expected[:5]]
+        radius = expected[min(7, len(expected) - 1)][0]
+        assert [i for i, _ in index.within_radius(location, radius)] == \
+            [i for distance, i in expected if distance <= radius]
+
+def test_removed_stops_are_skipped(duraklar_path):
+    _, network, _ = load_stops(duraklar_path)
+    index = SpatialIndex(network.lats, network.lons)
+    location = Location(network.lats[3], network.lons[3])
+    assert index.nearest(location)[0] == 3
+    index.remove(3)
+    assert index.nearest(location)[0] != 3
+    assert 3 not in [i for i, _ in index.k_nearest(location, network.num_stops)]
+
+def test_empty_index():
+    index = SpatialIndex([], [])
+    assert index.nearest(Location(40.0, 30.0)) == (-1, float('inf'))
+    assert index.k_nearest(Location(40.0, 30.0), 3) == []
+    assert index.within_radius(Location(40.0, 30.0), 10) == []
+
+def test_nearest_stop_raises_when_all_stops_closed(duraklar_path):
+    system = TransportationSystem(duraklar_path)
+    location = Location(40.76, 29.94)
+    for stop_id in list(system.stops)[:-1]:
+        system.close_stop(stop_id)
+    last = list(system.stops)[-1]
+    assert system.find_nearest_stop(location)[0].id == last
+
+    system.close_stop(last)
+    with pytest.raises(ValueError, match="tüm duraklar kapalı"):
+        system.find_nearest_stop(location)
+    with pytest.raises(ValueError, match="tüm duraklar kapalı"):
+        system.plan_route(location, Location(40.77, 29.95), GeneralPassenger())
@@ -0,0 +1,66 @@
+import json
+import math
+
+import pytest
+
+from models import StopTable, StopView
+from routing import load_stops
+
+def raw_stops(path):
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)["duraklar"]
+
+def test_views_match_raw_records(network_path):
+    table, _, _ = load_stops(network_path)
+    records = raw_stops(network_path)
+    assert list(table) == [record["id"] for record in records]
+    for record in records:
+        stop = table[record["id"]]
+        assert isinstance(stop, StopView)
+        assert (stop.name, stop.type, stop.lat, stop.lon, stop.son_durak) == \
+            (record["name"], record["type"], record["lat"], record["lon"], record["sonDurak"])
+        assert stop.next_stops == record["nextStops"]
+        assert stop.transfer == record["transfer"]
+
+def test_strings_are_interned(network_path):
+    table, _, _ = load_stops(network_path)
+    # Tür adları ve tekrar eden metinler tabloda bir kez tutulur
+    assert len(table.strings) == len(set(table.strings))
+    assert len({table.type_refs[i] for i in range(len(table))}) == \
+        len({table.stop(i).type for i in range(len(table))})
+
+def test_views_are_cached_and_comparable(duraklar_path):
+    table, _, _ = load_stops(duraklar_path)
+    stop_id = table.stop_ids[0]
+    assert table[stop_id] is table[stop_id] is table.stop(0)
+    other, _, _ = load_stops(duraklar_path)
+    # Görünümler tablo ve indeksle eşitlenir
+    assert table[stop_id] != other[stop_id]
+    assert len({table.stop(i) for i in range(len(table))} | {table.stop(0)}) == len(table)
+    assert stop_id in table and "yok" not in table
+    with pytest.raises(KeyError):
+        table["yok"]
+
+def test_edges_are_read_live(duraklar_path):
+    table, network, _ = load_stops(duraklar_path)
+    index = next(i for i in range(len(table)) if table.stop(i).next_stops and table.stop(i).transfer)
+    stop = table.stop(index)
+    edges = range(network.offsets[index], network.offsets[index + 1])
+    line = next(edge for edge in edges if not network.transfers[edge])
+    transfer = next(edge for edge in edges if network.transfers[edge])
+
+    # Önbellekteki görünüm ağdaki güncel değerleri gösterir
+    network.costs[line] = 42.0
+    assert stop.next_stops[0]["ucret"] == 42.0
+    network.costs[line] = math.inf
+    assert all(entry["stopId"] != network.stop_ids[network.targets[line]] for entry in stop.next_stops)
+    network.costs[transfer] = math.inf
+    assert stop.transfer is None
+
+def test_duplicate_id_raises():
+    table = StopTable()
+    assert table.add("a", "A", "bus", 40.0, 29.0, False) == 0
+    with pytest.raises(ValueError, match="Yinelenen"):
+        table.add("a", "A2", "bus", 40.1, 29.1, True)
+    assert len(table) == 1 and table["a"].name == "A"
+    assert table["a"].next_stops == [] and table["a"].transfer is None
@@ -0,0 +1,52 @@
+import math
+import random
+
+from routing import RouteTable, load_stops, shortest_path, shortest_path_tree
+from transportation_system import TransportationSystem
+
+def sample_pairs(n, count=400, seed=0):
+    if n * n <= count:
+        return [(source, target) for source in range(n) for target in range(n)]
+    rnd = random.Random(seed)
+    return [(rnd.randrange(n), rnd.randrange(n)) for _ in range(count)]
+
+def test_table_matches_dijkstra(network_path):
+    _, network, digest = load_stops(network_path)
+    table = RouteTable.build(network, digest)
+    for source, target in sample_pairs(network.num_stops):
+        assert table.path(source, target) == shortest_path(network, source, target)
+        costs, times, distances, _ = shortest_path_tree(network, source)
+        assert table.lookup(source, target) == (costs[target], times[target], distances[target])
+
+def test_open_saves_and_maps_table(tmp_path, duraklar_path):
+    _, network, digest = load_stops(duraklar_path)
+    path = str(tmp_path / "routes.bin")
+    built = RouteTable.open(path, network, digest)
+    loaded = RouteTable.open(path, network, digest)
+    assert loaded.mapping is not None
+    assert list(loaded.costs) == list(built.costs)
+    assert list(loaded.predecessors) == list(built.predecessors)
+
+    # Ağ özeti değişince tablo yeniden üretilir
+    rebuilt = RouteTable.open(path, network, "başka-özet")
+    assert rebuilt.digest == "başka-özet"
+
+def test_repair_matches_rebuilt_table(tmp_path, generated_path):
+    system = TransportationSystem(generated_path, cache_size=0)
+    system.enable_route_table(str(tmp_path / "routes.bin"))
+    network = system.network
+    rnd = random.Random(1)
+    for step in range(12):
+        edge = rnd.randrange(network.num_edges)
+        if step % 3 == 0:
+            summary = system.apply_edge_changes([(edge, math.inf, math.inf)])
+        elif step % 3 == 1:
+            summary = system.apply_edge_changes([(edge, network.costs[edge] / 2, None)])
+        else:
+            summary = system.apply_edge_changes([(edge, None, network.times[edge] + 5)])
+        assert summary["table_rows"] >= 0
+
+        expected = RouteTable.build(network, system.source_digest)
+        assert list(system.route_table.costs) == list(expected.costs)
+        assert list(system.route_table.times) == list(expected.times)
+        assert list(system.route_table.predecessors) == list(expected.predecessors)
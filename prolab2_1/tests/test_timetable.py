@@ -0,0 +1,146 @@
+import math
+import os
+import random
+
+import pytest
+
+from models import GeneralPassenger
+from routing import Timetable, format_clock, load_stops, parse_clock
+from transportation_system import TransportationSystem
+
+SEFERLER = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Seferler.json")
+
+FIELDS = ("departures", "arrivals", "edges", "trips", "trip_offsets", "trip_order", "trip_legs")
+
+def brute_force_arrival(timetable, source, target, departure):
+    """Bağlantılar ve aktarmalar üzerinde zamana bağlı Dijkstra (ayrı ayrı denetim için)"""
+    network = timetable.network
+    by_edge = {}
+    for connection in range(timetable.num_connections):
+        by_edge.setdefault(timetable.edges[connection], []).append(
+            (timetable.departures[connection], timetable.arrivals[connection]))
+    earliest = {source: departure}
+    settled = set()
+    while True:
+        pending = [(time, stop) for stop, time in earliest.items() if stop not in settled]
+        if not pending:
+            return math.inf
+        time, stop = min(pending)
+        if stop == target:
+            return time
+        settled.add(stop)
+        for edge in range(network.offsets[stop], network.offsets[stop + 1]):
+            if network.times[edge] == math.inf:
+                continue
+            if network.transfers[edge]:
+                arrival = time + network.times[edge]
+            else:
+                arrival = min((arr for dep, arr in by_edge.get(edge, ()) if dep >= time), default=math.inf)
+            other = network.targets[edge]
+            if arrival < earliest.get(other, math.inf):
+                earliest[other] = arrival
+
+def test_clock_parsing():
+    assert parse_clock("06:05") == 365.0 and parse_clock(90) == 90.0
+    assert parse_clock("24:30") == 1470.0
+    assert format_clock(365.4) == "06:05" and format_clock(1470) == "24:30"
+    with pytest.raises(ValueError):
+        parse_clock("6.05")
+
+def test_invalid_lines_raise(duraklar_path):
+    _, network, _ = load_stops(duraklar_path)
+    base = {"id": "X", "duraklar": ["bus_otogar", "bus_sekapark"], "ilkSefer": "06:00",
+            "sonSefer": "07:00", "sikilik": 10}
+    for change, message in (({"duraklar": ["bus_otogar", "yok"]}, "bilinmeyen durak"),
+                            ({"duraklar": ["bus_otogar", "bus_umuttepe"]}, "ağda yok"),
+                            ({"duraklar": ["bus_otogar"]}, "en az iki"),
+                            ({"sikilik": 0}, "pozitif"),
+                            ({"sonSefer": "05:00"}, "önce olamaz")):
+        with pytest.raises(ValueError, match=message):
+            Timetable.from_lines(network, [dict(base, **change)])
+
+def test_earliest_arrival_matches_brute_force(duraklar_path):
+    _, network, _ = load_stops(duraklar_path)
+    timetable = Timetable.load(SEFERLER, network)
+    rnd = random.Random(0)
+    n = network.num_stops
+    for _ in range(150):
+        source, target = rnd.randrange(n), rnd.randrange(n)
+        departure = rnd.uniform(300, 1450)
+        steps = timetable.earliest_arrival(source, target, departure)
+        expected = brute_force_arrival(timetable, source, target, departure)
+        if steps is None:
+            assert expected == math.inf
+            continue
+        if source == target:
+            assert steps == []
+            continue
+        # Adımlar kesintisiz ve zamanca tutarlıdır; son varış en erken varıştır
+        stop, time = source, departure
+        for edge, step_departure, step_arrival in steps:
+            assert network.sources[edge] == stop and step_departure >= time - 1e-9
+            assert step_arrival >= step_departure
+            stop, time = network.targets[edge], step_arrival
+        assert stop == target and time == pytest.approx(expected)
+
+def test_delay_shifts_downstream_arrivals(duraklar_path):
+    system = TransportationSystem(duraklar_path)
+    timetable = system.load_timetable(SEFERLER)
+    network = system.network
+    edge = system.edge_index("bus_sekapark", "bus_yahyakaptan")  # B1'in ikinci bağlantısı
+    before = {(timetable.trips[c], timetable.trip_legs[c]): (timetable.departures[c], timetable.arrivals[c])
+              for c in range(timetable.num_connections)}
+    delayed_trips = {timetable.trips[c] for c in range(timetable.num_connections) if timetable.edges[c] == edge}
+
+    summary = system.update_edge("bus_sekapark", "bus_yahyakaptan", sure=network.times[edge] + 7)
+    assert summary["timetable_trips"] == len(delayed_trips)
+    for c in range(timetable.num_connections):
+        trip, leg = timetable.trips[c], timetable.trip_legs[c]
+        departure, arrival = before[trip, leg]
+        if trip not in delayed_trips or leg == 0:
+            assert (timetable.departures[c], timetable.arrivals[c]) == (departure, arrival)
+        elif leg == 1:
+            assert (timetable.departures[c], timetable.arrivals[c]) == (departure, arrival + 7)
+        else:
+            assert (timetable.departures[c], timetable.arrivals[c]) == (departure + 7, arrival + 7)
+
+    # Güncellenen sefer dizisi güncel ağdan baştan yüklenenle aynıdır
+    fresh = Timetable.load(SEFERLER, network)
+    for name in FIELDS:
+        assert list(getattr(timetable, name)) == list(getattr(fresh, name)), name
+
+def test_closed_edge_keeps_planned_duration(duraklar_path):
+    system = TransportationSystem(duraklar_path)
+    timetable = system.load_timetable(SEFERLER)
+    edge = system.edge_index("bus_sekapark", "bus_yahyakaptan")
+    durations = {c: timetable.arrivals[c] - timetable.departures[c] for c in range(timetable.num_connections)}
+    planned = list(zip(timetable.departures, timetable.arrivals))
+
+    system.disable_edge("bus_sekapark", "bus_yahyakaptan")
+    assert list(zip(timetable.departures, timetable.arrivals)) == planned
+    assert all(timetable.arrivals[c] - timetable.departures[c] == durations[c]
+               for c in range(timetable.num_connections))
+    source, target = system.network.index["bus_otogar"], system.network.index["bus_umuttepe"]
+    # 08:00 B1 seferi kapalı bağlantıdan geçer; yolcu o seferde oturarak ilerleyemez
+    for departure in ("08:00", "08:01", "12:00"):
+        steps = timetable.earliest_arrival(source, target, parse_clock(departure))
+        assert steps is not None and edge not in [step[0] for step in steps]
+        assert steps[-1][2] == pytest.approx(brute_force_arrival(timetable, source, target,
+                                                                 parse_clock(departure)))
+
+def test_plan_timetable_route(duraklar_path):
+    system = TransportationSystem(duraklar_path)
+    with pytest.raises(ValueError, match="load_timetable"):
+        system.plan_timetable_route(system.stop_at(0), system.stop_at(3), GeneralPassenger(), "08:00")
+    system.load_timetable(SEFERLER)
+    start = system.find_stop_by_name("Otogar (Bus)")
+    end = system.find_stop_by_name("Umuttepe (Bus)")
+    result = system.plan_timetable_route(start, end, GeneralPassenger(), "08:01")
+    route = result["route"]
+    assert result["departure_time"] == parse_clock("08:01")
+    assert result["arrival_time"] == result["departure_time"] + route.total_time
+    assert route.segments and all(segment.wait_time >= 0 for segment in route.segments)
+    # Duraktan duraka: toplam süre parçaların bekleme ve yolculuk sürelerinin toplamı
+    assert route.total_time == pytest.approx(sum(segment.wait_time + segment.time
+                                                 for segment in route.segments))
+    assert system.plan_timetable_route(start, end, GeneralPassenger(), "23:59") is None
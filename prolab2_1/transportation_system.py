@@ -1,59 +1,471 @@
 from abc import ABC, abstractmethod
+import functools
 import math
-from typing import List, Dict, Optional, Tuple, Set
+from typing import List, Dict, Optional, Tuple, Set, Iterable, Iterator
+from collections import deque
 import json
+import hashlib
+from array import array
+import logging
 from dataclasses import dataclass
-from heapq import heappush, heappop
+import numpy as np
 from enum import Enum
 from models import (
     Passenger, PassengerType, GeneralPassenger, StudentPassenger, ElderlyPassenger,
     PaymentMethod, CashPayment, CreditCardPayment, KentCardPayment,
     Vehicle, Bus, Tram, Taxi,
-    Location, Stop,
-    RouteSegment, RouteOption
+    Location, Stop, haversine_matrix, coordinate_arrays,
+    RouteSegment, RouteOption, ReachableStop, StopPath, CompactRoute
+)
+from routing import (
+    SpatialIndex, ParallelRouter, RouteTable, RouteCache, ContractionHierarchy,
+    NetworkSnapshot, NameIndex, SearchStrategy, Tracer, NULL_TRACER, find_path, pareto_paths, compile_stops, load_stops,
+    ReadWriteLock, Timetable, parse_clock, shortest_path_tree, reverse_path_costs, isochrone_collection,
+    VEHICLE_BUS
 )
 from tabulate import tabulate
 
+logger = logging.getLogger(__name__)
+
+def reads_network(method):
+    """Metodu ağ okuma kilidi altında çalıştır"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.network_lock.read():
+            return method(self, *args, **kwargs)
+    return wrapper
+
 class TransportationSystem:
     # Sabit değerler
     TAXI_THRESHOLD = 3.0  # km cinsinden taksi kullanım eşiği
     WALKING_SPEED = 5.0  # km/saat cinsinden yürüme hızı
     
-    def __init__(self, json_file: str):
-        with open(json_file, "r", encoding="utf-8") as file:
-            data = json.load(file)
+    def __init__(self, json_file: str, cache_size: int = 1024, cache_ttl: Optional[float] = None,
+                 search_strategy: SearchStrategy = SearchStrategy.DIJKSTRA,
+                 snapshot: bool = False, snapshot_path: Optional[str] = None,
+                 streaming: bool = False):
+        self.json_file = json_file
+        self.route_table: Optional[RouteTable] = None
+        self.hierarchy: Optional[ContractionHierarchy] = None
+        # Sefer saatli sorgular için bağlantı dizisi (bkz. load_timetable)
+        self.timetable: Optional[Timetable] = None
+        # Ağ her değiştiğinde artan sürüm numarası (önbellek anahtarının parçası)
+        self.network_version = 0
+        # Yolcudan bağımsız durak-durak rotaları için LRU önbellek (cache_size=0 kapatır)
+        self.route_cache = RouteCache(maxsize=cache_size, ttl=cache_ttl)
+        # Durak-durak aramasında kullanılan strateji (hepsi aynı en düşük ücreti verir)
+        self.search_strategy = search_strategy
+        # Aşama süreleri için izleyici; varsayılan olarak kapalı (bkz. enable_tracing)
+        self.tracer = NULL_TRACER
         
-        self.stops: Dict[str, Stop] = {}
         # Taksi ücretlendirme modeli: Açılış 10 TL, km başına 4 TL
         self.taxi = Taxi(opening_fee=10.0, cost_per_km=4.0)
         self.bus = Bus()
         self.tram = Tram()
         
-        for stop_data in data["duraklar"]:
-            stop = Stop(
-                stop_data["id"],
-                stop_data["name"],
-                stop_data["type"],
-                stop_data["lat"],
-                stop_data["lon"],
-                stop_data["sonDurak"],
-                stop_data["nextStops"],
-                stop_data.get("transfer")
-            )
-            self.stops[stop.id] = stop
+        # Anlık görüntü açıkken JSON yalnızca kaynak dosya değiştiğinde okunur
+        if snapshot_path is None:
+            snapshot_path = json_file + ".snapshot.bin"
+        if snapshot and NetworkSnapshot.is_current(snapshot_path, json_file):
+            self.load_snapshot(snapshot_path)
+        else:
+            if streaming:
+                self.load_stream(json_file)
+            else:
+                self.load_json(json_file)
+            if snapshot:
+                self.save_snapshot(snapshot_path)
+        
+        # En yakın durak sorguları için mekânsal indeks (ilk sorguda kurulur)
+        self._spatial_index: Optional[SpatialIndex] = None
+        # Durak adı araması için indeks (ilk sorguda kurulur)
+        self._name_index: Optional[NameIndex] = None
+        # close_stop ile kapatılan durak indeksleri
+        self.closed_stops: Set[int] = set()
+        # disable_edge/disable_transfer ile kapatılan kenarlar
+        self.disabled_edges: Set[int] = set()
+        # Kapalı kenarların açılınca geri yüklenecek (ücret, süre) değerleri
+        self.closed_edges: Dict[int, Tuple[float, float]] = {}
+        # Aramalar okuma, canlı ağ güncellemeleri yazma kilidi alır: bir arama hiçbir
+        # zaman yarısı uygulanmış bir güncelleme görmez
+        self.network_lock = ReadWriteLock()
+    
+    @property
+    def spatial_index(self) -> SpatialIndex:
+        if self._spatial_index is None:
+            self._spatial_index = SpatialIndex(self.network.lats, self.network.lons)
+            for index in self.closed_stops:
+                self._spatial_index.remove(index)
+        return self._spatial_index
+    
+    @property
+    def name_index(self) -> NameIndex:
+        if self._name_index is None:
+            strings = self.stops.strings
+            self._name_index = NameIndex([strings[ref] for ref in self.stops.name_refs])
+        return self._name_index
+    
+    def find_stop_by_name(self, name: str) -> Optional[Stop]:
+        """Adı birebir eşleşen durağı bul (aynı adlı duraklarda ilki)"""
+        index = self.name_index.lookup(name)
+        return None if index is None else self.stop_at(index)
+    
+    def search_stops(self, query: str, k: int = 10) -> List[Stop]:
+        """Aksansız önek araması: sorguya en iyi uyan k durak"""
+        return [self.stop_at(index) for index, _ in self.name_index.search(query, k)]
+    
+    def load_json(self, json_file: str) -> None:
+        """Durakları JSON dosyasından oku ve ağı derle"""
+        # Ağ dosyasının özeti; önceden hesaplanmış tabloların geçerliliği için.
+        # Özet parça parça hesaplanır ki ham baytlar metinle aynı anda bellekte durmasın
+        digest = hashlib.sha1()
+        with open(json_file, "rb") as file:
+            for chunk in iter(lambda: file.read(1 << 16), b""):
+                digest.update(chunk)
+        self.source_digest = digest.hexdigest()
+        with open(json_file, "r", encoding="utf-8") as file:
+            records = json.load(file)["duraklar"]
+        
+        def consume():
+            # Her ham eleman derlendikten sonra listeden düşürülür; tepe bellek düşük kalır
+            for i, stop_data in enumerate(records):
+                records[i] = None
+                yield stop_data
+        
+        # Akışlı yükleyiciyle aynı derleme: tablo ve ağ kimlik listesini, indeksi ve
+        # koordinat dizilerini paylaşır; ara Stop nesneleri oluşturulmaz
+        self.stops, self.network = compile_stops(consume())
+    
+    def load_stream(self, json_file: str, chunk_size: int = 1 << 16) -> None:
+        """Durakları dosyayı parça parça okuyarak yükle (tepe bellek son ağa yakın kalır)"""
+        self.stops, self.network, self.source_digest = load_stops(json_file, chunk_size)
+    
+    def load_snapshot(self, path: str) -> None:
+        """Ağı ikili anlık görüntüden eşle; durak nesneleri ilk erişimde oluşturulur"""
+        snapshot = NetworkSnapshot.load(path)
+        self.source_digest = snapshot.digest
+        self.network = snapshot.network
+        self.stops = snapshot.table
+    
+    def save_snapshot(self, path: str) -> None:
+        """Mevcut ağın anlık görüntüsünü yaz (yazılamazsa JSON ile devam edilir)"""
+        try:
+            NetworkSnapshot.build(self.stops, self.network, self.source_digest).save(path, self.json_file)
+        except OSError as error:
+            logger.warning("Ağ anlık görüntüsü yazılamadı (%s): %s", path, error)
+    
+    def enable_route_table(self, path: Optional[str] = None) -> RouteTable:
+        """Tüm durak çiftleri için rota tablosunu yükle veya oluştur"""
+        # Tablo ağ dosyasının özetini saklar; dosya değişince yeniden oluşturulur
+        if path is None:
+            path = self.json_file + ".routes.bin"
+        self.route_table = RouteTable.open(path, self.network, self.source_digest)
+        return self.route_table
+    
+    def enable_contraction_hierarchy(self, path: Optional[str] = None) -> ContractionHierarchy:
+        """Kontraksiyon hiyerarşisini yükle veya oluştur ve arama stratejisi olarak seç"""
+        # Hiyerarşi de ağ dosyasının özetini saklar; dosya değişince yeniden oluşturulur
+        if path is None:
+            path = self.json_file + ".ch.bin"
+        self.hierarchy = ContractionHierarchy.open(path, self.network, self.source_digest)
+        self.search_strategy = SearchStrategy.CONTRACTION_HIERARCHY
+        return self.hierarchy
+    
+    def load_timetable(self, path: str) -> Timetable:
+        """Hat sefer dosyasını yükle (şema için bkz. routing.timetable)"""
+        self.timetable = Timetable.load(path, self.network)
+        return self.timetable
+    
+    def edge_index(self, from_stop_id: str, to_stop_id: str, transfer: bool = False) -> int:
+        """İki durak arasındaki (aktarma veya normal) kenarın ağdaki indeksi"""
+        network = self.network
+        if from_stop_id not in network.index or to_stop_id not in network.index:
+            raise ValueError(f"Bilinmeyen durak: {from_stop_id if from_stop_id not in network.index else to_stop_id}")
+        source = network.index[from_stop_id]
+        target = network.index[to_stop_id]
+        for edge in range(network.offsets[source], network.offsets[source + 1]):
+            if network.targets[edge] == target and bool(network.transfers[edge]) == transfer:
+                return edge
+        kind = "aktarma" if transfer else "bağlantı"
+        raise ValueError(f"{from_stop_id} -> {to_stop_id} {kind} kenarı yok")
+    
+    def transfer_edge(self, stop_id: str) -> int:
+        """Durağın aktarma kenarının ağdaki indeksi"""
+        network = self.network
+        if stop_id not in network.index:
+            raise ValueError(f"Bilinmeyen durak: {stop_id}")
+        source = network.index[stop_id]
+        for edge in range(network.offsets[source], network.offsets[source + 1]):
+            if network.transfers[edge]:
+                return edge
+        raise ValueError(f"{stop_id} durağının aktarması yok")
+    
+    def update_edge(self, from_stop_id: str, to_stop_id: str, sure: Optional[float] = None,
+                    ucret: Optional[float] = None) -> Dict:
+        """Bağlantının süresini/ücretini yerinde değiştir (ör. gecikme)"""
+        return self._update_edge(self.edge_index(from_stop_id, to_stop_id), ucret, sure)
+    
+    def update_transfer(self, stop_id: str, sure: Optional[float] = None,
+                        ucret: Optional[float] = None) -> Dict:
+        """Aktarmanın süresini/ücretini yerinde değiştir"""
+        return self._update_edge(self.transfer_edge(stop_id), ucret, sure)
+    
+    def _update_edge(self, edge: int, cost: Optional[float], time: Optional[float]) -> Dict:
+        with self.network_lock.write():
+            original = self.closed_edges.get(edge)
+            if original is not None:
+                # Kapalı kenarın yeni değerleri saklanır, kenar açılınca geçerli olur
+                original = (original[0] if cost is None else float(cost),
+                            original[1] if time is None else float(time))
+                if min(original) < 0:
+                    raise ValueError("Kenar ücreti ve süresi negatif olamaz")
+                self.closed_edges[edge] = original
+                cost = time = None
+            return self._apply_edge_changes([(edge, cost, time)])
+    
+    def disable_edge(self, from_stop_id: str, to_stop_id: str) -> Dict:
+        """Bağlantıyı kapat (ör. yol kapanması); enable_edge ile eski değerleriyle açılır"""
+        with self.network_lock.write():
+            edge = self.edge_index(from_stop_id, to_stop_id)
+            self.disabled_edges.add(edge)
+            return self._apply_edge_changes(self._close_edges([edge]))
+    
+    def disable_transfer(self, stop_id: str) -> Dict:
+        """Durağın aktarmasını kapat; enable_transfer ile açılır"""
+        with self.network_lock.write():
+            edge = self.transfer_edge(stop_id)
+            self.disabled_edges.add(edge)
+            return self._apply_edge_changes(self._close_edges([edge]))
+    
+    def enable_edge(self, from_stop_id: str, to_stop_id: str) -> Dict:
+        """disable_edge ile kapatılan bağlantıyı eski değerleriyle aç"""
+        with self.network_lock.write():
+            edge = self.edge_index(from_stop_id, to_stop_id)
+            if edge not in self.disabled_edges:
+                raise ValueError(f"{from_stop_id} -> {to_stop_id} bağlantısı kapatılmamış")
+            self.disabled_edges.discard(edge)
+            return self._apply_edge_changes(self._open_edges([edge]))
+    
+    def enable_transfer(self, stop_id: str) -> Dict:
+        """disable_transfer ile kapatılan aktarmayı eski değerleriyle aç"""
+        with self.network_lock.write():
+            edge = self.transfer_edge(stop_id)
+            if edge not in self.disabled_edges:
+                raise ValueError(f"{stop_id} durağının aktarması kapatılmamış")
+            self.disabled_edges.discard(edge)
+            return self._apply_edge_changes(self._open_edges([edge]))
+    
+    def stop_edges(self, index: int) -> List[int]:
+        """Durağa giren ve duraktan çıkan kenarların indeksleri"""
+        network = self.network
+        edges = list(range(network.offsets[index], network.offsets[index + 1]))
+        edges.extend(network.reverse_edges[position] for position in
+                     range(network.reverse_offsets[index], network.reverse_offsets[index + 1]))
+        return edges
+    
+    def close_stop(self, stop_id: str) -> Dict:
+        """Durağı kapat: giren/çıkan tüm kenarlar kapanır, en yakın durak aramasından çıkar.
+        reopen_stop ile açılır"""
+        network = self.network
+        if stop_id not in network.index:
+            raise ValueError(f"Bilinmeyen durak: {stop_id}")
+        index = network.index[stop_id]
+        with self.network_lock.write():
+            self.closed_stops.add(index)
+            if self._spatial_index is not None:
+                self._spatial_index.remove(index)
+            return self._apply_edge_changes(self._close_edges(self.stop_edges(index)),
+                                            changed_stop=index)
+    
+    def reopen_stop(self, stop_id: str) -> Dict:
+        """close_stop ile kapatılan durağı aç; ayrıca kapatılmamış kenarları eski değerlerine döner"""
+        network = self.network
+        if stop_id not in network.index:
+            raise ValueError(f"Bilinmeyen durak: {stop_id}")
+        index = network.index[stop_id]
+        with self.network_lock.write():
+            if index not in self.closed_stops:
+                raise ValueError(f"Durak kapatılmamış: {stop_id}")
+            self.closed_stops.discard(index)
+            if self._spatial_index is not None:
+                self._spatial_index.add(index)
+            return self._apply_edge_changes(self._open_edges(self.stop_edges(index)),
+                                            changed_stop=index)
+    
+    def _close_edges(self, edges: List[int]) -> List[Tuple[int, float, float]]:
+        # İlk kapanıştaki (ücret, süre) saklanır; kenar birden çok nedenle kapalı olabilir
+        network = self.network
+        for edge in edges:
+            if edge not in self.closed_edges:
+                self.closed_edges[edge] = (float(network.costs[edge]), float(network.times[edge]))
+        return [(edge, math.inf, math.inf) for edge in edges]
+    
+    def _open_edges(self, edges: List[int]) -> List[Tuple[int, float, float]]:
+        # Kapatılmış kenar ya da kapalı bir durağa bağlı kenar kapalı kalır
+        network = self.network
+        changes = []
+        for edge in edges:
+            if (edge not in self.closed_edges or edge in self.disabled_edges or
+                    network.sources[edge] in self.closed_stops or
+                    network.targets[edge] in self.closed_stops):
+                continue
+            cost, time = self.closed_edges.pop(edge)
+            changes.append((edge, cost, time))
+        return changes
+    
+    def apply_edge_changes(self, changes: Iterable[Tuple[int, Optional[float], Optional[float]]],
+                           changed_stop: Optional[int] = None) -> Dict:
+        """(kenar, ücret, süre) değişikliklerini uygula; None olan değer korunur.
+        Ağ sürümü artar; önbellekte yalnızca etkilenen rotalar silinir, diğerleri yeni
+        sürüme taşınır; rota tablosunun etkilenen satırları onarılır; sefer saatleri
+        yüklüyse süresi değişen kenarlardaki seferler yeniden zamanlanır.
+        Süren aramalar bitene kadar beklenir, güncelleme sırasında yeni arama başlamaz."""
+        with self.network_lock.write():
+            return self._apply_edge_changes(changes, changed_stop)
+    
+    def _apply_edge_changes(self, changes: Iterable[Tuple[int, Optional[float], Optional[float]]],
+                            changed_stop: Optional[int] = None) -> Dict:
+        network = self.network
+        # Anlık görüntüden eşlenen diziler salt okunurdur
+        network.make_writable("costs", "times")
+        
+        applied = []  # (kenar, eski ücret, eski süre, yeni ücret, yeni süre)
+        for edge, cost, time in changes:
+            old_cost, old_time = network.costs[edge], network.times[edge]
+            new_cost = old_cost if cost is None else float(cost)
+            new_time = old_time if time is None else float(time)
+            if new_cost < 0 or new_time < 0:
+                raise ValueError("Kenar ücreti ve süresi negatif olamaz")
+            network.costs[edge] = new_cost
+            network.times[edge] = new_time
+            applied.append((edge, old_cost, old_time, new_cost, new_time))
+        
+        old_version = self.network_version
+        self.network_version += 1
+        network._cost_per_km = None  # A* alt sınırı yeniden hesaplanır
+        
+        # Kontraksiyon hiyerarşisi kenar ağırlıklarına bağlı; yeniden kurulana kadar kullanılmaz
+        if self.hierarchy is not None:
+            self.hierarchy = None
+            if self.search_strategy is SearchStrategy.CONTRACTION_HIERARCHY:
+                self.search_strategy = SearchStrategy.DIJKSTRA
+            logger.info("Ağ değişti; kontraksiyon hiyerarşisi devre dışı bırakıldı")
+        
+        # Ucuzlayan (ya da eşit ücrette hızlanan) kenarlar yeni kısa yollar açabilir:
+        # her biri için kuyruğa ters, başına ileri ücret ağacı hesaplanır
+        changed = {edge for edge, *_ in applied}
+        improvements = []
+        for edge, old_cost, old_time, new_cost, new_time in applied:
+            if new_cost < old_cost or (new_cost == old_cost and new_time < old_time):
+                improvements.append((new_cost, reverse_path_costs(network, network.sources[edge]),
+                                     shortest_path_tree(network, network.targets[edge])[0]))
+        
+        def rekey(key, path):
+            start, end, version = key
+            if version != old_version:
+                return None  # Zaten erişilemeyen eski sürüm kaydı
+            if changed_stop is not None and changed_stop in (start, end):
+                return None
+            if path.edges is not None:
+                # Değişen bir kenarı kullanan yolun toplamları artık geçersiz
+                if any(edge in changed for edge in path.edges):
+                    return None
+                unreachable = len(path.edges) == 0 and start != end
+                for new_cost, to_tail, from_head in improvements:
+                    bound = to_tail[start] + new_cost + from_head[end]
+                    if bound < math.inf and (unreachable or bound <= path.cost):
+                        return None
+            return (start, end, self.network_version)
+        
+        invalidated = self.route_cache.rekey(rekey)
+        
+        table_rows = 0
+        if self.route_table is not None:
+            rows = self.route_table.affected_rows(network, [(edge, new_cost) for edge, _, _, new_cost, _ in applied])
+            self.route_table.repair(network, rows)
+            table_rows = len(rows)
+        
+        # Sefer saatleri kenar sürelerinden türetilir; süresi değişen kenarlardaki seferler kayar
+        timetable_trips = 0
+        if self.timetable is not None:
+            timetable_trips = self.timetable.retime(
+                edge for edge, _, old_time, _, new_time in applied if new_time != old_time)
+        
+        summary = {
+            "version": self.network_version,
+            "edges": len(applied),
+            "cache_invalidated": invalidated,
+            "cache_kept": len(self.route_cache),
+            "table_rows": table_rows,
+            "timetable_trips": timetable_trips
+        }
+        logger.info("Ağ güncellendi: %s", summary)
+        return summary
+    
+    def enable_tracing(self, max_spans: int = 100000) -> Tracer:
+        """Aşama sürelerini kaydetmeye başla (Chrome trace olarak dışa aktarılabilir)"""
+        self.tracer = Tracer(max_spans=max_spans)
+        return self.tracer
+    
+    def disable_tracing(self) -> None:
+        """Aşama süresi kaydını kapat"""
+        self.tracer = NULL_TRACER
     
     def find_nearest_stop(self, location: Location) -> Tuple[Stop, float]:
-        # En yakın durağı bul
-        nearest_stop = None
-        min_distance = float('inf')
+        # En yakın durağı mekânsal indeks ile bul; kapatılmış duraklar indekste yer almaz
+        index, distance = self.spatial_index.nearest(location)
+        if index < 0:
+            reason = "tüm duraklar kapalı" if self.network.num_stops else "ağda durak yok"
+            raise ValueError(f"En yakın durak bulunamadı: {reason}")
+        return self.stops[self.network.stop_ids[index]], distance
+    
+    def find_nearest_stops(self, location: Location, k: int) -> List[Tuple[Stop, float]]:
+        """En yakın k durağı mesafeleriyle birlikte döndür"""
+        return [(self.stops[self.network.stop_ids[index]], distance)
+                for index, distance in self.spatial_index.k_nearest(location, k)]
+    
+    def find_stops_within(self, location: Location, radius_km: float) -> List[Tuple[Stop, float]]:
+        """Verilen yarıçap (km) içindeki durakları yakından uzağa döndür"""
+        return [(self.stops[self.network.stop_ids[index]], distance)
+                for index, distance in self.spatial_index.within_radius(location, radius_km)]
+    
+    def stop_coordinates(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Durak enlem/boylam dizilerini kopyalamadan NumPy dizisi olarak döndür"""
+        return (np.frombuffer(self.network.lats, dtype=np.float64),
+                np.frombuffer(self.network.lons, dtype=np.float64))
+    
+    def stop_distances(self, location: Location) -> np.ndarray:
+        """Bir noktadan tüm duraklara olan mesafeleri (ağ indeks sırasıyla) hesapla"""
+        lats, lons = self.stop_coordinates()
+        return location.distances_to(lats, lons)
+    
+    def stop_distance_matrix(self, locations: List[Location]) -> np.ndarray:
+        """Noktalardan tüm duraklara (nokta x durak) mesafe matrisini hesapla"""
+        point_lats, point_lons = coordinate_arrays(locations)
+        lats, lons = self.stop_coordinates()
+        return haversine_matrix(point_lats, point_lons, lats, lons)
+    
+    def snap_to_stops(self, lats, lons, chunk_size: int = 4096) -> Tuple[np.ndarray, np.ndarray]:
+        """Çok sayıda noktayı en yakın durağa eşle (durak indeksleri, mesafeler)"""
+        lats = np.asarray(lats, dtype=np.float64)
+        lons = np.asarray(lons, dtype=np.float64)
+        stop_lats, stop_lons = self.stop_coordinates()
+        
+        indices = np.empty(len(lats), dtype=np.int64)
+        distances = np.empty(len(lats), dtype=np.float64)
+        # Kapatılmış duraklara eşleme yapılmaz (find_nearest_stop ile aynı)
+        closed = np.fromiter(self.closed_stops, dtype=np.int64, count=len(self.closed_stops))
         
-        for stop in self.stops.values():
-            distance = location.distance_to(stop)
-            if distance < min_distance:
-                min_distance = distance
-                nearest_stop = stop
+        # Bellek kullanımını sınırlamak için noktaları parçalar halinde işle
+        for start in range(0, len(lats), chunk_size):
+            end = start + chunk_size
+            matrix = haversine_matrix(lats[start:end], lons[start:end], stop_lats, stop_lons)
+            matrix[:, closed] = np.inf
+            nearest = np.argmin(matrix, axis=1)
+            indices[start:end] = nearest
+            distances[start:end] = matrix[np.arange(len(nearest)), nearest]
         
-        return nearest_stop, min_distance
+        return indices, distances
     
     def get_next_stops(self, current_stop: Stop) -> List[RouteSegment]:
         segments = []
@@ -88,15 +500,43 @@ class TransportationSystem:
         
         return segments
     
+    def build_segments(self, edges: List[int]) -> List[RouteSegment]:
+        """Derlenmiş ağdaki kenar indekslerinden rota parçalarını oluştur"""
+        network = self.network
+        segments = []
+        for edge in edges:
+            segments.append(RouteSegment(
+                from_stop=self.stops[network.stop_ids[network.sources[edge]]],
+                to_stop=self.stops[network.stop_ids[network.targets[edge]]],
+                vehicle=self.bus if network.vehicles[edge] == VEHICLE_BUS else self.tram,
+                distance=network.distances[edge],
+                cost=network.costs[edge],
+                time=network.times[edge],
+                is_transfer=bool(network.transfers[edge])
+            ))
+        return segments
+    
+    def access_options(self, distance: float, passenger: Passenger) -> Tuple[str, float, float, float]:
+        """Durağa erişim kararı: (önerilen, yürüme süresi, taksi ücreti, taksi süresi)"""
+        taxi_cost = self.taxi.calculate_cost(distance) * passenger.get_discount_rate()
+        taxi_time = self.taxi.calculate_time(distance)
+        
+        # 3 km'den uzak mesafelerde zorunlu taksi kullanımı
+        if distance > self.TAXI_THRESHOLD:
+            return "taxi", 0.0, taxi_cost, taxi_time
+        
+        walking_time = (distance / self.WALKING_SPEED) * 60  # dakika
+        
+        # Yürüyüş süresi taksi süresinden çok uzunsa taksi öner
+        recommended = "taxi" if walking_time > taxi_time * 2 else "walking"
+        return recommended, walking_time, taxi_cost, taxi_time
+    
     def evaluate_stop_access(self, location: Location, stop: Stop, passenger: Passenger) -> Dict:
         """Durağa ulaşım seçeneklerini değerlendir"""
         distance = location.distance_to(stop)
+        recommended, walking_time, taxi_cost, taxi_time = self.access_options(distance, passenger)
         
-        # 3 km'den uzak mesafelerde zorunlu taksi kullanımı
         if distance > self.TAXI_THRESHOLD:
-            taxi_cost = self.taxi.calculate_cost(distance) * passenger.get_discount_rate()
-            taxi_time = self.taxi.calculate_time(distance)
-            
             return {
                 "distance": distance,
                 "walking": {
@@ -116,25 +556,16 @@ class TransportationSystem:
             }
         
         # 3 km'den kısa mesafelerde yürüyüş ve taksi seçenekleri
-        walking_time = (distance / self.WALKING_SPEED) * 60  # dakika
-        walking_cost = 0  # Yürüyüş ücretsiz
-        
-        taxi_cost = self.taxi.calculate_cost(distance) * passenger.get_discount_rate()
-        taxi_time = self.taxi.calculate_time(distance)
-        
-        # Yürüyüş süresi taksi süresinden çok uzunsa taksi öner
-        if walking_time > taxi_time * 2:
-            recommended = "taxi"
+        if recommended == "taxi":
             reason = "Yürüyüş süresi taksi süresinin 2 katından fazla"
         else:
-            recommended = "walking"
             reason = "Mesafe yürüyüş için uygun"
         
         return {
             "distance": distance,
             "walking": {
                 "time": walking_time,
-                "cost": walking_cost,
+                "cost": 0,  # Yürüyüş ücretsiz
                 "available": True,
                 "reason": "Mesafe yürüyüş için uygun"
             },
@@ -148,154 +579,208 @@ class TransportationSystem:
             "reason": reason
         }
     
-    def find_route(self, start_location: Location, end_location: Location, 
-                  passenger: Passenger, payment_method: PaymentMethod) -> Dict:
-        # Başlangıç ve bitiş noktalarına en yakın durakları bul
-        start_stop, start_distance = self.find_nearest_stop(start_location)
-        end_stop, end_distance = self.find_nearest_stop(end_location)
-        
-        print(f"En yakın başlangıç durağı: {start_stop.name}, mesafe: {start_distance:.2f} km")
-        print(f"En yakın bitiş durağı: {end_stop.name}, mesafe: {end_distance:.2f} km")
-        
-        # Duraklara ulaşım seçeneklerini değerlendir
-        start_access = self.evaluate_stop_access(start_location, start_stop, passenger)
-        end_access = self.evaluate_stop_access(end_location, end_stop, passenger)
-        
-        # Başlangıç veya bitiş için taksi gerekip gerekmediğini kontrol et
-        requires_initial_taxi = start_access["recommended"] == "taxi"
-        requires_final_taxi = end_access["recommended"] == "taxi"
-        
+    def direct_path(self, start_stop: Stop, end_stop: Stop) -> Optional[StopPath]:
+        """Duraklar yakın ve aynı tipteyse direkt bağlantıyı döndür"""
         # Eğer başlangıç ve bitiş noktaları arasındaki mesafe 3 km'den azsa ve
         # aynı durak tipindeyse (ikisi de otobüs veya ikisi de tramvay), direkt bağlantı kur
         direct_distance = start_stop.distance_to(end_stop)
-        print(f"Duraklar arası direkt mesafe: {direct_distance:.2f} km")
+        logger.debug("Duraklar arası direkt mesafe: %.2f km", direct_distance)
+        
+        if self.closed_stops and (self.network.index[start_stop.id] in self.closed_stops or
+                                  self.network.index[end_stop.id] in self.closed_stops):
+            return None
         
         if start_stop.type == end_stop.type and direct_distance <= 3.0:
-            print("Direkt bağlantı kuruldu")
+            logger.debug("Direkt bağlantı kuruldu")
             # Araç tipine göre maliyet ve süre hesapla
-            vehicle = self.bus if start_stop.type == "bus" else self.tram
             base_cost = direct_distance * (2.0 if start_stop.type == "bus" else 3.0)  # km başına maliyet
             base_time = direct_distance * (3.0 if start_stop.type == "bus" else 2.0)  # km başına süre
-            
-            # Yolcu indirimi ve süre çarpanını uygula
-            total_cost = base_cost * passenger.get_discount_rate()
-            total_time = base_time * passenger.get_time_multiplier()
-            
-            direct_segment = RouteSegment(
-                from_stop=start_stop,
-                to_stop=end_stop,
-                vehicle=vehicle,
-                distance=direct_distance,
-                cost=base_cost,  # Ham maliyet
-                time=base_time,  # Ham süre
-                is_transfer=False
-            )
-            route = [direct_segment]
-            total_distance = direct_distance
+            return StopPath(self.network.index[start_stop.id], self.network.index[end_stop.id],
+                            None, base_cost, base_time, direct_distance, 0)
+        
+        return None
+    
+    def direct_route(self, start_stop: Stop, end_stop: Stop) -> Optional[List[RouteSegment]]:
+        """Duraklar yakın ve aynı tipteyse direkt bağlantı segmentini döndür"""
+        path = self.direct_path(start_stop, end_stop)
+        return self.path_segments(path) if path is not None else None
+    
+    def edge_path(self, start_index: int, end_index: int, edges: List[int]) -> StopPath:
+        """Kenar listesinden ham toplamları hesaplanmış kompakt yolu oluştur"""
+        network = self.network
+        return StopPath(start_index, end_index, array('l', edges),
+                        sum(network.costs[edge] for edge in edges),
+                        sum(network.times[edge] for edge in edges),
+                        sum(network.distances[edge] for edge in edges),
+                        sum(network.transfers[edge] for edge in edges))
+    
+    def stop_at(self, index: int) -> Stop:
+        """Ağ indeksindeki durağı döndür"""
+        return self.stops.stop(index)
+    
+    def path_stops(self, path: StopPath) -> array:
+        """Yol üzerindeki durakların ağ indeksleri"""
+        if path.is_direct:
+            return array('l', [path.start, path.end])
+        if not path.edges:
+            # Boş yol: aynı durak ya da ulaşılamayan hedef
+            return array('l', [path.start] if path.start == path.end else [])
+        stops = array('l', [path.start])
+        stops.extend(self.network.targets[edge] for edge in path.edges)
+        return stops
+    
+    def path_segments(self, path: StopPath) -> List[RouteSegment]:
+        """Kompakt yoldan rota parçalarını oluştur"""
+        if not path.is_direct:
+            return self.build_segments(path.edges)
+        
+        start_stop = self.stop_at(path.start)
+        return [RouteSegment(
+            from_stop=start_stop,
+            to_stop=self.stop_at(path.end),
+            vehicle=self.bus if start_stop.type == "bus" else self.tram,
+            distance=path.distance,
+            cost=path.cost,  # Ham maliyet
+            time=path.time,  # Ham süre
+            is_transfer=False
+        )]
+    
+    def cache_key(self, start_stop: Stop, end_stop: Stop) -> Tuple[int, int, int]:
+        """Rota önbelleği anahtarı: (başlangıç, bitiş, ağ sürümü)"""
+        return (self.network.index[start_stop.id], self.network.index[end_stop.id],
+                self.network_version)
+    
+    @reads_network
+    def stop_path(self, start_stop: Stop, end_stop: Stop) -> StopPath:
+        """İki durak arasındaki kompakt yolu bul (yolcudan bağımsız, önbellekli)"""
+        # Arama yolcudan bağımsız olduğu için sonuç tüm yolcu tiplerince paylaşılır;
+        # önbellekte yalnızca kenar dizisi ve ham toplamlar tutulur
+        key = self.cache_key(start_stop, end_stop)
+        path = self.route_cache.get(key)
+        if path is None:
+            path = self.search_stop_path(start_stop, end_stop)
+            self.route_cache.put(key, path)
+        return path
+    
+    def stop_route(self, start_stop: Stop, end_stop: Stop) -> List[RouteSegment]:
+        """İki durak arasındaki rota parçalarını bul (yolcudan bağımsız)"""
+        path = self.stop_path(start_stop, end_stop)
+        with self.tracer.span("reconstruct", segments=len(path.edges or ())):
+            return self.path_segments(path)
+    
+    @reads_network
+    def search_stop_path(self, start_stop: Stop, end_stop: Stop) -> StopPath:
+        """Önbelleğe bakmadan iki durak arasındaki kompakt yolu hesapla"""
+        path = self.direct_path(start_stop, end_stop)
+        if path is not None:
+            return path
+        
+        start_index = self.network.index[start_stop.id]
+        end_index = self.network.index[end_stop.id]
+        
+        with self.tracer.span("search", strategy=self.search_strategy.value):
+            # Rota tablosu varsa yol doğrudan tablodan geri sarılır
+            if self.route_table is not None:
+                edges = self.route_table.path(start_index, end_index)
+            else:
+                logger.debug("Rota hesaplanıyor (%s)", self.search_strategy.value)
+                # Derlenmiş ağ üzerinde arama; segmentler yalnızca istendiğinde oluşturulur
+                edges = find_path(self.network, start_index, end_index, self.search_strategy,
+                                  hierarchy=self.hierarchy)
+        
+        return self.edge_path(start_index, end_index, edges)
+    
+    def build_compact_result(self, start_location: Location, end_location: Location,
+                             passenger: Passenger, start_stop: Stop, start_distance: float,
+                             end_stop: Stop, end_distance: float, path: StopPath) -> CompactRoute:
+        """Yalnızca toplamları hesaplayan kompakt sonuç (build_route_result ile aynı değerler)"""
+        with self.tracer.span("access"):
+            start_access_distance = start_location.distance_to(start_stop)
+            end_access_distance = end_location.distance_to(end_stop)
+            start_mode, start_walk, start_taxi_cost, start_taxi_time = self.access_options(
+                start_access_distance, passenger)
+            end_mode, end_walk, end_taxi_cost, end_taxi_time = self.access_options(
+                end_access_distance, passenger)
+        
+        # Yolcu indirimi ve süre çarpanını uygula
+        total_distance = path.distance
+        total_cost = path.cost * passenger.get_discount_rate()
+        total_time = path.time * passenger.get_time_multiplier()
+        
+        # Başlangıç ve bitiş erişim maliyetlerini ekle
+        if start_mode == "taxi":
+            total_cost += start_taxi_cost
+            total_time += start_taxi_time
         else:
-            print("Dijkstra algoritması ile rota hesaplanıyor")
-            # Dijkstra algoritması için veri yapılarını başlat
-            distances = {stop_id: float('inf') for stop_id in self.stops}
-            previous = {stop_id: None for stop_id in self.stops}
-            costs = {stop_id: float('inf') for stop_id in self.stops}
-            times = {stop_id: float('inf') for stop_id in self.stops}
-            visited = set()
-            
-            # Dijkstra algoritması için öncelikli kuyruk
-            pq = [(0, 0, start_stop.id, None)]
-            
-            # Başlangıç değerlerini ayarla
-            distances[start_stop.id] = 0
-            costs[start_stop.id] = 0
-            times[start_stop.id] = 0
-            
-            # Dijkstra algoritması
-            while pq:
-                current_cost, current_time, current_id, previous_segment = heappop(pq)
-                
-                if current_id == end_stop.id:
-                    break
-                    
-                if current_id in visited:
-                    continue
-                    
-                visited.add(current_id)
-                current_stop = self.stops[current_id]
-                
-                # Tüm olası sonraki durakları al
-                for segment in self.get_next_stops(current_stop):
-                    next_stop = segment.to_stop
-                    next_id = next_stop.id
-                    
-                    if next_id in visited:
-                        continue
-                    
-                    # Yeni mesafe, maliyet ve süreleri hesapla
-                    new_distance = distances[current_id] + segment.distance
-                    new_cost = costs[current_id] + segment.cost
-                    new_time = times[current_id] + segment.time
-                    
-                    # Daha iyi yol bulunduysa güncelle
-                    if new_cost < costs[next_id]:
-                        distances[next_id] = new_distance
-                        costs[next_id] = new_cost
-                        times[next_id] = new_time
-                        previous[next_id] = (current_id, segment)
-                        heappush(pq, (new_cost, new_time, next_id, segment))
-            
-            # Rotayı yeniden oluştur
-            route = []
-            current_id = end_stop.id
-            while current_id is not None:
-                if previous[current_id] is not None:
-                    prev_id, segment = previous[current_id]
-                    route.append(segment)
-                current_id = previous[current_id][0] if previous[current_id] is not None else None
-            route.reverse()
-            
-            print(f"Bulunan rota segment sayısı: {len(route)}")
-            
-            # Ham toplam değerleri hesapla (indirimler uygulanmadan)
-            total_distance = sum(segment.distance for segment in route)
-            total_cost = sum(segment.cost for segment in route)
-            total_time = sum(segment.time for segment in route)
-            
-            # Yolcu indirimi ve süre çarpanını uygula
-            total_cost = total_cost * passenger.get_discount_rate()
-            total_time = total_time * passenger.get_time_multiplier()
-            
-            print(f"Rota mesafesi: {total_distance:.2f} km")
-            print(f"Rota maliyeti: {total_cost:.2f} TL")
-            print(f"Rota süresi: {total_time:.1f} dk")
+            total_time += start_walk
+        total_distance += start_access_distance
+        
+        if end_mode == "taxi":
+            total_cost += end_taxi_cost
+            total_time += end_taxi_time
+        else:
+            total_time += end_walk
+        total_distance += end_access_distance
+        
+        return CompactRoute(self, path, passenger, start_location, end_location,
+                            start_distance, end_distance, total_cost, total_time, total_distance,
+                            start_mode == "taxi", end_mode == "taxi")
+    
+    def build_route_result(self, start_location: Location, end_location: Location,
+                           passenger: Passenger, start_stop: Stop, start_distance: float,
+                           end_stop: Stop, end_distance: float,
+                           route: List[RouteSegment]) -> Dict:
+        """Rota parçalarından yolcuya göre fiyatlandırılmış sonucu oluştur"""
+        # Duraklara ulaşım seçeneklerini değerlendir
+        with self.tracer.span("access"):
+            start_access = self.evaluate_stop_access(start_location, start_stop, passenger)
+            end_access = self.evaluate_stop_access(end_location, end_stop, passenger)
+        
+        # Başlangıç veya bitiş için taksi gerekip gerekmediğini kontrol et
+        requires_initial_taxi = start_access["recommended"] == "taxi"
+        requires_final_taxi = end_access["recommended"] == "taxi"
+        
+        logger.debug("Bulunan rota segment sayısı: %d", len(route))
+        
+        # Ham toplam değerleri hesapla (indirimler uygulanmadan)
+        total_distance = sum(segment.distance for segment in route)
+        total_cost = sum(segment.cost for segment in route)
+        total_time = sum(segment.time for segment in route)
+        
+        # Yolcu indirimi ve süre çarpanını uygula
+        total_cost = total_cost * passenger.get_discount_rate()
+        total_time = total_time * passenger.get_time_multiplier()
+        
+        logger.debug("Rota mesafesi: %.2f km, maliyeti: %.2f TL, süresi: %.1f dk",
+                     total_distance, total_cost, total_time)
         
         # Başlangıç ve bitiş erişim maliyetlerini ekle
         if requires_initial_taxi:
             total_cost += start_access["taxi"]["cost"]
             total_time += start_access["taxi"]["time"]
             total_distance += start_access["distance"]
-            print("Başlangıç için taksi eklendi")
+            logger.debug("Başlangıç için taksi eklendi")
         else:
             total_time += start_access["walking"]["time"]
             total_distance += start_access["distance"]
-            print("Başlangıç için yürüyüş eklendi")
+            logger.debug("Başlangıç için yürüyüş eklendi")
         
         if requires_final_taxi:
             total_cost += end_access["taxi"]["cost"]
             total_time += end_access["taxi"]["time"]
             total_distance += end_access["distance"]
-            print("Bitiş için taksi eklendi")
+            logger.debug("Bitiş için taksi eklendi")
         else:
             total_time += end_access["walking"]["time"]
             total_distance += end_access["distance"]
-            print("Bitiş için yürüyüş eklendi")
+            logger.debug("Bitiş için yürüyüş eklendi")
         
-        print(f"Toplam mesafe: {total_distance:.2f} km")
-        print(f"Toplam maliyet: {total_cost:.2f} TL")
-        print(f"Toplam süre: {total_time:.1f} dk")
+        logger.debug("Toplam mesafe: %.2f km, maliyet: %.2f TL, süre: %.1f dk",
+                     total_distance, total_cost, total_time)
         
         # Aktarma sayısını say
         transfer_count = sum(1 for segment in route if segment.is_transfer)
-        print(f"Aktarma sayısı: {transfer_count}")
+        logger.debug("Aktarma sayısı: %d", transfer_count)
         
         # Rota seçeneğini oluştur
         route_option = RouteOption(
@@ -310,9 +795,6 @@ class TransportationSystem:
             transfer_count=transfer_count
         )
         
-        # Ödeme işlemini gerçekleştir
-        payment_successful = payment_method.process_payment(total_cost)
-        
         return {
             "start_stop": start_stop,  # Başlangıç durağı
             "end_stop": end_stop,      # Bitiş durağı
@@ -320,6 +802,337 @@ class TransportationSystem:
             "end_access": end_access,      # Bitiş durağından çıkış bilgileri
             "route": route_option          # Rota bilgileri
         }
+    
+    @reads_network
+    def plan_route(self, start_location: Location, end_location: Location,
+                   passenger: Passenger, compact: bool = False):
+        """Rotayı hesapla, ödeme işlemi yapmadan sonucu döndür (compact: CompactRoute)"""
+        # Başlangıç ve bitiş noktalarına en yakın durakları bul
+        with self.tracer.span("nearest_stop"):
+            start_stop, start_distance = self.find_nearest_stop(start_location)
+            end_stop, end_distance = self.find_nearest_stop(end_location)
+        
+        logger.debug("En yakın başlangıç durağı: %s, mesafe: %.2f km", start_stop.name, start_distance)
+        logger.debug("En yakın bitiş durağı: %s, mesafe: %.2f km", end_stop.name, end_distance)
+        
+        if compact:
+            # Parçalar, erişim ayrıntıları ve açıklamalar yalnızca istendiğinde üretilir
+            return self.build_compact_result(start_location, end_location, passenger, start_stop,
+                                             start_distance, end_stop, end_distance,
+                                             self.stop_path(start_stop, end_stop))
+        
+        route = self.stop_route(start_stop, end_stop)
+        return self.build_route_result(start_location, end_location, passenger,
+                                       start_stop, start_distance, end_stop, end_distance, route)
+    
+    @reads_network
+    def plan_timetable_route(self, start_location: Location, end_location: Location,
+                             passenger: Passenger, departure) -> Optional[Dict]:
+        """Kalkış saatine ("SS:DD" veya dakika) göre en erken varan rota (ödemesiz).
+        O günün seferleriyle varılamıyorsa None."""
+        if self.timetable is None:
+            raise ValueError("Sefer saatli sorgu için önce load_timetable çağrılmalı")
+        departure = parse_clock(departure)
+        
+        start_stop, start_distance = self.find_nearest_stop(start_location)
+        end_stop, end_distance = self.find_nearest_stop(end_location)
+        start_access = self.evaluate_stop_access(start_location, start_stop, passenger)
+        access_time = start_access["taxi" if start_access["recommended"] == "taxi" else "walking"]["time"]
+        
+        # Durağa varış saatinden itibaren bağlantı taraması
+        ready = departure + access_time
+        with self.tracer.span("timetable_search"):
+            steps = self.timetable.earliest_arrival(self.network.index[start_stop.id],
+                                                    self.network.index[end_stop.id], ready)
+        if steps is None:
+            return None
+        
+        # Her parçanın beklemesi: önceki adımın varışından bu adımın kalkışına kadar
+        route = self.build_segments([edge for edge, _, _ in steps])
+        for segment, (_, step_departure, step_arrival) in zip(route, steps):
+            segment.wait_time = step_departure - ready
+            ready = step_arrival
+        
+        result = self.build_route_result(start_location, end_location, passenger,
+                                         start_stop, start_distance, end_stop, end_distance, route)
+        # Sefer saatleri sabit olduğundan süre, çıkıştan hedefe varışa kadar geçen gerçek süredir
+        # (bekleme dahil, yolcu süre çarpanı uygulanmaz)
+        end_access = result["end_access"]
+        end_time = end_access["taxi" if result["route"].requires_final_taxi else "walking"]["time"]
+        result["route"].total_time = (ready - departure) + end_time
+        result["departure_time"] = departure
+        result["arrival_time"] = departure + result["route"].total_time
+        return result
+    
+    def find_route(self, start_location: Location, end_location: Location, 
+                  passenger: Passenger, payment_method: PaymentMethod, compact: bool = False):
+        with self.tracer.span("find_route"):
+            result = self.plan_route(start_location, end_location, passenger, compact=compact)
+            total_cost = result.total_cost if compact else result["route"].total_cost
+            
+            # Ödeme işlemini gerçekleştir
+            with self.tracer.span("payment", method=payment_method.__class__.__name__):
+                payment_successful = payment_method.process_payment(total_cost)
+        
+        return result
+    
+    @reads_network
+    def find_route_options(self, start_location: Location, end_location: Location,
+                           passenger: Passenger, max_labels: int = 16) -> List[RouteOption]:
+        """Ücret, süre ve aktarma sayısına göre Pareto-optimal rota seçeneklerini döndür (ödemesiz)"""
+        start_stop, start_distance = self.find_nearest_stop(start_location)
+        end_stop, end_distance = self.find_nearest_stop(end_location)
+        
+        # Direkt bağlantı da bir seçenek olarak değerlendirilir
+        candidates = []
+        direct = self.direct_route(start_stop, end_stop)
+        if direct is not None:
+            candidates.append(direct)
+        
+        # Tek çok kriterli arama ile tüm ödünleşimler
+        for path in pareto_paths(self.network,
+                                 self.network.index[start_stop.id],
+                                 self.network.index[end_stop.id],
+                                 max_labels=max_labels):
+            candidates.append(self.build_segments(path.edges))
+        
+        options = [self.build_route_result(start_location, end_location, passenger,
+                                           start_stop, start_distance, end_stop, end_distance,
+                                           route)["route"]
+                   for route in candidates]
+        
+        # Yolcu fiyatlandırması sıralamayı korur; yalnızca direkt bağlantının baskıladıkları elenir
+        def dominates(a: RouteOption, b: RouteOption) -> bool:
+            return (a.total_cost <= b.total_cost and a.total_time <= b.total_time and
+                    a.transfer_count <= b.transfer_count and
+                    (a.total_cost, a.total_time, a.transfer_count) != (b.total_cost, b.total_time, b.transfer_count))
+        
+        options = [option for option in options
+                   if not any(dominates(other, option) for other in options)]
+        options.sort(key=lambda option: (option.total_cost, option.total_time, option.transfer_count))
+        return options
+    
+    @reads_network
+    def reachable_from(self, origin: Location, passenger: Passenger,
+                       max_time: Optional[float] = None,
+                       max_cost: Optional[float] = None) -> List[ReachableStop]:
+        """Bir duraktan veya konumdan süre/bütçe sınırı içinde ulaşılabilen duraklar (ödemesiz).
+        Tüm duraklar tek arama ağacından okunur; değerler o durağa find_route ile aynıdır."""
+        max_time = math.inf if max_time is None else max_time
+        max_cost = math.inf if max_cost is None else max_cost
+        network = self.network
+        
+        # Konumdan başlanıyorsa en yakın durağa erişim (yürüyüş/taksi) başlangıç değeridir
+        if isinstance(origin, Stop):
+            start_stop = self.stops[origin.id]
+            access_distance = access_cost = access_time = 0.0
+        else:
+            start_stop, access_distance = self.find_nearest_stop(origin)
+            mode, walking_time, taxi_cost, taxi_time = self.access_options(access_distance, passenger)
+            access_cost = taxi_cost if mode == "taxi" else 0.0
+            access_time = taxi_time if mode == "taxi" else walking_time
+        start = network.index[start_stop.id]
+        if start in self.closed_stops:
+            raise ValueError(f"Durak kapalı: {start_stop.id}")
+        
+        discount = passenger.get_discount_rate()
+        multiplier = passenger.get_time_multiplier()
+        if access_cost > max_cost or access_time > max_time:
+            return []
+        
+        # Bütçe ham ücrete çevrilir; ağaç bu sınırı aşan duraklardan öteye büyümez
+        raw_limit = (max_cost - access_cost) / discount if discount > 0 else math.inf
+        with self.tracer.span("reachable_tree"):
+            costs, times, distances, predecessors = shortest_path_tree(network, start, max_cost=raw_limit)
+        
+        # Direkt bağlantı kuralı ağdaki yolun yerine geçer (bkz. search_stop_path)
+        direct = {}
+        for index, _ in self.spatial_index.within_radius(start_stop, 3.0):
+            path = self.direct_path(start_stop, self.stop_at(index))
+            if path is not None:
+                direct[index] = path
+        
+        transfers = {start: 0}
+        
+        def transfer_count(index: int) -> int:
+            # Ağaçta köke doğru yürü, yol üzerindeki durakların sayılarını da sakla
+            chain = []
+            while index not in transfers:
+                chain.append(index)
+                index = network.sources[predecessors[index]]
+            count = transfers[index]
+            for node in reversed(chain):
+                count += network.transfers[predecessors[node]]
+                transfers[node] = count
+            return count
+        
+        reachable = []
+        for index in range(network.num_stops):
+            path = direct.get(index)
+            if path is not None:
+                cost, time, distance, transfer = path.cost, path.time, path.distance, 0
+            elif costs[index] <= raw_limit:
+                cost, time, distance = costs[index], times[index], distances[index]
+                transfer = None
+            else:
+                continue
+            total_cost = cost * discount + access_cost
+            total_time = time * multiplier + access_time
+            if total_cost > max_cost or total_time > max_time:
+                continue
+            if transfer is None:
+                transfer = transfer_count(index)
+            reachable.append(ReachableStop(self.stop_at(index), total_cost, total_time,
+                                           distance + access_distance, transfer, path is not None))
+        
+        reachable.sort(key=lambda item: (item.total_time, item.total_cost))
+        return reachable
+    
+    def isochrone_geojson(self, origin: Location, passenger: Passenger,
+                          limits: Iterable[float], metric: str = "time") -> Dict:
+        """Her süre (dk) veya bütçe (TL) sınırı için ulaşılabilen durakları saran
+        dışbükey çokgenler (GeoJSON FeatureCollection); tek arama yapılır"""
+        limits = list(limits)
+        if not limits:
+            raise ValueError("En az bir sınır gerekli")
+        if metric not in ("time", "cost"):
+            raise ValueError(f"Geçersiz ölçüt: {metric} (time veya cost)")
+        
+        if metric == "time":
+            reachable = self.reachable_from(origin, passenger, max_time=max(limits))
+        else:
+            reachable = self.reachable_from(origin, passenger, max_cost=max(limits))
+        values = [((item.stop.lon, item.stop.lat),
+                   item.total_time if metric == "time" else item.total_cost)
+                  for item in reachable]
+        return isochrone_collection((origin.lon, origin.lat), values, limits, metric)
+    
+    def find_routes(self, pairs: Iterable[Tuple[Location, Location]], passenger: Passenger,
+                    processes: Optional[int] = None, chunk_size: int = 64,
+                    compact: bool = False) -> Iterator:
+        """Çok sayıda rotayı süreç havuzunda hesapla, sonuçları giriş sırasıyla döndür (ödemesiz).
+        Okuma kilidi her çift için ayrı alınır, yield sırasında tutulmaz: tüketici arada ağı
+        güncelleyebilir, sonraki sonuçlar yeni ağa göre hesaplanır."""
+        pending = deque()
+        
+        def jobs():
+            # En yakın durak ve direkt bağlantı kontrolü ana süreçte yapılır,
+            # yalnızca ağ araması gereken sorgular işçilere gönderilir
+            for start_location, end_location in pairs:
+                with self.network_lock.read():
+                    start_stop, start_distance = self.find_nearest_stop(start_location)
+                    end_stop, end_distance = self.find_nearest_stop(end_location)
+                    key = self.cache_key(start_stop, end_stop)
+                    path = self.route_cache.get(key)
+                    if path is None:
+                        path = self.direct_path(start_stop, end_stop)
+                        if path is not None:
+                            self.route_cache.put(key, path)
+                pending.append((start_location, end_location, start_stop, start_distance,
+                                end_stop, end_distance, key, path))
+                if path is None:
+                    yield key[0], key[1]
+                else:
+                    yield None
+        
+        with ParallelRouter(self.network, processes=processes, chunk_size=chunk_size) as router:
+            for edges in router.map_paths(jobs()):
+                (start_location, end_location, start_stop, start_distance,
+                 end_stop, end_distance, key, path) = pending.popleft()
+                with self.network_lock.read():
+                    if key[2] != self.network_version:
+                        # Ağ arada güncellendi; işçilerin yolu eski ağa ait, çift yeniden çözülür
+                        start_stop, start_distance = self.find_nearest_stop(start_location)
+                        end_stop, end_distance = self.find_nearest_stop(end_location)
+                        path = self.stop_path(start_stop, end_stop)
+                    elif path is None:
+                        path = self.edge_path(key[0], key[1], edges)
+                        self.route_cache.put(key, path)
+                    if compact:
+                        result = self.build_compact_result(start_location, end_location, passenger,
+                                                           start_stop, start_distance, end_stop,
+                                                           end_distance, path)
+                    else:
+                        result = self.build_route_result(start_location, end_location, passenger,
+                                                         start_stop, start_distance, end_stop,
+                                                         end_distance, self.path_segments(path))
+                yield result
+
+    @reads_network
+    def od_matrix(self, origins: List[Location], destinations: List[Location], passenger: Passenger,
+                  processes: Optional[int] = None, chunk_size: int = 4) -> Dict[str, np.ndarray]:
+        """Başlangıç x bitiş noktaları için yoğun ücret, süre, mesafe ve aktarma matrisleri (ödemesiz).
+        Ulaşılabilen her hücre find_route ile aynı değeri verir. Ulaşılamayan çiftlerde ücret/süre/
+        mesafe sonsuz, aktarma -1'dir (find_route ise boş yolu yalnızca erişim bacaklarıyla döndürür).
+        Her farklı başlangıç durağı için tek arama ağacı kurulur."""
+        network = self.network
+        discount = passenger.get_discount_rate()
+        multiplier = passenger.get_time_multiplier()
+        
+        # Tüm noktalar bir kez durağa eşlenir; erişim bacakları nokta başına hesaplanır
+        with self.tracer.span("snap", points=len(origins) + len(destinations)):
+            origin_stops, _ = self.snap_to_stops(*coordinate_arrays(origins))
+            destination_stops, _ = self.snap_to_stops(*coordinate_arrays(destinations))
+        
+        def access(locations: List[Location], stop_indices: np.ndarray) -> Tuple[np.ndarray, ...]:
+            costs = np.zeros(len(locations))
+            times = np.zeros(len(locations))
+            distances = np.zeros(len(locations))
+            for i, (location, index) in enumerate(zip(locations, stop_indices)):
+                distance = location.distance_to(self.stop_at(int(index)))
+                mode, walking_time, taxi_cost, taxi_time = self.access_options(distance, passenger)
+                costs[i] = taxi_cost if mode == "taxi" else 0.0
+                times[i] = taxi_time if mode == "taxi" else walking_time
+                distances[i] = distance
+            return costs, times, distances
+        
+        start_costs, start_times, start_distances = access(origins, origin_stops)
+        end_costs, end_times, end_distances = access(destinations, destination_stops)
+        
+        # Ağaçlar farklı durak çiftleri üzerinde kurulur; noktalar sonra satır/sütunlara dağıtılır
+        sources, source_rows = np.unique(origin_stops, return_inverse=True)
+        targets, target_columns = np.unique(destination_stops, return_inverse=True)
+        shape = (len(sources), len(targets))
+        raw_costs = np.empty(shape)
+        raw_times = np.empty(shape)
+        raw_distances = np.empty(shape)
+        raw_transfers = np.empty(shape, dtype=np.int64)
+        
+        with self.tracer.span("trees", sources=len(sources)):
+            with ParallelRouter(network, processes=processes, chunk_size=chunk_size) as router:
+                for row, values in enumerate(router.map_trees(sources.tolist(), targets.tolist())):
+                    raw_costs[row] = np.frombuffer(values[0], dtype=np.float64)
+                    raw_times[row] = np.frombuffer(values[1], dtype=np.float64)
+                    raw_distances[row] = np.frombuffer(values[2], dtype=np.float64)
+                    raw_transfers[row] = values[3]
+        
+        # Direkt bağlantı kuralı ağdaki yolun yerine geçer (bkz. search_stop_path);
+        # adaylar mesafe matrisiyle süzülür, karar direct_path ile verilir
+        source_stops = [self.stop_at(int(index)) for index in sources]
+        target_stops = [self.stop_at(int(index)) for index in targets]
+        stop_lats, stop_lons = self.stop_coordinates()
+        near = haversine_matrix(stop_lats[sources], stop_lons[sources],
+                                stop_lats[targets], stop_lons[targets]) <= 3.0 + 1e-9
+        for row, column in zip(*np.nonzero(near)):
+            path = self.direct_path(source_stops[row], target_stops[column])
+            if path is not None:
+                raw_costs[row, column] = path.cost
+                raw_times[row, column] = path.time
+                raw_distances[row, column] = path.distance
+                raw_transfers[row, column] = 0
+        
+        # Yolcu indirimi, süre çarpanı ve iki uçtaki erişim bacakları
+        raw_costs = raw_costs[source_rows][:, target_columns]
+        raw_times = raw_times[source_rows][:, target_columns]
+        raw_distances = raw_distances[source_rows][:, target_columns]
+        return {
+            "cost": raw_costs * discount + start_costs[:, np.newaxis] + end_costs[np.newaxis, :],
+            "time": raw_times * multiplier + start_times[:, np.newaxis] + end_times[np.newaxis, :],
+            "distance": raw_distances + start_distances[:, np.newaxis] + end_distances[np.newaxis, :],
+            "transfers": raw_transfers[source_rows][:, target_columns],
+            "origin_stops": origin_stops,
+            "destination_stops": destination_stops
+        }
 
 # Örnek kullanım
 if __name__ == "__main__":